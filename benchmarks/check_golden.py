@@ -0,0 +1,236 @@
+# %%
+import os
+import re
+import sys
+import csv
+import time
+import random
+import difflib
+import argparse
+import tempfile
+import itertools
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import excel2sql
+from generate_workbooks import ESCENARIO_GOLDEN, ensure_scenario
+
+# %% [markdown]
+# ### Comprobación de la salida
+# Esta sección convierte el libro del escenario golden con todas las combinaciones de lector y paralelismo y compara el script con el guardado en `golden/`. Una optimización no debe cambiar ni un byte del SQL generado.
+
+# %%
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+RUTA_GOLDEN = os.path.join(DIRECTORIO, "golden", "golden.sql")
+NOMBRE_LIBRO = "golden"
+
+def normalize_script(texto):
+    """
+    Quita del script lo único que depende del día de la ejecución: la fecha de creación de la cabecera.
+    """
+    return "".join(
+        "* FECHA CREACIÓN: \n" if linea.startswith("* FECHA CREACIÓN:") else linea
+        for linea in texto.splitlines(keepends=True)
+    )
+
+def convert(ruta_excel, directorio_salida, **opciones):
+    """
+    Convierte un libro y devuelve el script generado, ya normalizado.
+    """
+    procesador = excel2sql.SQLFileProcessor(
+        ruta_excel, "PROCLI-7777", "Golden", "Benchmarks", mode="file",
+        output_dir=directorio_salida, force=True, **opciones
+    )
+    nombresSQL, _, _, _ = procesador.process_files()
+    with open(os.path.join(directorio_salida, nombresSQL[0]), encoding="utf-8") as archivo:
+        return normalize_script(archivo.read())
+
+def check(directorio_datos, actualizar=False):
+    """
+    Compara la salida de cada combinación de lector y procesos con el script golden.
+
+    Args:
+    - directorio_datos (str): Directorio donde se genera el libro del escenario golden.
+    - actualizar (bool, opcional): Guarda como golden la salida del lector de pandas sin paralelismo.
+
+    Returns:
+    - list: Combinaciones cuya salida no coincide, con las primeras líneas del diff.
+    """
+    ruta_excel = ensure_scenario(directorio_datos, NOMBRE_LIBRO, ESCENARIO_GOLDEN)
+    combinaciones = list(itertools.product(["auto", *excel2sql.available_readers(ruta_excel)], (1, 2)))
+
+    with tempfile.TemporaryDirectory() as directorio_salida:
+        if actualizar:
+            os.makedirs(os.path.dirname(RUTA_GOLDEN), exist_ok=True)
+            with open(RUTA_GOLDEN, "w", encoding="utf-8", newline="") as archivo:
+                archivo.write(convert(ruta_excel, directorio_salida, reader="pandas", workers=1))
+
+        with open(RUTA_GOLDEN, encoding="utf-8", newline="") as archivo:
+            esperado = archivo.read()
+
+        diferencias = []
+        for reader, workers in combinaciones:
+            obtenido = convert(ruta_excel, directorio_salida, reader=reader, workers=workers)
+            if obtenido != esperado:
+                diff = difflib.unified_diff(
+                    esperado.splitlines(keepends=True), obtenido.splitlines(keepends=True),
+                    "golden.sql", f"reader={reader} workers={workers}"
+                )
+                diferencias.append((f"reader={reader} workers={workers}", "".join(itertools.islice(diff, 40))))
+    return diferencias
+
+def _uw_values(filas):
+    # Las celdas vacías son None en los excels y "" en los CSV
+    return [(index, insert_value or None, update_value or None) for index, insert_value, update_value in filas]
+
+def check_readers(directorio_datos):
+    """
+    Compara los valores de las columnas U y W que devuelve cada lector en streaming con los de openpyxl: los de los
+    otros lectores instalados sobre el mismo libro y los del lector CSV sobre una exportación de cada hoja.
+
+    Returns:
+    - list: Tuplas `(lector, hoja)` cuyos valores no coinciden.
+    """
+    ruta_excel = ensure_scenario(directorio_datos, NOMBRE_LIBRO, ESCENARIO_GOLDEN)
+    referencia = excel2sql.OpenpyxlReader(ruta_excel)
+    try:
+        esperado = {hoja: _uw_values(referencia.iter_rows(hoja)) for hoja in referencia.sheet_names}
+        celdas = {hoja: list(referencia.workbook[hoja].iter_rows(values_only=True)) for hoja in referencia.sheet_names}
+    finally:
+        referencia.close()
+
+    diferencias = []
+    for nombre in excel2sql.available_readers(ruta_excel):
+        lector = excel2sql.READER_CLASSES[nombre](ruta_excel)
+        try:
+            if not lector.streaming:
+                continue
+            diferencias.extend(
+                (nombre, hoja) for hoja in lector.sheet_names if _uw_values(lector.iter_rows(hoja)) != esperado[hoja]
+            )
+        finally:
+            lector.close()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        for numero, (hoja, filas) in enumerate(celdas.items()):
+            # Con ';', como exporta Excel en español
+            ruta_csv = os.path.join(directorio, f"hoja{numero}.csv")
+            with open(ruta_csv, "w", encoding="utf-8-sig", newline="") as archivo:
+                csv.writer(archivo, delimiter=";").writerows(["" if valor is None else valor for valor in fila] for fila in filas)
+            lector = excel2sql.CSVReader(ruta_csv)
+            if _uw_values(lector.iter_rows(lector.sheet_names[0])) != esperado[hoja]:
+                diferencias.append(("csv", hoja))
+    return diferencias
+
+# %% [markdown]
+# ### Comprobación de la limpieza
+# Esta sección compara la limpieza en una pasada del modo 'compat' con la cadena de reemplazos original, copiada aquí tal cual, sobre sentencias aleatorias hechas con los fragmentos que la limpieza trata.
+
+# %%
+_PATRON_DECLARE = re.compile(r'DECLARE\s@(\w+)')
+_PATRON_VACIOS = re.compile(r"(?<=\()\s*,|,\s*(?=\))|(?<=,)\s*(?=,)|(?<=,)\s*(?=$)")
+_PATRON_COMILLAS = re.compile(r"(\w)'(\w)")
+
+def legacy_clean_sql_value(value, declares):
+    """
+    Limpieza original de `clean_sql_value`, antes de hacerla en una sola pasada. Es la referencia del modo 'compat'.
+    """
+    if 'DECLARE' in str(value):
+        nombre_variable = _PATRON_DECLARE.search(value)
+        if nombre_variable:
+            declares.append(nombre_variable.group(1))
+    value = str(value).replace("''", "NULL").replace("'NULL'", "NULL").replace("%%", "''").replace("$$", "\n")
+    value = _PATRON_VACIOS.sub("NULL", value)
+    value = _PATRON_COMILLAS.sub(r"\1''\2", value)
+    return value
+
+FRAGMENTOS = ["'", "''", "NULL", "%%", "$$", "$", ",", "(", ")", " ", "\t", "\n", "a", "é", "1", "DECLARE @", "DECLARE\t@v"]
+
+def check_cleaning(casos=100000, semilla=0):
+    """
+    Compara `clean_sql_value` en modo 'compat' con la limpieza original en sentencias aleatorias.
+
+    Returns:
+    - list: Sentencias con resultado distinto, con la salida original y la nueva (como mucho 10).
+    """
+    rng = random.Random(semilla)
+    diferencias = []
+    for _ in range(casos):
+        sentencia = "".join(rng.choice(FRAGMENTOS) for _ in range(rng.randint(0, 14)))
+        declares_original, declares_nuevos = [], []
+        original = legacy_clean_sql_value(sentencia, declares_original)
+        nuevo = excel2sql.clean_sql_value(sentencia, declares_nuevos)
+        if (original, declares_original) != (nuevo, declares_nuevos):
+            diferencias.append((sentencia, (original, declares_original), (nuevo, declares_nuevos)))
+            if len(diferencias) == 10:
+                break
+    return diferencias
+
+# Sentencias que hacían retroceder la expresión de la limpieza corregida: un `DECLARE @` sin nombre de variable detrás
+# de texto corriente y muchas comillas sin cierre. Con la expresión lineal cada una tarda milisegundos
+SENTENCIAS_LENTAS = [
+    *("INSERT INTO t VALUES (1, 'a', " + "x " * n + fin for n in (8, 24, 1000) for fin in ("DECLARE @ x", "DECLARE @,", "DECLARE @'", "DECLARE @")),
+    "NULLDECLARE @," * 2000,
+    "a'" * 16000,
+    "'a" * 16000,
+    "x'" + "a'a " * 8000,
+    "(," * 16000,
+    "'a$$b', " * 4000,
+]
+
+def check_cleaning_time(casos=100000, semilla=0, limite=0.5):
+    """
+    Comprueba que los dos modos de limpieza tardan menos de `limite` segundos por sentencia, tanto en
+    SENTENCIAS_LENTAS como en sentencias aleatorias.
+
+    Returns:
+    - list: Tuplas `(modo, sentencia, segundos)` de las sentencias que pasan del límite (como mucho 10).
+    """
+    rng = random.Random(semilla)
+    aleatorias = ["".join(rng.choice(FRAGMENTOS + ["D", "@"]) for _ in range(rng.randint(0, 14))) for _ in range(casos)]
+    lentas = []
+    for cleaning in excel2sql.CLEANING_MODES:
+        for sentencia in SENTENCIAS_LENTAS + aleatorias:
+            inicio = time.perf_counter()
+            excel2sql.scan_sql_value(sentencia, cleaning)
+            segundos = time.perf_counter() - inicio
+            if segundos > limite:
+                lentas.append((cleaning, sentencia, segundos))
+                if len(lentas) == 10:
+                    return lentas
+    return lentas
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Comprueba que la conversión sigue generando el mismo SQL.")
+    parser.add_argument("--datos", default=os.path.join(DIRECTORIO, "datos"), help="Directorio de los libros generados.")
+    parser.add_argument("--actualizar", action="store_true", help="Sustituye el script golden por la salida actual.")
+    parser.add_argument("--casos-limpieza", type=int, default=100000, help="Sentencias aleatorias de la comprobación de la limpieza.")
+    args = parser.parse_args(argv)
+
+    diferencias = check(args.datos, args.actualizar)
+    for combinacion, diff in diferencias:
+        print(f"La salida con {combinacion} no coincide con el golden:\n{diff}", file=sys.stderr)
+    if not diferencias:
+        print("La salida coincide con el golden en todas las combinaciones.", file=sys.stderr)
+
+    diferencias_lectores = check_readers(args.datos)
+    for lector, hoja in diferencias_lectores:
+        print(f"El lector {lector} no devuelve los mismos valores que openpyxl en la hoja {hoja}", file=sys.stderr)
+    if not diferencias_lectores:
+        print("Todos los lectores devuelven los mismos valores en las columnas U y W.", file=sys.stderr)
+
+    diferencias_limpieza = check_cleaning(args.casos_limpieza)
+    for sentencia, original, nuevo in diferencias_limpieza:
+        print(f"La limpieza de {sentencia!r} no coincide con la original: {original!r} != {nuevo!r}", file=sys.stderr)
+    if not diferencias_limpieza:
+        print(f"La limpieza 'compat' coincide con la original en {args.casos_limpieza} sentencias aleatorias.", file=sys.stderr)
+
+    lentas = check_cleaning_time(args.casos_limpieza)
+    for cleaning, sentencia, segundos in lentas:
+        print(f"La limpieza '{cleaning}' de {sentencia[:80]!r}... ({len(sentencia)} caracteres) tarda {segundos:.2f}s", file=sys.stderr)
+    if not lentas:
+        print("Los dos modos de limpieza tardan menos de medio segundo por sentencia.", file=sys.stderr)
+    return 1 if diferencias or diferencias_lectores or diferencias_limpieza or lentas else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+# %%
+import sys
+import json
+import argparse
+
+# %% [markdown]
+# ### Comparación de resultados
+# Esta sección compara dos archivos de resultados de `run_benchmarks.py`, por ejemplo de dos commits, etapa a etapa.
+
+# %%
+ETAPAS = ("lectura", "limpieza", "lotes", "escritura", "total")
+
+def compare(anterior, actual, umbral=0.05):
+    """
+    Compara las filas por segundo de cada escenario, lector y etapa presentes en los dos resultados.
+
+    Args:
+    - anterior (dict): Resultados de referencia.
+    - actual (dict): Resultados nuevos.
+    - umbral (float, opcional): Variación relativa a partir de la cual una etapa se marca como más rápida o más lenta.
+
+    Returns:
+    - list: Filas `(escenario, lector, etapa, filas/s anterior, filas/s actual, variación, marca)`.
+    """
+    filas = []
+    for escenario, datos in actual["escenarios"].items():
+        datos_anteriores = anterior["escenarios"].get(escenario)
+        if not datos_anteriores:
+            continue
+        for lector, medida in datos["lectores"].items():
+            medida_anterior = datos_anteriores["lectores"].get(lector)
+            if not medida_anterior:
+                continue
+            for etapa in ETAPAS:
+                antes = medida_anterior["filas_por_segundo"].get(etapa)
+                ahora = medida["filas_por_segundo"].get(etapa)
+                if not antes or not ahora:
+                    continue
+                variacion = ahora / antes - 1
+                marca = "más rápido" if variacion > umbral else "MÁS LENTO" if variacion < -umbral else ""
+                filas.append((escenario, lector, etapa, antes, ahora, variacion, marca))
+    return filas
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara dos resultados de las pruebas de rendimiento.")
+    parser.add_argument("anterior", help="JSON de resultados de referencia.")
+    parser.add_argument("actual", help="JSON de resultados nuevos.")
+    parser.add_argument("--umbral", type=float, default=0.05, help="Variación relativa que se considera significativa.")
+    args = parser.parse_args(argv)
+
+    with open(args.anterior, encoding="utf-8") as archivo:
+        anterior = json.load(archivo)
+    with open(args.actual, encoding="utf-8") as archivo:
+        actual = json.load(archivo)
+
+    for resultados, nombre in ((anterior, args.anterior), (actual, args.actual)):
+        if resultados.get("golden") is False:
+            print(f"Aviso: {nombre} no pasó la comprobación del golden.", file=sys.stderr)
+
+    print(f"{'escenario':<14}{'lector':<10}{'etapa':<11}{'filas/s antes':>15}{'filas/s ahora':>15}{'variación':>11}")
+    for escenario, lector, etapa, antes, ahora, variacion, marca in compare(anterior, actual, args.umbral):
+        print(f"{escenario:<14}{lector:<10}{etapa:<11}{antes:>15,.0f}{ahora:>15,.0f}{variacion:>+11.1%}  {marca}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+# %%
+import os
+import sys
+import json
+import hashlib
+import random
+import argparse
+
+import openpyxl
+
+# %% [markdown]
+# ### Generador de libros sintéticos
+# Esta sección genera, sin conexión y de forma reproducible, libros `.xlsx` con la estructura de los excels reales: sentencias INSERT en la columna U, UPDATE en la W y los patrones que trata la limpieza (comillas internas, `%%`, `$$`, valores vacíos y variables DECLARE).
+
+# %%
+COLUMNA_INSERT = 20  # Columna U
+COLUMNA_UPDATE = 22  # Columna W
+VERSION_GENERADOR = 1  # Subir al cambiar las celdas generadas para no reutilizar libros antiguos
+
+# Escenarios de las pruebas de rendimiento. Los de más de 100.000 filas solo se ejecutan si se piden.
+ESCENARIOS = {
+    "pequeno": {"filas": 1000, "hojas": 3},
+    "mediano": {"filas": 50000, "hojas": 5},
+    "ancho": {"filas": 20000, "hojas": 2, "columnas": 60},
+    "declares": {"filas": 20000, "hojas": 2, "proporcion_declare": 0.5},
+    "especiales": {"filas": 20000, "hojas": 2, "proporcion_especiales": 1.0},
+    "updates": {"filas": 20000, "hojas": 2, "proporcion_updates": 0.8},
+    "muchas_hojas": {"filas": 20000, "hojas": 40},
+    "grande": {"filas": 250000, "hojas": 5},
+    "enorme": {"filas": 1000000, "hojas": 1},
+}
+ESCENARIOS_POR_DEFECTO = ["pequeno", "mediano", "ancho", "declares", "especiales", "updates", "muchas_hojas"]
+
+# Escenario pequeño con todos los casos de la limpieza, para comprobar que la salida no cambia
+ESCENARIO_GOLDEN = {
+    "filas": 400, "hojas": 6, "proporcion_updates": 0.3, "proporcion_declare": 0.2,
+    "proporcion_especiales": 0.8, "proporcion_vacias": 0.1, "semilla": 7,
+}
+
+def _valores(rng, numero_fila, proporcion_especiales):
+    """
+    Devuelve la lista de valores de una sentencia. Con `proporcion_especiales`, cada valor puede llevar uno de los
+    patrones que modifica la limpieza.
+    """
+    valores = [str(numero_fila), f"'Cliente {numero_fila}'", f"'{rng.randint(0, 99999):05d}'"]
+    if rng.random() < proporcion_especiales:
+        valores.append(rng.choice([
+            "'O'Brien'",            # Comilla interna
+            "''",                   # Cadena vacía
+            "'NULL'",               # NULL entre comillas
+            "%%",                   # Cadena vacía escapada
+            "'línea 1$$línea 2'",   # Salto de línea escapado
+            " ",                    # Valor vacío entre comas
+            "'d'Artagnan''s'",      # Varias comillas
+        ]))
+    if rng.random() < proporcion_especiales / 2:
+        valores.append("")  # Valor vacío al final
+    return valores
+
+def make_row(rng, numero_fila, tabla, columnas, proporcion_updates, proporcion_declare, proporcion_especiales, proporcion_vacias):
+    """
+    Genera los valores de una fila de datos de la hoja.
+
+    Returns:
+    - list: Valores de la fila. Una lista vacía representa una fila en blanco.
+    """
+    if rng.random() < proporcion_vacias:
+        # Filas en blanco y filas con datos pero sin sentencia
+        return [] if rng.random() < 0.5 else [rng.randint(0, 9)]
+
+    fila = [None] * columnas
+    fila[0] = numero_fila
+    fila[1] = f"Dato {numero_fila}"
+
+    valores = _valores(rng, numero_fila, proporcion_especiales)
+    if rng.random() < proporcion_updates and columnas > COLUMNA_UPDATE:
+        asignaciones = ", ".join(f"col{i} = {valor}" for i, valor in enumerate(valores))
+        sentencia = f"UPDATE {tabla} SET {asignaciones} WHERE id = {numero_fila}"
+        # También hay filas con un INSERT y un UPDATE a la vez
+        if rng.random() < 0.5:
+            fila[COLUMNA_INSERT] = f"INSERT INTO {tabla} VALUES ({', '.join(valores)})"
+        columna = COLUMNA_UPDATE
+    else:
+        sentencia = f"INSERT INTO {tabla} (col0, col1, col2) VALUES ({','.join(valores)})"
+        columna = COLUMNA_INSERT
+
+    if rng.random() < proporcion_declare:
+        # Variable que usan las sentencias siguientes y que hay que volver a declarar tras cada 'GO'
+        sentencia += f" DECLARE @id{numero_fila % 50} INT = SCOPE_IDENTITY()"
+    if rng.random() < 0.1:
+        sentencia = "  " + sentencia.lower() + "  "  # Mayúsculas y espacios que se ignoran al clasificar
+
+    fila[columna] = sentencia
+    return fila
+
+def make_workbook(ruta, filas=1000, hojas=1, columnas=23, proporcion_updates=0.2, proporcion_declare=0.05,
+                  proporcion_especiales=0.3, proporcion_vacias=0.02, semilla=0):
+    """
+    Genera un libro sintético. El mismo conjunto de parámetros genera siempre las mismas celdas.
+
+    Además de las hojas de datos, añade una hoja estrecha que no se puede procesar (como las de datos iniciales).
+
+    Args:
+    - ruta (str): Ruta del `.xlsx` a generar.
+    - filas (int): Filas de datos en total, repartidas entre las hojas.
+    - hojas (int): Hojas de datos.
+    - columnas (int): Columnas de cada hoja (se necesitan al menos 21 para el INSERT y 23 para el UPDATE).
+    - proporcion_updates (float): Proporción de filas con UPDATE en lugar de INSERT.
+    - proporcion_declare (float): Proporción de sentencias que declaran una variable.
+    - proporcion_especiales (float): Proporción de sentencias con comillas internas, `%%`, `$$` o valores vacíos.
+    - proporcion_vacias (float): Proporción de filas sin sentencia.
+    - semilla (int): Semilla del generador aleatorio.
+    """
+    rng = random.Random(semilla)
+    # En modo solo escritura la memoria no depende del número de filas
+    workbook = openpyxl.Workbook(write_only=True)
+
+    filas_por_hoja = [filas // hojas + (1 if i < filas % hojas else 0) for i in range(hojas)]
+    for numero_hoja, filas_hoja in enumerate(filas_por_hoja):
+        tabla = f"dbo.Tabla{numero_hoja:02d}"
+        worksheet = workbook.create_sheet(f"{numero_hoja:02d}.Tabla{numero_hoja:02d}")
+        worksheet.append([f"Columna {i}" for i in range(columnas)])
+        for numero_fila in range(filas_hoja):
+            worksheet.append(make_row(
+                rng, numero_fila, tabla, columnas, proporcion_updates,
+                proporcion_declare, proporcion_especiales, proporcion_vacias
+            ))
+
+    worksheet = workbook.create_sheet("00.DatosIniciales")
+    worksheet.append(["Cliente", "Valor"])
+    worksheet.append(["Ejemplo", 1])
+
+    os.makedirs(os.path.dirname(os.path.abspath(ruta)), exist_ok=True)
+    workbook.save(ruta)
+
+def scenario_path(directorio, nombre, parametros):
+    """
+    Ruta del libro de un escenario. El nombre incluye un resumen de los parámetros para no reutilizar un libro
+    generado con otros.
+    """
+    clave = json.dumps({"version": VERSION_GENERADOR, **parametros}, sort_keys=True)
+    resumen = hashlib.sha256(clave.encode()).hexdigest()[:8]
+    return os.path.join(directorio, f"{nombre}-{resumen}.xlsx")
+
+def ensure_scenario(directorio, nombre, parametros=None):
+    """
+    Devuelve la ruta del libro del escenario y lo genera si aún no existe.
+    """
+    parametros = parametros if parametros is not None else ESCENARIOS[nombre]
+    ruta = scenario_path(directorio, nombre, parametros)
+    if not os.path.exists(ruta):
+        print(f"Generando {ruta}", file=sys.stderr)
+        make_workbook(ruta, **parametros)
+    return ruta
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera libros sintéticos para las pruebas de rendimiento.")
+    parser.add_argument("ruta", help="Archivo .xlsx a generar.")
+    parser.add_argument("--filas", type=int, default=1000)
+    parser.add_argument("--hojas", type=int, default=1)
+    parser.add_argument("--columnas", type=int, default=23)
+    parser.add_argument("--proporcion-updates", type=float, default=0.2)
+    parser.add_argument("--proporcion-declare", type=float, default=0.05)
+    parser.add_argument("--proporcion-especiales", type=float, default=0.3)
+    parser.add_argument("--proporcion-vacias", type=float, default=0.02)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    make_workbook(
+        args.ruta, args.filas, args.hojas, args.columnas, args.proporcion_updates,
+        args.proporcion_declare, args.proporcion_especiales, args.proporcion_vacias, args.semilla
+    )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
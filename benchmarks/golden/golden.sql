@@ -0,0 +1,540 @@
+
+/*
+* (EST): Estructura. 
+* (DAT): Modificación Datos.
+* (QRY): Consultas.
+*/
+-------------------------------------------------------------------------------------
+/*
+* LINK TAREA: https://app.clickup.com/t/36671967/PROCLI-7777
+* DESCRIPCIÓN: Golden
+* 
+*
+* AUTOR: Benchmarks
+* FECHA CREACIÓN: 
+* FECHA DESPLIEGUE DESARROLLO: 
+* FECHA DESPLIEGUE PRE-PRODUCCIÓN: 
+* FECHA DESPLIEGUE PRODUCCIÓN: 
+*/
+-------------------------------------------------------------------------------------
+---
+-------------------------------------------------
+--- 
+-------------------------------------------------
+BEGIN TRAN
+    ---Tabla: 00.Tabla00
+insert into dbo.tabla00 (col0, col1, col2) values (0,'cliente 0','19772','o''brien''NULL)
+UPDATE dbo.Tabla00 SET col0 = 1, col1 = 'Cliente 1', col2 = '04914', col3 = '', col4 =  WHERE id = 1
+insert into dbo.tabla00 (col0, col1, col2) values (2,'cliente 2','82238','o''brien')
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (3,'Cliente 3','37959','línea 1
+línea 2''NULL)
+UPDATE dbo.Tabla00 SET col0 = 4, col1 = 'Cliente 4', col2 = '83743', col3 = 'O''Brien' WHERE id = 4
+update dbo.tabla00 set col0 = 5, col1 = 'cliente 5', col2 = '41175', col3 = '', col4 =  where id = 5
+UPDATE dbo.Tabla00 SET col0 = 6, col1 = 'Cliente 6', col2 = '64895' WHERE id = 6 DECLARE @id6 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (7,'Cliente 7','19920') DECLARE @id7 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (8,'Cliente 8','41123',NULL)
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (9,'Cliente 9','62141','O''Brien''NULL)
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (10,'Cliente 10','37302',NULLNULL)
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (11,'Cliente 11','28600',NULL)
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (12,'Cliente 12','52644',NULL)
+UPDATE dbo.Tabla00 SET col0 = 13, col1 = 'Cliente 13', col2 = '49865', col3 =  WHERE id = 13
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (14,'Cliente 14','34438',NULL)
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (15,'Cliente 15','67566')
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (16,'Cliente 16','89204',''NULL)
+UPDATE dbo.Tabla00 SET col0 = 17, col1 = 'Cliente 17', col2 = '27363', col3 = 'O''Brien', col4 =  WHERE id = 17 DECLARE @id17 INT = SCOPE_IDENTITY()
+UPDATE dbo.Tabla00 SET col0 = 18, col1 = 'Cliente 18', col2 = '03342', col3 = NULL WHERE id = 18
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (19,'Cliente 19','63972') DECLARE @id19 INT = SCOPE_IDENTITY()
+UPDATE dbo.Tabla00 SET col0 = 20, col1 = 'Cliente 20', col2 = '34702', col3 =  , col4 =  WHERE id = 20
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (21,'Cliente 21','03544',NULL)
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (22,'Cliente 22','21894',NULL)
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (23,'Cliente 23','99394')
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (24,'Cliente 24','46604','O''Brien') DECLARE @id24 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (25,'Cliente 25','94781')
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (26,'Cliente 26','26787','línea 1
+línea 2')
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (28,'Cliente 28','98322',NULL) DECLARE @id28 INT = SCOPE_IDENTITY()
+UPDATE dbo.Tabla00 SET col0 = 29, col1 = 'Cliente 29', col2 = '60707', col3 = 'O''Brien' WHERE id = 29 DECLARE @id29 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (30,'Cliente 30','19159','línea 1
+línea 2')
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (31,'Cliente 31','01866''NULL)
+UPDATE dbo.Tabla00 SET col0 = 32, col1 = 'Cliente 32', col2 = '27661', col3 = NULL, col4 =  WHERE id = 32
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (33,'Cliente 33','96983','')
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (34,'Cliente 34','17139','línea 1
+línea 2')
+UPDATE dbo.Tabla00 SET col0 = 35, col1 = 'Cliente 35', col2 = '19634', col3 = '' WHERE id = 35
+UPDATE dbo.Tabla00 SET col0 = 36, col1 = 'Cliente 36', col2 = '13907', col3 =  WHERE id = 36 DECLARE @id36 INT = SCOPE_IDENTITY()
+UPDATE dbo.Tabla00 SET col0 = 38, col1 = 'Cliente 38', col2 = '80285' WHERE id = 38
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (39,'Cliente 39','32460',NULL)
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (40,'Cliente 40','51427','O''Brien')
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (41,'Cliente 41','20243')
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (42,'Cliente 42','97869''NULL)
+insert into dbo.tabla00 (col0, col1, col2) values (43,'cliente 43','56560')
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (44,'Cliente 44','44299','')
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (45,'Cliente 45','14791') DECLARE @id45 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (47,'Cliente 47','55345')
+GO
+DECLARE @id6 AS INT
+SET @id6 = 0
+DECLARE @id7 AS INT
+SET @id7 = 0
+DECLARE @id17 AS INT
+SET @id17 = 0
+DECLARE @id19 AS INT
+SET @id19 = 0
+DECLARE @id24 AS INT
+SET @id24 = 0
+DECLARE @id28 AS INT
+SET @id28 = 0
+DECLARE @id29 AS INT
+SET @id29 = 0
+DECLARE @id36 AS INT
+SET @id36 = 0
+DECLARE @id45 AS INT
+SET @id45 = 0
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (48,'Cliente 48','64829','O''Brien''NULL) DECLARE @id48 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (49,'Cliente 49','02206','d''ArtagnanNULLs''NULL)
+insert into dbo.tabla00 (col0, col1, col2) values (50,'cliente 50','01513','línea 1
+línea 2')
+UPDATE dbo.Tabla00 SET col0 = 51, col1 = 'Cliente 51', col2 = '14346', col3 =  WHERE id = 51
+insert into dbo.tabla00 (col0, col1, col2) values (52,'cliente 52','58417',NULLNULL)
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (54,'Cliente 54','32201''NULL)
+UPDATE dbo.Tabla00 SET col0 = 55, col1 = 'Cliente 55', col2 = '51522', col3 =  WHERE id = 55 DECLARE @id5 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (56,'Cliente 56','18313',NULL) DECLARE @id6 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (57,'Cliente 57','56458','O''Brien')
+UPDATE dbo.Tabla00 SET col0 = 58, col1 = 'Cliente 58', col2 = '90791', col3 = '', col4 =  WHERE id = 58
+UPDATE dbo.Tabla00 SET col0 = 59, col1 = 'Cliente 59', col2 = '42406', col3 = NULL, col4 =  WHERE id = 59 DECLARE @id9 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (60,'Cliente 60','32529','O''Brien''NULL) DECLARE @id10 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (61,'Cliente 61','39275',NULLNULL)
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (62,'Cliente 62','78192',NULL)
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (63,'Cliente 63','93717')
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (64,'Cliente 64','66108','d''ArtagnanNULLs')
+UPDATE dbo.Tabla00 SET col0 = 65, col1 = 'Cliente 65', col2 = '90875', col3 = 'O''Brien', col4 =  WHERE id = 65 DECLARE @id15 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES (66,'Cliente 66','82282','línea 1
+línea 2') DECLARE @id16 INT = SCOPE_IDENTITY()
+---Tabla: 01.Tabla01
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (0,'Cliente 0','65925''NULL)
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (1,'Cliente 1','34807','d''ArtagnanNULLs''NULL)
+UPDATE dbo.Tabla01 SET col0 = 2, col1 = 'Cliente 2', col2 = '62784', col3 =  WHERE id = 2 DECLARE @id2 INT = SCOPE_IDENTITY()
+UPDATE dbo.Tabla01 SET col0 = 3, col1 = 'Cliente 3', col2 = '85397', col3 = NULL WHERE id = 3
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (5,'Cliente 5','92913','')
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (6,'Cliente 6','11253''NULL)
+UPDATE dbo.Tabla01 SET col0 = 7, col1 = 'Cliente 7', col2 = '35213', col3 = NULL, col4 =  WHERE id = 7
+update dbo.tabla01 set col0 = 8, col1 = 'cliente 8', col2 = '82794', col3 = 'o''brien' where id = 8
+insert into dbo.tabla01 (col0, col1, col2) values (10,'cliente 10','39577',''NULL)
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (11,'Cliente 11','52200',NULL)
+insert into dbo.tabla01 (col0, col1, col2) values (12,'cliente 12','77224','')
+UPDATE dbo.Tabla01 SET col0 = 13, col1 = 'Cliente 13', col2 = '83225', col3 =  WHERE id = 13 DECLARE @id13 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (14,'Cliente 14','03802')
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (15,'Cliente 15','06484') DECLARE @id15 INT = SCOPE_IDENTITY()
+UPDATE dbo.Tabla01 SET col0 = 16, col1 = 'Cliente 16', col2 = '72103', col3 = '' WHERE id = 16
+UPDATE dbo.Tabla01 SET col0 = 17, col1 = 'Cliente 17', col2 = '31282', col3 = 'línea 1
+línea 2' WHERE id = 17 DECLARE @id17 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (18,'Cliente 18','72140',NULL) DECLARE @id18 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (21,'Cliente 21','74660','O''Brien')
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (22,'Cliente 22','44328',''NULL) DECLARE @id22 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (23,'Cliente 23','28306',NULLNULL)
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (24,'Cliente 24','02858','')
+UPDATE dbo.Tabla01 SET col0 = 26, col1 = 'Cliente 26', col2 = '69187' WHERE id = 26 DECLARE @id26 INT = SCOPE_IDENTITY()
+insert into dbo.tabla01 (col0, col1, col2) values (27,'cliente 27','94599','d''artagnanNULLs')
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (28,'Cliente 28','30484','O''Brien') DECLARE @id28 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (29,'Cliente 29','91564','O''Brien''NULL)
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (30,'Cliente 30','78782','línea 1
+línea 2''NULL)
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (31,'Cliente 31','62299','línea 1
+línea 2''NULL)
+GO
+DECLARE @id2 AS INT
+SET @id2 = 0
+DECLARE @id13 AS INT
+SET @id13 = 0
+DECLARE @id15 AS INT
+SET @id15 = 0
+DECLARE @id17 AS INT
+SET @id17 = 0
+DECLARE @id18 AS INT
+SET @id18 = 0
+DECLARE @id22 AS INT
+SET @id22 = 0
+DECLARE @id26 AS INT
+SET @id26 = 0
+DECLARE @id28 AS INT
+SET @id28 = 0
+GO
+insert into dbo.tabla01 (col0, col1, col2) values (33,'cliente 33','55052',NULL)
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (34,'Cliente 34','55123',''NULL)
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (35,'Cliente 35','26268','d''ArtagnanNULLs''NULL)
+insert into dbo.tabla01 (col0, col1, col2) values (36,'cliente 36','81736',NULL)
+UPDATE dbo.Tabla01 SET col0 = 37, col1 = 'Cliente 37', col2 = '51571', col3 = 'O''Brien' WHERE id = 37 DECLARE @id37 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (38,'Cliente 38','41182','O''Brien') DECLARE @id38 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (39,'Cliente 39','04180',NULLNULL)
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (41,'Cliente 41','16214','d''ArtagnanNULLs''NULL)
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (42,'Cliente 42','06456',NULLNULL) DECLARE @id42 INT = SCOPE_IDENTITY()
+insert into dbo.tabla01 (col0, col1, col2) values (43,'cliente 43','03969',NULL) declare @id43 int = scope_identity()
+UPDATE dbo.Tabla01 SET col0 = 45, col1 = 'Cliente 45', col2 = '08238', col3 =  WHERE id = 45
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (46,'Cliente 46','41482''NULL)
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (47,'Cliente 47','08563',NULLNULL)
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (48,'Cliente 48','56352''NULL) DECLARE @id48 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (49,'Cliente 49','90716','línea 1
+línea 2''NULL)
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (50,'Cliente 50','67093','d''ArtagnanNULLs''NULL)
+insert into dbo.tabla01 (col0, col1, col2) values (51,'cliente 51','21062')
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (53,'Cliente 53','58584',NULL)
+UPDATE dbo.Tabla01 SET col0 = 54, col1 = 'Cliente 54', col2 = '87087', col3 = 'd''ArtagnanNULLs' WHERE id = 54
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (55,'Cliente 55','32431',NULLNULL)
+update dbo.tabla01 set col0 = 56, col1 = 'cliente 56', col2 = '32237', col3 = NULL where id = 56 declare @id6 int = scope_identity()
+UPDATE dbo.Tabla01 SET col0 = 57, col1 = 'Cliente 57', col2 = '30292' WHERE id = 57 DECLARE @id7 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (58,'Cliente 58','76440','O''Brien''NULL)
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (59,'Cliente 59','00830','línea 1
+línea 2') DECLARE @id9 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (61,'Cliente 61','85412')
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (62,'Cliente 62','10215','d''ArtagnanNULLs')
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (63,'Cliente 63','20257','O''Brien')
+INSERT INTO dbo.Tabla01 (col0, col1, col2) VALUES (64,'Cliente 64','54767''NULL)
+UPDATE dbo.Tabla01 SET col0 = 65, col1 = 'Cliente 65', col2 = '47681', col3 = '' WHERE id = 65
+UPDATE dbo.Tabla01 SET col0 = 66, col1 = 'Cliente 66', col2 = '53243', col3 = NULL WHERE id = 66
+---Tabla: 02.Tabla02
+UPDATE dbo.Tabla02 SET col0 = 0, col1 = 'Cliente 0', col2 = '11669', col3 = NULL WHERE id = 0 DECLARE @id0 INT = SCOPE_IDENTITY()
+insert into dbo.tabla02 (col0, col1, col2) values (2,'cliente 2','25865','d''artagnanNULLs')
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (3,'Cliente 3','50842''NULL) DECLARE @id3 INT = SCOPE_IDENTITY()
+UPDATE dbo.Tabla02 SET col0 = 4, col1 = 'Cliente 4', col2 = '53016', col3 = NULL WHERE id = 4
+UPDATE dbo.Tabla02 SET col0 = 5, col1 = 'Cliente 5', col2 = '16129', col3 =   WHERE id = 5
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (6,'Cliente 6','42493','línea 1
+línea 2')
+insert into dbo.tabla02 (col0, col1, col2) values (7,'cliente 7','32670',NULLNULL) declare @id7 int = scope_identity()
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (8,'Cliente 8','60984','d''ArtagnanNULLs')
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (9,'Cliente 9','08797',''NULL)
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (11,'Cliente 11','41120','línea 1
+línea 2''NULL)
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (12,'Cliente 12','03389')
+update dbo.tabla02 set col0 = 13, col1 = 'cliente 13', col2 = '64470', col3 = 'd''artagnanNULLs' where id = 13
+UPDATE dbo.Tabla02 SET col0 = 14, col1 = 'Cliente 14', col2 = '99113', col3 = NULL WHERE id = 14 DECLARE @id14 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (15,'Cliente 15','27305','línea 1
+línea 2') DECLARE @id15 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (16,'Cliente 16','36463',''NULL) DECLARE @id16 INT = SCOPE_IDENTITY()
+GO
+DECLARE @id0 AS INT
+SET @id0 = 0
+DECLARE @id3 AS INT
+SET @id3 = 0
+DECLARE @id14 AS INT
+SET @id14 = 0
+DECLARE @id15 AS INT
+SET @id15 = 0
+DECLARE @id16 AS INT
+SET @id16 = 0
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (17,'Cliente 17','47156')
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (18,'Cliente 18','70215','')
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (19,'Cliente 19','43362',''NULL)
+insert into dbo.tabla02 (col0, col1, col2) values (20,'cliente 20','40641','d''artagnanNULLs')
+update dbo.tabla02 set col0 = 22, col1 = 'cliente 22', col2 = '56653', col3 = 'null' where id = 22
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (24,'Cliente 24','46812','')
+UPDATE dbo.Tabla02 SET col0 = 25, col1 = 'Cliente 25', col2 = '17661', col3 = 'd''ArtagnanNULLs', col4 =  WHERE id = 25
+UPDATE dbo.Tabla02 SET col0 = 26, col1 = 'Cliente 26', col2 = '52684' WHERE id = 26
+UPDATE dbo.Tabla02 SET col0 = 27, col1 = 'Cliente 27', col2 = '78889' WHERE id = 27 DECLARE @id27 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (28,'Cliente 28','31151','d''ArtagnanNULLs''NULL)
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (29,'Cliente 29','67929','línea 1
+línea 2')
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (31,'Cliente 31','00832','')
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (32,'Cliente 32','13799',NULLNULL)
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (33,'Cliente 33','93281''NULL)
+UPDATE dbo.Tabla02 SET col0 = 34, col1 = 'Cliente 34', col2 = '84148' WHERE id = 34 DECLARE @id34 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (35,'Cliente 35','26578')
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (36,'Cliente 36','82666')
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (37,'Cliente 37','00836')
+UPDATE dbo.Tabla02 SET col0 = 38, col1 = 'Cliente 38', col2 = '81608', col3 = 'línea 1
+línea 2' WHERE id = 38 DECLARE @id38 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (39,'Cliente 39','18591','O''Brien''NULL)
+UPDATE dbo.Tabla02 SET col0 = 40, col1 = 'Cliente 40', col2 = '08619' WHERE id = 40
+update dbo.tabla02 set col0 = 41, col1 = 'cliente 41', col2 = '99060' where id = 41 declare @id41 int = scope_identity()
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (42,'Cliente 42','98796','d''ArtagnanNULLs')
+update dbo.tabla02 set col0 = 43, col1 = 'cliente 43', col2 = '84714', col3 = 'null', col4 =  where id = 43
+insert into dbo.tabla02 (col0, col1, col2) values (44,'cliente 44','42051','línea 1
+línea 2')
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (45,'Cliente 45','57206','O''Brien''NULL)
+UPDATE dbo.Tabla02 SET col0 = 46, col1 = 'Cliente 46', col2 = '11913', col3 = NULL, col4 =  WHERE id = 46
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (48,'Cliente 48','24185')
+UPDATE dbo.Tabla02 SET col0 = 49, col1 = 'Cliente 49', col2 = '28143', col3 =  WHERE id = 49
+UPDATE dbo.Tabla02 SET col0 = 50, col1 = 'Cliente 50', col2 = '73564', col3 =  , col4 =  WHERE id = 50
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (51,'Cliente 51','84654',NULLNULL)
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (52,'Cliente 52','82672',''NULL)
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (54,'Cliente 54','59022',NULLNULL)
+UPDATE dbo.Tabla02 SET col0 = 55, col1 = 'Cliente 55', col2 = '43785', col3 =  , col4 =  WHERE id = 55
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (56,'Cliente 56','20445')
+UPDATE dbo.Tabla02 SET col0 = 57, col1 = 'Cliente 57', col2 = '33906' WHERE id = 57 DECLARE @id7 INT = SCOPE_IDENTITY()
+UPDATE dbo.Tabla02 SET col0 = 58, col1 = 'Cliente 58', col2 = '39597', col3 = '', col4 =  WHERE id = 58
+update dbo.tabla02 set col0 = 59, col1 = 'cliente 59', col2 = '01653', col3 = 'd''artagnanNULLs' where id = 59
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (60,'Cliente 60','96762',NULLNULL)
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (61,'Cliente 61','29958''NULL)
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (62,'Cliente 62','84087',''NULL) DECLARE @id12 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (63,'Cliente 63','93474',NULLNULL)
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (64,'Cliente 64','88505','d''ArtagnanNULLs''NULL)
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (65,'Cliente 65','13943','línea 1
+línea 2''NULL)
+INSERT INTO dbo.Tabla02 (col0, col1, col2) VALUES (66,'Cliente 66','75308',NULL)
+GO
+DECLARE @id27 AS INT
+SET @id27 = 0
+DECLARE @id34 AS INT
+SET @id34 = 0
+DECLARE @id38 AS INT
+SET @id38 = 0
+DECLARE @id7 AS INT
+SET @id7 = 0
+DECLARE @id12 AS INT
+SET @id12 = 0
+---Tabla: 03.Tabla03
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (0,'Cliente 0','53785',''NULL)
+insert into dbo.tabla03 (col0, col1, col2) values (1,'cliente 1','80478','o''brien''NULL) declare @id1 int = scope_identity()
+UPDATE dbo.Tabla03 SET col0 = 2, col1 = 'Cliente 2', col2 = '82387', col3 = NULL WHERE id = 2
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (3,'Cliente 3','51375',NULLNULL)
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (4,'Cliente 4','73669','d''ArtagnanNULLs')
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (5,'Cliente 5','61354')
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (6,'Cliente 6','30206','')
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (7,'Cliente 7','36858',NULLNULL)
+UPDATE dbo.Tabla03 SET col0 = 8, col1 = 'Cliente 8', col2 = '47504', col3 = NULL WHERE id = 8
+UPDATE dbo.Tabla03 SET col0 = 9, col1 = 'Cliente 9', col2 = '45239', col3 = 'O''Brien' WHERE id = 9
+UPDATE dbo.Tabla03 SET col0 = 10, col1 = 'Cliente 10', col2 = '30623', col3 = '', col4 =  WHERE id = 10
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (11,'Cliente 11','79739''NULL)
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (12,'Cliente 12','64810','línea 1
+línea 2''NULL)
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (13,'Cliente 13','54924',NULL)
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (14,'Cliente 14','32317','línea 1
+línea 2') DECLARE @id14 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (15,'Cliente 15','65222','d''ArtagnanNULLs')
+UPDATE dbo.Tabla03 SET col0 = 16, col1 = 'Cliente 16', col2 = '47235', col3 = 'O''Brien', col4 =  WHERE id = 16
+UPDATE dbo.Tabla03 SET col0 = 18, col1 = 'Cliente 18', col2 = '18938', col3 =   WHERE id = 18
+insert into dbo.tabla03 (col0, col1, col2) values (19,'cliente 19','72630',NULLNULL)
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (20,'Cliente 20','46553')
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (21,'Cliente 21','85794','O''Brien''NULL)
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (22,'Cliente 22','05249','línea 1
+línea 2') DECLARE @id22 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (24,'Cliente 24','79781','O''Brien')
+UPDATE dbo.Tabla03 SET col0 = 25, col1 = 'Cliente 25', col2 = '91279', col3 =  , col4 =  WHERE id = 25
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (26,'Cliente 26','04846','O''Brien')
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (27,'Cliente 27','73675','d''ArtagnanNULLs''NULL)
+UPDATE dbo.Tabla03 SET col0 = 28, col1 = 'Cliente 28', col2 = '07158', col3 = 'línea 1
+línea 2', col4 =  WHERE id = 28
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (29,'Cliente 29','01852','línea 1
+línea 2')
+UPDATE dbo.Tabla03 SET col0 = 30, col1 = 'Cliente 30', col2 = '13375', col3 = '', col4 =  WHERE id = 30 DECLARE @id30 INT = SCOPE_IDENTITY()
+UPDATE dbo.Tabla03 SET col0 = 31, col1 = 'Cliente 31', col2 = '11552', col3 = 'O''Brien', col4 =  WHERE id = 31
+insert into dbo.tabla03 (col0, col1, col2) values (32,'cliente 32','06571''NULL)
+update dbo.tabla03 set col0 = 33, col1 = 'cliente 33', col2 = '92960', col3 =   where id = 33
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (36,'Cliente 36','21757')
+UPDATE dbo.Tabla03 SET col0 = 37, col1 = 'Cliente 37', col2 = '61577', col3 = NULL WHERE id = 37 DECLARE @id37 INT = SCOPE_IDENTITY()
+insert into dbo.tabla03 (col0, col1, col2) values (38,'cliente 38','59343')
+insert into dbo.tabla03 (col0, col1, col2) values (39,'cliente 39','92178')
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (40,'Cliente 40','40448',NULLNULL)
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (41,'Cliente 41','37133',NULLNULL)
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (42,'Cliente 42','05543',NULL)
+UPDATE dbo.Tabla03 SET col0 = 43, col1 = 'Cliente 43', col2 = '71807', col3 = '', col4 =  WHERE id = 43
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (44,'Cliente 44','30675','O''Brien')
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (45,'Cliente 45','50459','O''Brien') DECLARE @id45 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (46,'Cliente 46','34018')
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (47,'Cliente 47','23683''NULL)
+UPDATE dbo.Tabla03 SET col0 = 48, col1 = 'Cliente 48', col2 = '32283', col3 = '', col4 =  WHERE id = 48
+GO
+DECLARE @id14 AS INT
+SET @id14 = 0
+DECLARE @id22 AS INT
+SET @id22 = 0
+DECLARE @id30 AS INT
+SET @id30 = 0
+DECLARE @id37 AS INT
+SET @id37 = 0
+DECLARE @id45 AS INT
+SET @id45 = 0
+UPDATE dbo.Tabla03 SET col0 = 49, col1 = 'Cliente 49', col2 = '45209', col3 = 'línea 1
+línea 2', col4 =  WHERE id = 49
+UPDATE dbo.Tabla03 SET col0 = 50, col1 = 'Cliente 50', col2 = '34288', col3 =  WHERE id = 50
+UPDATE dbo.Tabla03 SET col0 = 51, col1 = 'Cliente 51', col2 = '04963', col3 = NULL, col4 =  WHERE id = 51
+insert into dbo.tabla03 (col0, col1, col2) values (52,'cliente 52','08412')
+UPDATE dbo.Tabla03 SET col0 = 53, col1 = 'Cliente 53', col2 = '30567', col3 =   WHERE id = 53
+UPDATE dbo.Tabla03 SET col0 = 54, col1 = 'Cliente 54', col2 = '22560', col3 = NULL WHERE id = 54 DECLARE @id4 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (55,'Cliente 55','67283''NULL) DECLARE @id5 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (57,'Cliente 57','77304','d''ArtagnanNULLs')
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (58,'Cliente 58','49760',NULL)
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (59,'Cliente 59','04720','d''ArtagnanNULLs''NULL)
+insert into dbo.tabla03 (col0, col1, col2) values (60,'cliente 60','58621') declare @id10 int = scope_identity()
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (61,'Cliente 61','42279') DECLARE @id11 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (63,'Cliente 63','57536''NULL) DECLARE @id13 INT = SCOPE_IDENTITY()
+UPDATE dbo.Tabla03 SET col0 = 64, col1 = 'Cliente 64', col2 = '43844', col3 =  WHERE id = 64
+UPDATE dbo.Tabla03 SET col0 = 65, col1 = 'Cliente 65', col2 = '82706' WHERE id = 65
+INSERT INTO dbo.Tabla03 (col0, col1, col2) VALUES (66,'Cliente 66','47746',NULL) DECLARE @id16 INT = SCOPE_IDENTITY()
+---Tabla: 04.Tabla04
+UPDATE dbo.Tabla04 SET col0 = 0, col1 = 'Cliente 0', col2 = '07534' WHERE id = 0
+UPDATE dbo.Tabla04 SET col0 = 1, col1 = 'Cliente 1', col2 = '58065', col3 = 'd''ArtagnanNULLs' WHERE id = 1 DECLARE @id1 INT = SCOPE_IDENTITY()
+UPDATE dbo.Tabla04 SET col0 = 2, col1 = 'Cliente 2', col2 = '23682', col3 = NULL WHERE id = 2
+UPDATE dbo.Tabla04 SET col0 = 3, col1 = 'Cliente 3', col2 = '95793', col3 = NULL, col4 =  WHERE id = 3
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (4,'Cliente 4','01315''NULL)
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (5,'Cliente 5','36930') DECLARE @id5 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (6,'Cliente 6','87226',NULL) DECLARE @id6 INT = SCOPE_IDENTITY()
+UPDATE dbo.Tabla04 SET col0 = 7, col1 = 'Cliente 7', col2 = '00608', col3 = '' WHERE id = 7
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (8,'Cliente 8','93216')
+UPDATE dbo.Tabla04 SET col0 = 9, col1 = 'Cliente 9', col2 = '58515', col3 = 'línea 1
+línea 2' WHERE id = 9 DECLARE @id9 INT = SCOPE_IDENTITY()
+UPDATE dbo.Tabla04 SET col0 = 10, col1 = 'Cliente 10', col2 = '40883', col3 = 'd''ArtagnanNULLs' WHERE id = 10
+insert into dbo.tabla04 (col0, col1, col2) values (11,'cliente 11','83471','línea 1
+línea 2''NULL)
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (12,'Cliente 12','35784','') DECLARE @id12 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (13,'Cliente 13','70988','d''ArtagnanNULLs''NULL)
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (14,'Cliente 14','02425''NULL)
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (15,'Cliente 15','06811',NULL)
+UPDATE dbo.Tabla04 SET col0 = 16, col1 = 'Cliente 16', col2 = '42025' WHERE id = 16
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (17,'Cliente 17','55330','O''Brien''NULL) DECLARE @id17 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (18,'Cliente 18','02729','')
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (19,'Cliente 19','05277''NULL)
+UPDATE dbo.Tabla04 SET col0 = 20, col1 = 'Cliente 20', col2 = '04689', col3 = NULL, col4 =  WHERE id = 20 DECLARE @id20 INT = SCOPE_IDENTITY()
+insert into dbo.tabla04 (col0, col1, col2) values (21,'cliente 21','21886','línea 1
+línea 2')
+UPDATE dbo.Tabla04 SET col0 = 22, col1 = 'Cliente 22', col2 = '19452', col3 = 'línea 1
+línea 2', col4 =  WHERE id = 22
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (24,'Cliente 24','74734',''NULL)
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (25,'Cliente 25','61468''NULL) DECLARE @id25 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (26,'Cliente 26','51964',NULLNULL)
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (27,'Cliente 27','28330','d''ArtagnanNULLs''NULL)
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (28,'Cliente 28','67763',''NULL)
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (29,'Cliente 29','20253',NULLNULL)
+GO
+DECLARE @id1 AS INT
+SET @id1 = 0
+DECLARE @id5 AS INT
+SET @id5 = 0
+DECLARE @id6 AS INT
+SET @id6 = 0
+DECLARE @id9 AS INT
+SET @id9 = 0
+DECLARE @id12 AS INT
+SET @id12 = 0
+DECLARE @id17 AS INT
+SET @id17 = 0
+DECLARE @id20 AS INT
+SET @id20 = 0
+DECLARE @id25 AS INT
+SET @id25 = 0
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (30,'Cliente 30','67864','d''ArtagnanNULLs')
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (31,'Cliente 31','92209','d''ArtagnanNULLs''NULL)
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (32,'Cliente 32','74967','d''ArtagnanNULLs')
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (33,'Cliente 33','60018',NULLNULL)
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (34,'Cliente 34','97750') DECLARE @id34 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (35,'Cliente 35','75423',NULLNULL)
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (36,'Cliente 36','42705','') DECLARE @id36 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (37,'Cliente 37','39297')
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (38,'Cliente 38','89814',''NULL)
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (39,'Cliente 39','68845',''NULL)
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (40,'Cliente 40','55210','')
+UPDATE dbo.Tabla04 SET col0 = 41, col1 = 'Cliente 41', col2 = '12090', col3 = NULL, col4 =  WHERE id = 41 DECLARE @id41 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (42,'Cliente 42','45004')
+UPDATE dbo.Tabla04 SET col0 = 43, col1 = 'Cliente 43', col2 = '67057', col3 = NULL WHERE id = 43 DECLARE @id43 INT = SCOPE_IDENTITY()
+UPDATE dbo.Tabla04 SET col0 = 44, col1 = 'Cliente 44', col2 = '94747', col3 = '', col4 =  WHERE id = 44
+UPDATE dbo.Tabla04 SET col0 = 45, col1 = 'Cliente 45', col2 = '12910', col3 =  , col4 =  WHERE id = 45
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (46,'Cliente 46','67415') DECLARE @id46 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (47,'Cliente 47','13978','O''Brien''NULL)
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (48,'Cliente 48','08141''NULL)
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (49,'Cliente 49','34945','d''ArtagnanNULLs')
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (50,'Cliente 50','07166','')
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (51,'Cliente 51','05764','línea 1
+línea 2')
+UPDATE dbo.Tabla04 SET col0 = 52, col1 = 'Cliente 52', col2 = '78977', col3 = '' WHERE id = 52
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (53,'Cliente 53','52245')
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (54,'Cliente 54','24451',NULLNULL)
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (55,'Cliente 55','85364','O''Brien')
+UPDATE dbo.Tabla04 SET col0 = 56, col1 = 'Cliente 56', col2 = '45151', col3 = 'O''Brien', col4 =  WHERE id = 56
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (57,'Cliente 57','71416''NULL)
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (58,'Cliente 58','46257',''NULL)
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (59,'Cliente 59','29789')
+UPDATE dbo.Tabla04 SET col0 = 60, col1 = 'Cliente 60', col2 = '48233', col3 = '' WHERE id = 60 DECLARE @id10 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (61,'Cliente 61','35443','d''ArtagnanNULLs''NULL)
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (62,'Cliente 62','11277','d''ArtagnanNULLs')
+UPDATE dbo.Tabla04 SET col0 = 63, col1 = 'Cliente 63', col2 = '47380' WHERE id = 63 DECLARE @id13 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (64,'Cliente 64','52294','')
+INSERT INTO dbo.Tabla04 (col0, col1, col2) VALUES (65,'Cliente 65','36244',NULL)
+---Tabla: 05.Tabla05
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (0,'Cliente 0','91651','d''ArtagnanNULLs') DECLARE @id0 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (1,'Cliente 1','79811''NULL)
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (2,'Cliente 2','20472','O''Brien')
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (3,'Cliente 3','65259',NULL)
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (4,'Cliente 4','85907','O''Brien')
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (5,'Cliente 5','04866',NULL)
+UPDATE dbo.Tabla05 SET col0 = 6, col1 = 'Cliente 6', col2 = '97984', col3 = NULL, col4 =  WHERE id = 6
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (7,'Cliente 7','96811','d''ArtagnanNULLs') DECLARE @id7 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (8,'Cliente 8','67093') DECLARE @id8 INT = SCOPE_IDENTITY()
+GO
+DECLARE @id0 AS INT
+SET @id0 = 0
+DECLARE @id7 AS INT
+SET @id7 = 0
+DECLARE @id8 AS INT
+SET @id8 = 0
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (9,'Cliente 9','73285','línea 1
+línea 2''NULL)
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (10,'Cliente 10','22026',''NULL) DECLARE @id10 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (11,'Cliente 11','63278',NULLNULL) DECLARE @id11 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (12,'Cliente 12','17484''NULL)
+UPDATE dbo.Tabla05 SET col0 = 13, col1 = 'Cliente 13', col2 = '99682' WHERE id = 13
+UPDATE dbo.Tabla05 SET col0 = 14, col1 = 'Cliente 14', col2 = '90456', col3 = NULL WHERE id = 14
+insert into dbo.tabla05 (col0, col1, col2) values (15,'cliente 15','14809','') declare @id15 int = scope_identity()
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (18,'Cliente 18','84555','')
+UPDATE dbo.Tabla05 SET col0 = 20, col1 = 'Cliente 20', col2 = '95766', col3 = NULL WHERE id = 20 DECLARE @id20 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (21,'Cliente 21','48219''NULL)
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (22,'Cliente 22','40678',NULLNULL)
+UPDATE dbo.Tabla05 SET col0 = 23, col1 = 'Cliente 23', col2 = '48401', col3 =  WHERE id = 23
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (24,'Cliente 24','52851')
+update dbo.tabla05 set col0 = 25, col1 = 'cliente 25', col2 = '76168', col3 = NULL where id = 25
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (27,'Cliente 27','94758','O''Brien')
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (28,'Cliente 28','86720''NULL)
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (29,'Cliente 29','94994',NULLNULL)
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (30,'Cliente 30','71135','')
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (31,'Cliente 31','79832','d''ArtagnanNULLs')
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (32,'Cliente 32','55199')
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (33,'Cliente 33','03649''NULL)
+UPDATE dbo.Tabla05 SET col0 = 34, col1 = 'Cliente 34', col2 = '72728', col3 = '', col4 =  WHERE id = 34
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (35,'Cliente 35','26584','O''Brien''NULL)
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (36,'Cliente 36','92942','línea 1
+línea 2')
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (37,'Cliente 37','74299','') DECLARE @id37 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (38,'Cliente 38','99208')
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (39,'Cliente 39','71342',NULL) DECLARE @id39 INT = SCOPE_IDENTITY()
+update dbo.tabla05 set col0 = 41, col1 = 'cliente 41', col2 = '01988', col3 = NULL where id = 41
+UPDATE dbo.Tabla05 SET col0 = 42, col1 = 'Cliente 42', col2 = '26424', col3 =   WHERE id = 42
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (43,'Cliente 43','33504',NULL)
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (44,'Cliente 44','46326','línea 1
+línea 2''NULL) DECLARE @id44 INT = SCOPE_IDENTITY()
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (45,'Cliente 45','46445',''NULL)
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (46,'Cliente 46','09667''NULL)
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (47,'Cliente 47','18906',NULL)
+UPDATE dbo.Tabla05 SET col0 = 49, col1 = 'Cliente 49', col2 = '65768', col3 = 'O''Brien' WHERE id = 49
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (50,'Cliente 50','62358')
+UPDATE dbo.Tabla05 SET col0 = 51, col1 = 'Cliente 51', col2 = '47308', col3 = NULL, col4 =  WHERE id = 51
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (52,'Cliente 52','43433','')
+UPDATE dbo.Tabla05 SET col0 = 53, col1 = 'Cliente 53', col2 = '32602', col3 = 'línea 1
+línea 2', col4 =  WHERE id = 53
+insert into dbo.tabla05 (col0, col1, col2) values (54,'cliente 54','34349','línea 1
+línea 2')
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (55,'Cliente 55','12484')
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (56,'Cliente 56','31200')
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (57,'Cliente 57','66703''NULL)
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (58,'Cliente 58','88048','d''ArtagnanNULLs')
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (59,'Cliente 59','17775','d''ArtagnanNULLs')
+GO
+DECLARE @id10 AS INT
+SET @id10 = 0
+DECLARE @id11 AS INT
+SET @id11 = 0
+DECLARE @id20 AS INT
+SET @id20 = 0
+DECLARE @id37 AS INT
+SET @id37 = 0
+DECLARE @id39 AS INT
+SET @id39 = 0
+DECLARE @id44 AS INT
+SET @id44 = 0
+UPDATE dbo.Tabla05 SET col0 = 60, col1 = 'Cliente 60', col2 = '76912', col3 = NULL WHERE id = 60
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (62,'Cliente 62','76667','línea 1
+línea 2''NULL)
+UPDATE dbo.Tabla05 SET col0 = 63, col1 = 'Cliente 63', col2 = '08879', col3 =  WHERE id = 63
+INSERT INTO dbo.Tabla05 (col0, col1, col2) VALUES (64,'Cliente 64','31051',NULLNULL)
+UPDATE dbo.Tabla05 SET col0 = 65, col1 = 'Cliente 65', col2 = '13050', col3 =  , col4 =  WHERE id = 65 DECLARE @id15 INT = SCOPE_IDENTITY()
+GO
+ROLLBACK
+--COMMIT
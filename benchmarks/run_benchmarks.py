@@ -0,0 +1,267 @@
+# %%
+import os
+import sys
+import json
+import time
+import random
+import timeit
+import platform
+import argparse
+import datetime
+import tempfile
+import subprocess
+from itertools import islice
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import excel2sql
+from generate_workbooks import ESCENARIOS, ESCENARIOS_POR_DEFECTO, ensure_scenario, _valores
+import check_golden
+
+# %% [markdown]
+# ### Medición por etapas
+# Esta sección mide por separado la lectura de las hojas, su limpieza, el reparto en lotes con 'GO' y la escritura del script, y aparte la conversión completa con `process_files`. Cada caso se mide en un proceso nuevo para que el pico de memoria sea solo suyo.
+
+# %%
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+ETAPAS = ("lectura", "limpieza", "lotes", "escritura")
+
+class _MemoryWriter:
+    """
+    Destino en memoria con la misma interfaz que SQLScriptWriter, para medir los lotes sin escribir en disco.
+    """
+
+    def __init__(self):
+        self.lineas = []
+
+    def write(self, texto):
+        self.lineas.append(texto)
+
+    def writelines(self, lineas):
+        self.lineas.extend(lineas)
+
+    def end_batch(self):
+        pass
+
+def measure_stages(ruta_excel, reader):
+    """
+    Convierte un libro etapa a etapa, guardando en memoria el resultado de cada una antes de pasar a la siguiente.
+
+    Returns:
+    - dict: Segundos de cada etapa, filas leídas, sentencias y bytes del script.
+    """
+    tiempos = {}
+    with tempfile.TemporaryDirectory() as directorio_salida:
+        procesador = excel2sql.SQLFileProcessor(
+            ruta_excel, "PROCLI-7777", "Benchmark", "Benchmarks", mode="file", output_dir=directorio_salida, reader=reader
+        )
+
+        inicio = time.perf_counter()
+        workbook, sheet_names = procesador._open_workbook(ruta_excel)
+        hojas = []
+        streaming = workbook.streaming
+        for sheet_name in sheet_names:
+            if streaming:
+                filas = workbook.iter_rows(sheet_name)
+                hojas.append(list(iter(lambda: list(islice(filas, excel2sql.TAMANO_BLOQUE)), [])))
+            else:
+                hojas.append(list(workbook.iter_blocks(sheet_name)))
+        procesador._close_workbook(workbook)
+        tiempos["lectura"] = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        if streaming:
+            hojas = [[excel2sql.to_batch_rows(excel2sql.classify_sql_rows(bloque)) for bloque in bloques] for bloques in hojas]
+        else:
+            hojas = [
+                [excel2sql.to_batch_rows(zip(clasificadas["tipo"], clasificadas["sentencia"], clasificadas["declare"]))
+                 for clasificadas in map(excel2sql.classify_sql_block, bloques)]
+                for bloques in hojas
+            ]
+        tiempos["limpieza"] = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        destino = _MemoryWriter()
+        batcher = excel2sql.SQLBatcher(destino)
+        for sheet_name, bloques in zip(sheet_names, hojas):
+            if bloques:
+                batcher.start_sheet(sheet_name)
+            for filas, _, _ in bloques:
+                batcher.write_rows(filas)
+        tiempos["lotes"] = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        _, cabecera_sql = excel2sql.generate_sql_header(procesador.task_link, procesador.description, procesador.author, procesador.hora_inicio)
+        ruta_salida = os.path.join(directorio_salida, procesador._output_file_name(ruta_excel, 0))
+        with excel2sql.SQLScriptWriter(ruta_salida) as escritor:
+            escritor.write(cabecera_sql)
+            escritor.writelines(destino.lineas)
+            escritor.write(excel2sql.PIE_SQL)
+        tiempos["escritura"] = time.perf_counter() - inicio
+
+        filas = sum(fila if isinstance(fila, int) else 1 for bloques in hojas for filas, _, _ in bloques for fila in filas)
+        sentencias = sum(inserts + updates for bloques in hojas for _, inserts, updates in bloques)
+        return {"tiempos": tiempos, "filas": filas, "sentencias": sentencias, "bytes": os.path.getsize(ruta_salida)}
+
+def measure_total(ruta_excel, reader, workers):
+    """
+    Mide la conversión completa del libro con `process_files`, sin caché.
+    """
+    with tempfile.TemporaryDirectory() as directorio_salida:
+        procesador = excel2sql.SQLFileProcessor(
+            ruta_excel, "PROCLI-7777", "Benchmark", "Benchmarks", mode="file",
+            output_dir=directorio_salida, reader=reader, workers=workers, force=True
+        )
+        inicio = time.perf_counter()
+        procesador.process_files()
+        return {"tiempos": {"total": time.perf_counter() - inicio}}
+
+def run_case(ruta_excel, reader, workers, medida):
+    """
+    Ejecuta una medida en un proceso nuevo y devuelve su resultado con el pico de memoria del proceso.
+    """
+    orden = [sys.executable, os.path.abspath(__file__), "--caso", ruta_excel, reader, str(workers), medida]
+    salida = subprocess.run(orden, check=True, capture_output=True, text=True, encoding="utf-8").stdout
+    return json.loads(salida)
+
+def _run_single_case(ruta_excel, reader, workers, medida):
+    # Proceso hijo de `run_case`: mide y escribe el resultado como JSON por la salida estándar
+    if medida == "etapas":
+        resultado = measure_stages(ruta_excel, reader)
+    else:
+        resultado = measure_total(ruta_excel, reader, int(workers))
+    resultado["rss_pico_mb"] = excel2sql.peak_rss_mb()
+    json.dump(resultado, sys.stdout)
+
+def benchmark_scenario(ruta_excel, reader, workers, repeticiones):
+    """
+    Mide un escenario con un lector. De cada etapa se queda el mejor tiempo de las repeticiones.
+
+    Returns:
+    - dict: Segundos y filas por segundo de cada etapa y de la conversión completa, filas, sentencias, bytes del
+      script y pico de memoria (MB) de las etapas y de la conversión completa.
+    """
+    etapas = [run_case(ruta_excel, reader, workers, "etapas") for _ in range(repeticiones)]
+    totales = [run_case(ruta_excel, reader, workers, "total") for _ in range(repeticiones)]
+
+    filas = etapas[0]["filas"]
+    tiempos = {etapa: min(resultado["tiempos"][etapa] for resultado in etapas) for etapa in ETAPAS}
+    tiempos["total"] = min(resultado["tiempos"]["total"] for resultado in totales)
+    picos_etapas = [resultado["rss_pico_mb"] for resultado in etapas if resultado["rss_pico_mb"] is not None]
+    picos_totales = [resultado["rss_pico_mb"] for resultado in totales if resultado["rss_pico_mb"] is not None]
+
+    return {
+        "filas": filas,
+        "sentencias": etapas[0]["sentencias"],
+        "bytes": etapas[0]["bytes"],
+        "segundos": tiempos,
+        "filas_por_segundo": {etapa: filas / segundos if segundos > 0 else None for etapa, segundos in tiempos.items()},
+        "rss_pico_mb": {
+            "etapas": max(picos_etapas) if picos_etapas else None,
+            "total": max(picos_totales) if picos_totales else None,
+        },
+    }
+
+def measure_statement_cleaning(valores=200, proporcion_especiales=0.3, repeticiones=200):
+    """
+    Mide la limpieza de un INSERT de muchos valores, que es donde más pesaban las pasadas de la limpieza original.
+
+    Returns:
+    - dict: Longitud de la sentencia y microsegundos por sentencia de la limpieza original y de cada modo.
+    """
+    rng = random.Random(0)
+    tuplas = (f"({','.join(_valores(rng, i, proporcion_especiales))})" for i in range(valores))
+    sentencia = "INSERT INTO dbo.Tabla00 (col0, col1, col2) VALUES " + ", ".join(tuplas)
+
+    limpiezas = {"original": lambda: check_golden.legacy_clean_sql_value(sentencia, [])}
+    for modo in excel2sql.CLEANING_MODES:
+        limpiezas[modo] = lambda modo=modo: excel2sql.scan_sql_value(sentencia, modo)
+    microsegundos = {
+        nombre: min(timeit.repeat(limpiar, number=repeticiones, repeat=3)) / repeticiones * 1e6
+        for nombre, limpiar in limpiezas.items()
+    }
+    return {"caracteres": len(sentencia), "microsegundos": microsegundos}
+
+def git_revision():
+    """
+    Commit actual del repositorio y si tiene cambios sin confirmar, o None fuera de un repositorio git.
+    """
+    raiz = os.path.dirname(DIRECTORIO)
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=raiz, check=True, capture_output=True, text=True).stdout.strip()
+        cambios = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=raiz, check=True, capture_output=True, text=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return {"commit": commit, "cambios_sin_confirmar": bool(cambios.strip())}
+
+def main(argv=None):
+    if argv is None and len(sys.argv) > 1 and sys.argv[1] == "--caso":
+        _run_single_case(*sys.argv[2:6])
+        return 0
+
+    parser = argparse.ArgumentParser(description="Pruebas de rendimiento de la conversión de excels a SQL.")
+    parser.add_argument("--escenarios", nargs="+", choices=sorted(ESCENARIOS), default=ESCENARIOS_POR_DEFECTO,
+                        help="Escenarios a medir (por defecto, los de menos de 100.000 filas).")
+    parser.add_argument("--lectores", nargs="+", choices=excel2sql.READERS, default=excel2sql.available_readers("libro.xlsx"),
+                        help="Lectores a medir (por defecto, los instalados que leen .xlsx).")
+    parser.add_argument("--workers", type=int, default=1, help="Procesos de la conversión completa.")
+    parser.add_argument("--repeticiones", type=int, default=1)
+    parser.add_argument("--datos", default=os.path.join(DIRECTORIO, "datos"), help="Directorio de los libros generados.")
+    parser.add_argument("--salida", default=None, help="Archivo JSON de resultados (por defecto, resultados-<commit>.json).")
+    parser.add_argument("--sin-golden", action="store_true", help="No comprobar antes que la salida coincide con el golden.")
+    args = parser.parse_args(argv)
+
+    revision = git_revision()
+    resultados = {
+        "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+        "git": revision,
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "golden": None,
+        "limpieza_por_sentencia": None,
+        "escenarios": {},
+    }
+
+    if not args.sin_golden:
+        diferencias = check_golden.check(args.datos)
+        diferencias_limpieza = check_golden.check_cleaning(20000)
+        lentas = check_golden.check_cleaning_time(20000)
+        resultados["golden"] = not diferencias and not diferencias_limpieza and not lentas
+        for combinacion, diff in diferencias:
+            print(f"La salida con {combinacion} no coincide con el golden:\n{diff}", file=sys.stderr)
+        for sentencia, original, nuevo in diferencias_limpieza:
+            print(f"La limpieza de {sentencia!r} no coincide con la original: {original!r} != {nuevo!r}", file=sys.stderr)
+        for cleaning, sentencia, segundos in lentas:
+            print(f"La limpieza '{cleaning}' de {sentencia[:80]!r}... ({len(sentencia)} caracteres) tarda {segundos:.2f}s", file=sys.stderr)
+
+    limpieza = measure_statement_cleaning()
+    resultados["limpieza_por_sentencia"] = limpieza
+    print(
+        f"Limpieza de un INSERT de {limpieza['caracteres']} caracteres: " +
+        ", ".join(f"{nombre} {us:.0f} µs" for nombre, us in limpieza["microsegundos"].items()),
+        file=sys.stderr
+    )
+
+    for escenario in args.escenarios:
+        ruta_excel = ensure_scenario(args.datos, escenario)
+        resultados["escenarios"][escenario] = {"parametros": ESCENARIOS[escenario], "lectores": {}}
+        for reader in args.lectores:
+            print(f"Midiendo {escenario} con {reader}...", file=sys.stderr)
+            medida = benchmark_scenario(ruta_excel, reader, args.workers, args.repeticiones)
+            resultados["escenarios"][escenario]["lectores"][reader] = medida
+            print(
+                f"  {medida['filas']} filas: " +
+                ", ".join(f"{etapa} {medida['segundos'][etapa]:.3f}s" for etapa in (*ETAPAS, "total")) +
+                f", pico {medida['rss_pico_mb']['total']} MB",
+                file=sys.stderr
+            )
+
+    salida = args.salida or os.path.join(DIRECTORIO, f"resultados-{revision['commit'][:10] if revision else 'local'}.json")
+    with open(salida, "w", encoding="utf-8") as archivo:
+        json.dump(resultados, archivo, ensure_ascii=False, indent=1)
+    print(f"Resultados guardados en {salida}", file=sys.stderr)
+
+    return 0 if resultados["golden"] is not False else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,92 @@
 # %%
 import os
+import sys
 import glob
-import pandas as pd
 import datetime
 import re
-import tkinter as tk
-from tkinter import filedialog, messagebox, Tk, scrolledtext, Toplevel
+import uuid
+import json
+import hashlib
+import csv
+import argparse
+import time
+import queue
+import signal
+import threading
+import select
+import struct
+import copy
+import zipfile
+import gzip
+import io
+import xml.etree.ElementTree as ElementTree
+import contextlib
+import abc
+import importlib
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import deque
+from itertools import repeat, islice
 import warnings
 warnings.simplefilter(action='ignore', category=UserWarning) #Ignorar warnings
 
+class _LazyModule:
+    # Módulo pendiente de importar. No se busca ni se registra en sys.modules hasta que se usa uno de sus atributos,
+    # así que el script se importa aunque el paquete no esté instalado y solo falla la operación que lo necesita
+
+    def __init__(self, nombre, alias):
+        self._nombre = nombre
+        self._alias = alias
+
+    def __getattr__(self, atributo):
+        if atributo.startswith("__"):
+            raise AttributeError(atributo)
+        try:
+            modulo = importlib.import_module(self._nombre)
+        except ModuleNotFoundError as e:
+            if e.name != self._nombre:
+                raise
+            raise ModuleNotFoundError(
+                f"Esta operación necesita {self._nombre}, que no está instalado. Instálalo con 'pip install {self._nombre}'.",
+                name=self._nombre
+            ) from e
+        # A partir de aquí el nombre global es el módulo de verdad, sin pasar por este objeto
+        globals()[self._alias] = modulo
+        return getattr(modulo, atributo)
+
+def _lazy_import(nombre, alias):
+    """
+    Devuelve el módulo si ya está importado o, si no, un `_LazyModule` que lo importa la primera vez que se usa uno
+    de sus atributos. Así una conversión por línea de comandos que no necesita pandas no paga su importación, y el
+    lector de CSV o el de openpyxl funcionan aunque pandas no esté instalado.
+    """
+    return sys.modules.get(nombre) or _LazyModule(nombre, alias)
+
+def _module_installed(nombre):
+    """
+    Indica si un paquete está instalado sin importarlo. No pasa por los `_LazyModule`, así que comprobar pandas
+    no lo carga.
+
+    Args:
+    - nombre (str): Nombre del paquete de primer nivel.
+
+    Returns:
+    - bool: True si ya está importado o si se puede importar.
+    """
+    return nombre in sys.modules or importlib.util.find_spec(nombre) is not None
+
+pd = _lazy_import("pandas", "pd")
+openpyxl = _lazy_import("openpyxl", "openpyxl")
+
+def _import_gui():
+    """
+    Importa tkinter solo al abrir la interfaz, para poder usar el script en equipos sin entorno gráfico.
+    """
+    global tk, filedialog, messagebox, ttk
+    import tkinter as tk
+    from tkinter import filedialog, messagebox, ttk
+
 # %% [markdown]
 # ### Utils
 # Esta sección contiene funciones de utilidad que son utilizadas a lo largo del script para generar el encabezado SQL y limpiar valores SQL.
@@ -50,159 +128,3140 @@ BEGIN TRAN
     
     return codigo_tarea, cabecera_sql
 
-def clean_sql_value(value, declares):
-    # Detectar y almacenar variables DECLARE
-    if 'DECLARE' in str(value):
-        nombre_variable = re.search(r'(?<=DECLARE\s@)\w+', value)
-        if nombre_variable:
-            declares.append(nombre_variable.group())
-    
-    # Convertir 'NULL' y valores vacíos
-    value = str(value).replace("''", "NULL").replace("'NULL'", "NULL").replace("%%", "''").replace("$$", "\n")
+# Patrones compilados una sola vez, compartidos por la limpieza fila a fila y por bloques
+PATRON_VACIOS = re.compile(r"(?<=\()\s*,|,\s*(?=\))|(?<=,)\s*(?=,)|(?<=,)\s*(?=$)")
+
+# Modos de limpieza: 'compat' reproduce byte a byte la salida de siempre y 'corrected' respeta los literales entre
+# comillas (ver `_scan_corrected`)
+CLEANING_MODES = ("compat", "corrected")
+
+# La limpieza original encadenaba seis pasadas sobre la sentencia: cuatro `replace`, PATRON_VACIOS y la de comillas
+# internas `(\w)'(\w)`. El modo 'compat' las hace en una sola. Cada coincidencia de PATRON_COMPAT es un punto donde
+# alguna de las pasadas cambia algo, y el resto de la sentencia se copia sin pasar por Python. Los `$$` cuentan como
+# espacio porque la pasada de vacíos ya los veía convertidos en saltos de línea.
+_ESPACIO = r"(?:\s|\$\$)"
+_COMILLA_SUELTA = r"'(?!'|NULL'(?!'))"  # Comilla que los `replace` no tocan
+_TRAS_COMILLA = rf"(?=\w|,{_ESPACIO}*\))"  # Lo que sigue a una comilla interna (`,)` acaba siendo `NULL)`)
+PATRON_COMPAT = re.compile("|".join([
+    # Comillas: '' y 'NULL' (pasan a NULL), ''' y comillas internas entre letras
+    rf"'(?:''(?!NULL'(?!')){_TRAS_COMILLA}|'|NULL'(?!')|(?<=\w'){_TRAS_COMILLA})",
+    # Valores vacíos al principio de una lista, entre comas y al final
+    rf"\((?=[\s$,]){_ESPACIO}*,(?:{_COMILLA_SUELTA}{_TRAS_COMILLA}|(?:{_ESPACIO}|,)*)",
+    rf",(?=[\s$,)]|\Z){_ESPACIO}*(?:,(?:{_ESPACIO}|,)*|\Z|(?=\)))",
+    r"%%",
+    r"\$\$",
+    r"DECLARE\s@(\w+)",
+]))
+_REEMPLAZOS_FIJOS = {"''": "NULL", "'NULL'": "NULL", "%%": "''", "$$": "\n"}
+_PATRON_PALABRA = re.compile(r"\w")
+
+def _scan_compat(value):
+    """
+    Limpia una sentencia en una sola pasada, con el mismo resultado que la cadena de reemplazos original.
+
+    Returns:
+    - sentencia (str): Sentencia limpia.
+    - variable_declare (str o None): Primera variable DECLARE de la sentencia.
+    """
+    value = str(value)
+    declares = []
+    # Fin de la última comilla interna duplicada si le seguía una letra. `(\w)'(\w)` se come esa letra, así que la
+    # comilla siguiente ya no se duplica (`a'b'c` pasa a `a''b'c`)
+    consumido = -1
+
+    def reemplazar(coincidencia):
+        nonlocal consumido
+        texto = coincidencia.group()
+        fijo = _REEMPLAZOS_FIJOS.get(texto)
+        if fijo is not None:
+            return fijo
+        inicio, fin = coincidencia.span()
+        if texto[0] == "'":
+            if texto == "'''":
+                # La primera pareja pasa a NULL y la tercera comilla queda detrás de su L
+                consumido = fin if _PATRON_PALABRA.match(value, fin) else -1
+                return "NULL''"
+            if inicio - 1 == consumido:
+                return "'"
+            consumido = fin if _PATRON_PALABRA.match(value, fin) else -1
+            return "''"
+        if texto[0] == "D":
+            if not declares:
+                declares.append(coincidencia.group(1))
+            return texto
+        if texto[-1] == "'":
+            # `(,'x`: el NULL del valor vacío queda delante de la comilla y hace que se duplique
+            consumido = fin if _PATRON_PALABRA.match(value, fin) else -1
+            return "(NULL''"
+        # Grupo de valores vacíos: se le aplica PATRON_VACIOS con el carácter siguiente como contexto
+        derecha = value[fin:fin + 1]
+        grupo = PATRON_VACIOS.sub("NULL", texto.replace("$$", "\n") + derecha)
+        return grupo[:len(grupo) - len(derecha)]
+
+    sentencia = PATRON_COMPAT.sub(reemplazar, value)
+    return sentencia, declares[0] if declares else None
+
+# El modo 'corrected' separa los literales entre comillas del resto de la sentencia. Dentro de un literal, `''` es una
+# comilla escapada y se conserva, una comilla entre dos letras es un apóstrofo que se duplica y cualquier otra comilla
+# lo cierra. Una comilla sin cierre abre un literal hasta el final de la sentencia, que se deja tal cual salvo los `$$`
+# (volver a buscar un cierre desde cada comilla siguiente haría cuadrática la limpieza). Cada coincidencia de
+# PATRON_CORREGIDO es un tramo que no cambia (texto fuera de comillas y literales que no hay que tocar) seguido del
+# siguiente punto a limpiar o del final. El tramo es texto corriente intercalado con piezas que empiezan cada una por
+# un carácter especial distinto, y donde una pieza no encaja siempre encaja la alternativa a limpiar del mismo
+# carácter. Así el tramo solo se puede partir de una manera, la expresión nunca falla y recorre la sentencia una sola
+# vez.
+_CIERRE = r"'(?!')(?!(?<=\w')\w)"
+_LITERAL_SIN_CAMBIOS = rf"'(?!(?:NULL)?{_CIERRE})[^'$]*(?:(?:''|\$(?!\$))[^'$]*)*{_CIERRE}"
+_LITERAL = rf"'[^']*(?:(?:''|(?<=\w)'(?=\w))[^']*)*{_CIERRE}"
+_TEXTO = r"[^'(,%$D]*"
+_PIEZAS = "|".join([
+    _LITERAL_SIN_CAMBIOS,
+    rf"\((?!{_ESPACIO}*,)",
+    rf",(?!{_ESPACIO}*(?:[,)]|\Z))",
+    r"%(?!%)",
+    r"\$(?!\$)",
+    r"D(?!ECLARE\s@\w)",
+])
+PATRON_CORREGIDO = re.compile(
+    rf"({_TEXTO}(?:(?:{_PIEZAS}){_TEXTO})*)(?:"
+    rf"(?P<literal>{_LITERAL})"
+    rf"|(?P<vacios>\({_ESPACIO}*,(?:{_ESPACIO}|,)*|,{_ESPACIO}*(?:,(?:{_ESPACIO}|,)*|\Z|(?=\))))"
+    r"|(?P<declare>DECLARE\s@(?P<variable>\w+))"
+    r"|(?P<sin_cierre>'[\s\S]*)"
+    r"|(?P<fijo>%%|\$\$)"
+    r"|\Z)"
+)
+# Como PATRON_VACIOS, pero sin perder las comas: `(,` pasa a `(NULL,` y `,)` a `,NULL)`
+PATRON_VACIOS_CORREGIDO = re.compile(r"(?<=[(,])\s*(?=,)|(?<=,)\s*(?=\)|\Z)")
+PATRON_APOSTROFO = re.compile(r"(?<=\w)'(?=\w)")
+_REEMPLAZOS_CORREGIDOS = {"%%": "''", "$$": "\n"}
+
+def _scan_corrected(value):
+    """
+    Limpia una sentencia respetando los literales entre comillas:
+    - Un literal vacío ('') o 'NULL' pasa a NULL. 'it''s' se conserva y 'O'Brien' pasa a 'O''Brien'.
+    - Desde una comilla sin cierre, el resto de la sentencia se deja tal cual salvo los `$$`.
+    - `%%` pasa a '' y las variables DECLARE se detectan solo fuera de los literales.
+    - `$$` pasa a salto de línea en toda la sentencia.
+    - Los valores vacíos pasan a NULL sin perder las comas: `(,1,)` pasa a `(NULL,1,NULL)`.
+
+    Returns:
+    - sentencia (str): Sentencia limpia.
+    - variable_declare (str o None): Primera variable DECLARE fuera de los literales.
+    """
+    value = str(value)
+    declares = []
+
+    def reemplazar(coincidencia):
+        sin_cambios, literal, vacios, sin_cierre, fijo = coincidencia.group(1, "literal", "vacios", "sin_cierre", "fijo")
+        if literal is not None:
+            contenido = literal[1:-1]
+            if contenido == "" or contenido == "NULL":
+                return sin_cambios + "NULL"
+            contenido = contenido.replace("$$", "\n")
+            if "'" in contenido:
+                contenido = PATRON_APOSTROFO.sub("''", contenido)
+            return f"{sin_cambios}'{contenido}'"
+        if vacios is not None:
+            fin = coincidencia.end()
+            derecha = value[fin:fin + 1]
+            grupo = PATRON_VACIOS_CORREGIDO.sub("NULL", vacios.replace("$$", "\n") + derecha)
+            return sin_cambios + grupo[:len(grupo) - len(derecha)]
+        if sin_cierre is not None:
+            return sin_cambios + sin_cierre.replace("$$", "\n")
+        if fijo is not None:
+            return sin_cambios + _REEMPLAZOS_CORREGIDOS[fijo]
+        if coincidencia.group("declare") is not None:
+            if not declares:
+                declares.append(coincidencia.group("variable"))
+            return sin_cambios + coincidencia.group("declare")
+        return sin_cambios
+
+    sentencia = PATRON_CORREGIDO.sub(reemplazar, value)
+    return sentencia, declares[0] if declares else None
+
+_SCANNERS = {"compat": _scan_compat, "corrected": _scan_corrected}
+
+def scan_sql_value(value, cleaning="compat"):
+    """
+    Limpia una sentencia y detecta su variable DECLARE en una sola pasada.
+
+    Args:
+    - value (str): Sentencia a limpiar.
+    - cleaning (str, opcional): Modo de limpieza (ver CLEANING_MODES).
+
+    Returns:
+    - sentencia (str): Sentencia limpia.
+    - variable_declare (str o None): Primera variable DECLARE de la sentencia.
+    """
+    return _SCANNERS[cleaning](value)
+
+def clean_sql_value(value, declares, cleaning="compat"):
+    # Limpia la sentencia y añade su variable DECLARE, si la tiene, a `declares`
+    sentencia, variable_declare = scan_sql_value(value, cleaning)
+    if variable_declare is not None:
+        declares.append(variable_declare)
+    return sentencia
+
+def _strip_text(columna):
+    """
+    Devuelve la columna con los textos sin espacios al principio y al final, y NaN en las celdas que no son texto.
+    """
+    try:
+        return columna.astype(object).str.strip()
+    except AttributeError:
+        # Columna sin ningún texto (por ejemplo, solo números)
+        return pd.Series(float("nan"), index=columna.index, dtype=object)
+
+def classify_sql_block(bloque, tiempos=None, cleaning="compat"):
+    """
+    Versión por bloques de la lógica fila a fila: clasifica todas las filas de un bloque como UPDATE, INSERT o
+    sin sentencia con operaciones de `Series.str` en lugar de recorrer las filas, y limpia las sentencias con
+    `scan_sql_value`.
+
+    Args:
+    - bloque (pd.DataFrame): Filas de una hoja con las columnas 'insert' y 'update'.
+    - tiempos (dict, opcional): Si se indica, suma a su clave 'limpieza' los segundos de la limpieza.
+    - cleaning (str, opcional): Modo de limpieza (ver CLEANING_MODES).
+
+    Returns:
+    - pd.DataFrame: Mismo índice que el bloque, con las columnas 'tipo' ('update', 'insert' o NaN),
+      'sentencia' (sentencia limpia o NaN) y 'declare' (variable DECLARE de la sentencia, o None o NaN si no tiene).
+    """
+    updates = _strip_text(bloque["update"])
+    inserts = _strip_text(bloque["insert"])
+
+    # Si hay un INSERT y un UPDATE a la vez, se coge el UPDATE
+    es_update = updates.str.lower().str.startswith("update", na=False).astype(bool)
+    es_insert = ~es_update & inserts.str.lower().str.startswith("insert into", na=False).astype(bool)
+
+    tipo = pd.Series(None, index=bloque.index, dtype=object)
+    tipo[es_update] = "update"
+    tipo[es_insert] = "insert"
+
+    sentencias = updates.where(es_update, inserts)[es_update | es_insert]
+    inicio_limpieza = time.perf_counter() if tiempos is not None else None
+    # Una sola pasada por sentencia, que además devuelve su variable DECLARE
+    escanear = _SCANNERS[cleaning]
+    limpias = [escanear(sentencia) for sentencia in sentencias]
+    declares = pd.Series([variable for _, variable in limpias], index=sentencias.index, dtype=object)
+    sentencias = pd.Series([sentencia for sentencia, _ in limpias], index=sentencias.index, dtype=object)
+    if tiempos is not None:
+        tiempos["limpieza"] += time.perf_counter() - inicio_limpieza
+
+    return pd.DataFrame({"tipo": tipo, "sentencia": sentencias, "declare": declares}, index=bloque.index)
+
+def _timed(funcion, tiempos, fase):
+    """
+    Devuelve `funcion` envuelta para sumar a `tiempos[fase]` los segundos de cada llamada.
+    """
+    def funcion_medida(*args):
+        inicio = time.perf_counter()
+        try:
+            return funcion(*args)
+        finally:
+            tiempos[fase] += time.perf_counter() - inicio
+    return funcion_medida
+
+def classify_sql_rows(filas, tiempos=None, cleaning="compat"):
+    """
+    Versión de `classify_sql_block` para las filas del lector en streaming. Aplica `scan_sql_value` a cada fila
+    sin pasar por pandas, que con columnas de texto también recorre los valores uno a uno, así que una conversión
+    que no lo necesita no paga su importación.
+
+    Args:
+    - filas (iterable): Tuplas `(index, insert_value, update_value)`.
+    - tiempos (dict, opcional): Si se indica, suma a su clave 'limpieza' los segundos de `scan_sql_value`.
+    - cleaning (str, opcional): Modo de limpieza (ver CLEANING_MODES).
+
+    Yields:
+    - tipo ('update', 'insert' o None), sentencia (str o None), variable_declare (str o None) por cada fila.
+    """
+    # Sin medir tiempos no se paga el envoltorio en cada fila
+    escanear = _SCANNERS[cleaning]
+    limpiar = escanear if tiempos is None else _timed(escanear, tiempos, "limpieza")
+    for _, insert_value, update_value in filas:
+        # Si hay un INSERT y un UPDATE a la vez, se coge el UPDATE
+        if isinstance(update_value, str) and update_value.strip().lower().startswith("update"):
+            yield ("update", *limpiar(update_value.strip()))
+        elif isinstance(insert_value, str) and insert_value.strip().lower().startswith("insert into"):
+            yield ("insert", *limpiar(insert_value.strip()))
+        else:
+            yield None, None, None
+
+def to_batch_rows(filas_clasificadas):
+    """
+    Pasa las filas clasificadas de un bloque al formato de `SQLBatcher.write_rows` y cuenta sus INSERTs y UPDATEs.
+
+    Args:
+    - filas_clasificadas (iterable): Tuplas `(tipo, sentencia, variable_declare)` de `classify_sql_rows` o de las
+      columnas de `classify_sql_block`.
+
+    Returns:
+    - filas (list): Tuplas `(sentencia, variable_declare)` y enteros con el número de filas seguidas sin sentencia.
+    - insert_count (int), update_count (int): INSERTs y UPDATEs del bloque.
+    """
+    filas = []
+    sin_sentencia = 0
+    insert_count = 0
+    update_count = 0
+    for tipo, sentencia, variable_declare in filas_clasificadas:
+        if not isinstance(sentencia, str):
+            sin_sentencia += 1
+            continue
+        if sin_sentencia:
+            filas.append(sin_sentencia)
+            sin_sentencia = 0
+        filas.append((sentencia, variable_declare if isinstance(variable_declare, str) else None))
+        if tipo == "insert":
+            insert_count += 1
+        else:
+            update_count += 1
+    if sin_sentencia:
+        filas.append(sin_sentencia)
+
+    return filas, insert_count, update_count
+
+# %% [markdown]
+# ### Lectura de hojas
+# Esta sección contiene los lectores que extraen de cada hoja las columnas U (INSERT) y W (UPDATE). El de pandas devuelve la hoja como un DataFrame con las columnas 'insert' y 'update' y los de streaming (openpyxl, calamine y CSV) devuelven tuplas `(index, insert_value, update_value)` fila a fila. Ninguno devuelve nada si la hoja no tiene columnas suficientes.
+
+# %%
+COLUMNA_INSERT = 20  # Columna U
+COLUMNA_UPDATE = 22  # Columna W
+
+TAMANO_BLOQUE = 10000  # Filas que se limpian y escriben de una vez en la lectura en streaming
+
+def iter_sheet_blocks_pandas(workbook, sheet_name):
+    """
+    Lee la hoja completa con pandas y la devuelve como un único bloque con las columnas INSERT y UPDATE.
+
+    Args:
+    - workbook (pd.ExcelFile): Libro abierto con pandas.
+    - sheet_name (str): Nombre de la hoja.
+    """
+    df = pd.read_excel(workbook, sheet_name=sheet_name)
+
+    # Verificar que el DataFrame no esté vacío y tenga al menos las columnas necesarias (21 para 'INSERT', 23 para 'UPDATE')
+    if df.empty or df.shape[1] <= COLUMNA_INSERT:
+        return
+
+    yield pd.DataFrame({
+        "insert": df.iloc[:, COLUMNA_INSERT],
+        "update": df.iloc[:, COLUMNA_UPDATE] if df.shape[1] > COLUMNA_UPDATE else None,
+    }, index=df.index)
+
+def iter_sheet_rows(filas):
+    """
+    Recorre las filas de una hoja, sin construir un DataFrame. La memoria usada depende de una fila y no del tamaño
+    de la hoja. La usan todos los lectores en streaming, así que todos devuelven lo mismo.
+
+    Reproduce lo que haría `pd.read_excel`: la primera fila es la cabecera, las filas vacías del final se descartan
+    y la hoja solo se procesa si tiene alguna fila de datos y al menos 21 columnas. Como eso no se sabe hasta leer
+    la hoja, las filas sin sentencia se quedan pendientes (solo su índice) hasta que se confirma que hay que devolverlas.
+
+    Args:
+    - filas (iterable): Valores de cada fila de la hoja desde la A1, con None o "" en las celdas vacías.
+    """
+    ancho_maximo = 0
+    primera_pendiente = 0
+    for numero_fila, fila in enumerate(filas):
+        ancho = len(fila)
+        while ancho and (fila[ancho - 1] is None or fila[ancho - 1] == ""):
+            ancho -= 1
+        ancho_maximo = max(ancho_maximo, ancho)
+
+        # La primera fila es la cabecera
+        if numero_fila == 0:
+            continue
+
+        index = numero_fila - 1
+        if ancho == 0 or ancho_maximo <= COLUMNA_INSERT:
+            continue
+
+        # Las filas pendientes ya no pueden ser las últimas de la hoja: no tienen sentencia
+        for index_pendiente in range(primera_pendiente, index):
+            yield index_pendiente, None, None
+        primera_pendiente = index + 1
+
+        insert_value = fila[COLUMNA_INSERT] if ancho > COLUMNA_INSERT else None
+        update_value = fila[COLUMNA_UPDATE] if ancho > COLUMNA_UPDATE else None
+        yield index, insert_value, update_value
+
+def iter_sheet_rows_openpyxl(worksheet):
+    """
+    Recorre la hoja fila a fila con openpyxl en modo solo lectura (ver `iter_sheet_rows`).
+
+    Args:
+    - worksheet (ReadOnlyWorksheet): Hoja de un libro abierto con `read_only=True`.
+    """
+    # Igual que pandas: ignorar la dimensión declarada en el xml, que puede estar mal
+    worksheet.reset_dimensions()
+    return iter_sheet_rows(worksheet.iter_rows(values_only=True))
+
+_NS_RELACIONES = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+PATRON_REFERENCIA_CELDA = re.compile(r"\$?([A-Z]{1,3})\$?(\d+)")
+
+def _cell_position(referencia):
+    """
+    Columna (1 = A) y fila de una referencia de celda como 'U12', o None si no es válida.
+    """
+    partes = PATRON_REFERENCIA_CELDA.fullmatch(referencia or "")
+    if partes is None:
+        return None
+    columna = 0
+    for letra in partes.group(1):
+        columna = columna * 26 + ord(letra) - ord("A") + 1
+    return columna, int(partes.group(2))
+
+def _local_name(tag):
+    return tag.rsplit("}", 1)[-1]
+
+def _sheet_paths(zip_libro):
+    """
+    Ruta dentro del zip del xml de cada hoja de cálculo del libro (sin las de gráficos).
+    """
+    relaciones = {}
+    for relacion in ElementTree.fromstring(zip_libro.read("xl/_rels/workbook.xml.rels")):
+        if relacion.get("Type", "").endswith("/worksheet"):
+            destino = relacion.get("Target", "")
+            relaciones[relacion.get("Id")] = destino.lstrip("/") if destino.startswith("/") else "xl/" + destino
+    rutas = {}
+    for elemento in ElementTree.fromstring(zip_libro.read("xl/workbook.xml")).iter():
+        if _local_name(elemento.tag) == "sheet" and elemento.get(_NS_RELACIONES) in relaciones:
+            rutas[elemento.get("name")] = relaciones[elemento.get(_NS_RELACIONES)]
+    return rutas
+
+def _sheet_has_no_statements(archivo_xml):
+    """
+    Decide si una hoja seguro que no tiene sentencias: no tiene filas de datos o ninguna de sus celdas llega a la
+    columna U. La dimensión declarada puede estar desfasada (por ejemplo, sin contar filas añadidas después), así que
+    solo sirve para dejar de mirar una hoja que dice llegar a la columna U en cuanto tiene una fila de datos. Si no,
+    se recorren las referencias de todas las celdas, sin leer sus valores, y se para en la primera que llega a la
+    columna U: entonces la hoja se lee entera.
+    """
+    ancha = False  # La dimensión o alguna celda llega a la columna U
+    filas = 0
+    for evento, elemento in ElementTree.iterparse(archivo_xml, events=("start", "end")):
+        nombre = _local_name(elemento.tag)
+        if evento == "end":
+            # Las filas ya vistas no hacen falta: no dejar que el árbol crezca con la hoja
+            if nombre == "row":
+                elemento.clear()
+            continue
+        if nombre == "dimension":
+            inicio, _, fin = elemento.get("ref", "").partition(":")
+            dimension = _cell_position(fin) if fin and _cell_position(inicio) else None
+            ancha = dimension is not None and dimension[0] > COLUMNA_INSERT
+        elif nombre == "row":
+            filas += 1
+            # Una primera fila que no es la 1 deja filas vacías delante de la cabecera: mejor leer la hoja
+            if filas == 1 and elemento.get("r", "1") != "1":
+                return False
+            if filas > 1 and ancha:
+                return False
+        elif nombre == "c":
+            posicion = _cell_position(elemento.get("r"))
+            if posicion is None:
+                return False
+            if posicion[0] > COLUMNA_INSERT:
+                if filas > 1:
+                    return False
+                ancha = True
+    # Solo la cabecera, o todas las celdas antes de la columna U
+    return True
+
+def find_skippable_sheets(ruta):
+    """
+    Hojas de un .xlsx/.xlsm que se pueden descartar sin leerlas, porque las referencias de sus celdas (leídas
+    directamente del zip, sin los valores) dicen que no pueden tener sentencias en las columnas U y W. Si alguna celda
+    llega a la columna U o las referencias faltan, la hoja no se descarta y se lee entera.
+
+    Returns:
+    - set: Nombres de las hojas que se pueden descartar.
+    """
+    descartables = set()
+    try:
+        with zipfile.ZipFile(ruta) as zip_libro:
+            for nombre, ruta_xml in _sheet_paths(zip_libro).items():
+                with zip_libro.open(ruta_xml) as archivo_xml:
+                    if _sheet_has_no_statements(archivo_xml):
+                        descartables.add(nombre)
+    except (OSError, KeyError, zipfile.BadZipFile, ElementTree.ParseError):
+        return set()
+    return descartables
+
+class SheetReader(abc.ABC):
+    """
+    Lector de las hojas de un archivo. No se usa directamente: los lectores en streaming heredan de `RowReader` y
+    devuelven las filas con `iter_rows`, y el de pandas hereda de `BlockReader` y devuelve cada hoja como un bloque
+    con `iter_blocks`. `streaming` indica de cuál de los dos es.
+    """
+    streaming = None
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.sheet_names = []
+        self._descartables = None
+
+    def skippable_sheets(self):
+        """
+        Hojas que se pueden descartar sin leerlas (ver `find_skippable_sheets`). Solo se calculan para .xlsx/.xlsm,
+        la primera vez que se piden.
+        """
+        if self._descartables is None:
+            self._descartables = find_skippable_sheets(self.ruta) if self.ruta.lower().endswith(EXTENSIONES_EXCEL) else set()
+        return self._descartables
+
+    def close(self):
+        pass
+
+class RowReader(SheetReader):
+    # Lector en streaming: las filas se leen de una en una
+    streaming = True
+
+    @abc.abstractmethod
+    def iter_rows(self, sheet_name):
+        """
+        Filas de una hoja, en el formato de `iter_sheet_rows`.
+        """
+
+class BlockReader(SheetReader):
+    # Lector que carga cada hoja entera en memoria
+    streaming = False
+
+    @abc.abstractmethod
+    def iter_blocks(self, sheet_name):
+        """
+        Bloques de filas de una hoja, en el formato de `iter_sheet_blocks_pandas`.
+        """
+
+class PandasReader(BlockReader):
+    # pandas elige el motor según la extensión: openpyxl, pyxlsb para .xlsb y odfpy para .ods
+
+    def __init__(self, ruta):
+        super().__init__(ruta)
+        self.workbook = pd.ExcelFile(ruta)
+        self.sheet_names = self.workbook.sheet_names
+
+    def iter_blocks(self, sheet_name):
+        return iter_sheet_blocks_pandas(self.workbook, sheet_name)
+
+    def close(self):
+        self.workbook.close()
+
+class OpenpyxlReader(RowReader):
+
+    def __init__(self, ruta):
+        super().__init__(ruta)
+        self.workbook = openpyxl.load_workbook(ruta, read_only=True, data_only=True, keep_links=False)
+        self.sheet_names = [worksheet.title for worksheet in self.workbook.worksheets]
+
+    def iter_rows(self, sheet_name):
+        return iter_sheet_rows_openpyxl(self.workbook[sheet_name])
+
+    def close(self):
+        self.workbook.close()
+
+class CalamineReader(RowReader):
+    # python-calamine (Rust) lee .xlsx, .xlsm, .xlsb y .ods bastante más rápido que openpyxl
+
+    def __init__(self, ruta):
+        super().__init__(ruta)
+        import python_calamine
+        self.workbook = python_calamine.CalamineWorkbook.from_path(ruta)
+        self.sheet_names = list(self.workbook.sheet_names)
+
+    def iter_rows(self, sheet_name):
+        return iter_sheet_rows(self._iter_values(self.workbook.get_sheet_by_name(sheet_name)))
+
+    def _iter_values(self, sheet):
+        # calamine empieza en la primera celda con datos: se rellena hasta la A1 para que las columnas coincidan
+        fila_inicio, columna_inicio = sheet.start or (0, 0)
+        for _ in range(fila_inicio):
+            yield ()
+        relleno = [None] * columna_inicio
+        for fila in sheet.iter_rows():
+            yield relleno + fila if columna_inicio else fila
+
+    def close(self):
+        cerrar = getattr(self.workbook, "close", None)
+        if cerrar is not None:
+            cerrar()
+
+class CSVReader(RowReader):
+    # Exportaciones CSV/TSV de una sola hoja, que se llama como el archivo
+
+    def __init__(self, ruta):
+        super().__init__(ruta)
+        self.sheet_names = [os.path.splitext(os.path.basename(ruta))[0]]
+        with open(ruta, "rb") as archivo:
+            muestra = archivo.read(64 * 1024)
+        # Excel exporta en UTF-8 con BOM o en la página de códigos de Windows
+        try:
+            muestra.decode("utf-8")
+            self.encoding = "utf-8-sig"
+        except UnicodeDecodeError as e:
+            # La muestra puede cortar un carácter por la mitad
+            cortado = len(muestra) == 64 * 1024 and e.start >= len(muestra) - 3
+            self.encoding = "utf-8-sig" if cortado else "cp1252"
+        if ruta.lower().endswith(".tsv"):
+            self.delimiter = "\t"
+        else:
+            # Excel en español exporta con ';'. El separador se busca en la cabecera, porque csv.Sniffer se confunde
+            # con las comas de las sentencias
+            cabecera = muestra.decode(self.encoding, errors="ignore").split("\n", 1)[0]
+            self.delimiter = max(",;\t|", key=cabecera.count)
+
+    def iter_rows(self, sheet_name):
+        with open(self.ruta, encoding=self.encoding, newline="") as archivo:
+            yield from iter_sheet_rows(csv.reader(archivo, delimiter=self.delimiter))
+
+READER_CLASSES = {
+    "pandas": PandasReader,
+    "openpyxl": OpenpyxlReader,
+    "calamine": CalamineReader,
+    "csv": CSVReader,
+}
+READERS = ("auto", *READER_CLASSES)
+EXTENSIONES_EXCEL = (".xlsx", ".xlsm")
+EXTENSIONES = (*EXTENSIONES_EXCEL, ".xlsb", ".ods", ".csv", ".tsv")
+
+def available_readers(ruta):
+    """
+    Lectores instalados que pueden abrir un archivo según su extensión, sin contar 'auto'.
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension in (".csv", ".tsv"):
+        return ["csv"]
+    lectores = []
+    motor_pandas = {".xlsb": "pyxlsb", ".ods": "odf"}.get(extension, "openpyxl")
+    if _module_installed("pandas") and _module_installed(motor_pandas):
+        lectores.append("pandas")
+    if extension in EXTENSIONES_EXCEL:
+        lectores.append("openpyxl")
+    if _module_installed("python_calamine"):
+        lectores.append("calamine")
+    return lectores
+
+def select_reader(ruta):
+    """
+    Elige el lector más rápido de los instalados para un archivo: calamine, después openpyxl en streaming y por
+    último pandas. Si no hay ninguno (un .xlsb sin pyxlsb ni calamine), pandas, que avisa de la dependencia que falta.
+    """
+    lectores = available_readers(ruta)
+    return next((nombre for nombre in ("csv", "calamine", "openpyxl") if nombre in lectores), "pandas")
+
+def open_sheet_reader(ruta, reader="auto"):
+    """
+    Abre un archivo con el lector indicado o, con 'auto', con el de `select_reader`. Si calamine no puede abrir un
+    .xlsx/.xlsm, se vuelve a abrir con openpyxl.
+
+    Returns:
+    - SheetReader: Lector abierto.
+    """
+    nombre = select_reader(ruta) if reader == "auto" else reader
+    try:
+        return READER_CLASSES[nombre](ruta)
+    except Exception as e:
+        if reader != "auto" or nombre != "calamine" or not ruta.lower().endswith(EXTENSIONES_EXCEL):
+            raise
+        print(f"calamine no ha podido abrir {os.path.basename(ruta)} ({e}); se lee con openpyxl", file=sys.stderr)
+        return OpenpyxlReader(ruta)
+
+# %% [markdown]
+# ### Escritura de scripts
+# Esta sección define el escritor que vuelca el script SQL al disco a medida que se genera, en lugar de construirlo entero en memoria.
+
+# %%
+# Destinos de los scripts. Los de archivo se guardan en el directorio de salida (comprimidos con gzip o zstd si se
+# pide) y se pueden reutilizar de la caché; 'stdout' los escribe seguidos en la salida estándar y 'memory' los deja en
+# `SQLFileProcessor.output_bytes`
+SALIDAS = ("file", "gzip", "zstd", "stdout", "memory")
+SALIDAS_ARCHIVO = ("file", "gzip", "zstd")
+EXTENSIONES_SALIDA = {"file": ".sql", "gzip": ".sql.gz", "zstd": ".sql.zst", "stdout": ".sql", "memory": ".sql"}
+
+def script_sink(ruta):
+    """
+    Salida con la que se escribió un script, según su extensión.
+    """
+    if ruta.endswith(".gz"):
+        return "gzip"
+    if ruta.endswith(".zst"):
+        return "zstd"
+    return "file"
+
+def open_script(ruta, newline=None):
+    """
+    Abre para leer un script generado, descomprimiéndolo si es un `.sql.gz` o un `.sql.zst`.
+    """
+    salida = script_sink(ruta)
+    if salida == "gzip":
+        return gzip.open(ruta, "rt", encoding="utf-8", newline=newline)
+    if salida == "zstd":
+        import zstandard
+        comprimido = open(ruta, "rb")
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(comprimido, closefd=True), encoding="utf-8", newline=newline)
+    return open(ruta, encoding="utf-8", newline=newline)
+
+class _CountingStream(io.RawIOBase):
+    # Pasa los bytes al destino contándolos, para saber el tamaño del script sin comprimir. Cerrarlo no cierra el destino
+
+    def __init__(self, destino):
+        self.destino = destino
+        self.bytes = 0
+
+    def writable(self):
+        return True
+
+    def write(self, datos):
+        self.destino.write(datos)
+        self.bytes += len(datos)
+        return len(datos)
+
+class SQLScriptWriter:
+
+    def __init__(self, ruta_archivo_salida, buffer_size=1024 * 1024, newline=None, output_sink="file", memoria=None):
+        """
+        Escritor incremental de un script SQL. Escribe en un fichero temporal del mismo directorio y solo lo renombra
+        al nombre definitivo al cerrarse sin errores, así que nunca queda un `.sql` a medio escribir.
+
+        Con `output_sink` 'gzip' o 'zstd' el script se comprime a medida que se escribe. Con 'stdout' se escribe en la
+        salida estándar, donde un fallo sí deja el script a medias (sin ROLLBACK ni COMMIT). Con 'memory' se guarda en
+        `memoria` al cerrarse sin errores.
+
+        Args:
+        - ruta_archivo_salida (str): Ruta final del archivo SQL.
+        - buffer_size (int, opcional): Tamaño del buffer de escritura en bytes.
+        - newline (str, opcional): Como en `open`; con "" los saltos de línea se escriben tal cual.
+        - output_sink (str, opcional): Destino del script (ver SALIDAS).
+        - memoria (dict, opcional): Con 'memory', diccionario donde se guardan los bytes del script con su nombre.
+        """
+        if output_sink not in SALIDAS:
+            raise ValueError(f"Salida desconocida: {output_sink}. Opciones: {', '.join(SALIDAS)}")
+        self.ruta_archivo_salida = ruta_archivo_salida
+        self.buffer_size = buffer_size
+        self.newline = newline
+        self.output_sink = output_sink
+        self.memoria = memoria
+        self._ruta_temporal = None
+        self._archivo = None
+        self._destino = None
+        self._crudo = None
+        self._contador = None
+        self._bytes_finales = None
+
+    def __enter__(self):
+        if self.output_sink in SALIDAS_ARCHIVO:
+            directorio = os.path.dirname(self.ruta_archivo_salida) or os.curdir
+            os.makedirs(directorio, exist_ok=True)
+
+            # El temporal va en el mismo directorio para que el renombrado final sea atómico
+            nombre_temporal = f".{os.path.basename(self.ruta_archivo_salida)}.{uuid.uuid4().hex}.tmp"
+            self._ruta_temporal = os.path.join(directorio, nombre_temporal)
+        if self.output_sink == "file":
+            self._archivo = open(self._ruta_temporal, "x", encoding="utf-8", buffering=self.buffer_size, newline=self.newline)
+            return self
+
+        if self.output_sink == "stdout":
+            self._destino = sys.stdout.buffer
+        elif self.output_sink == "memory":
+            self._destino = io.BytesIO()
+        else:
+            self._crudo = open(self._ruta_temporal, "xb")
+            try:
+                if self.output_sink == "gzip":
+                    # Sin fecha ni nombre del temporal en la cabecera, para que el mismo script dé los mismos bytes
+                    nombre = os.path.basename(self.ruta_archivo_salida)[:-len(".gz")]
+                    self._destino = gzip.GzipFile(nombre, "wb", compresslevel=6, fileobj=self._crudo, mtime=0)
+                else:
+                    import zstandard
+                    self._destino = zstandard.ZstdCompressor(level=3).stream_writer(self._crudo, closefd=False)
+            except BaseException:
+                self._crudo.close()
+                os.remove(self._ruta_temporal)
+                raise
+        self._contador = _CountingStream(self._destino)
+        self._archivo = io.TextIOWrapper(io.BufferedWriter(self._contador, self.buffer_size), encoding="utf-8", newline=self.newline)
+        return self
+
+    def write(self, texto):
+        self._archivo.write(texto)
+
+    def writelines(self, lineas):
+        self._archivo.writelines(lineas)
+
+    def bytes_written(self):
+        """
+        Bytes escritos hasta ahora, sin comprimir. Vacía el buffer, así que solo se usa al medir métricas.
+        """
+        if self._bytes_finales is not None:
+            return self._bytes_finales
+        self._archivo.flush()
+        if self._contador is not None:
+            return self._contador.bytes
+        return self._archivo.buffer.tell()
+
+    def end_batch(self):
+        # Un script de un solo archivo no se parte entre lotes
+        pass
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.output_sink != "file":
+            return self._close_sink(exc_type)
+        try:
+            if exc_type is None:
+                self._bytes_finales = self.bytes_written()
+            self._archivo.close()
+            if exc_type is None:
+                os.replace(self._ruta_temporal, self.ruta_archivo_salida)
+        finally:
+            # Si algo ha fallado, no dejar el temporal a medias en el directorio de salida
+            if os.path.exists(self._ruta_temporal):
+                os.remove(self._ruta_temporal)
+        return False
+
+    def _close_sink(self, exc_type):
+        try:
+            if exc_type is None:
+                self._bytes_finales = self.bytes_written()
+            self._archivo.close()
+            if self.output_sink == "stdout":
+                self._destino.flush()
+            elif self.output_sink == "memory":
+                if exc_type is None and self.memoria is not None:
+                    self.memoria[os.path.basename(self.ruta_archivo_salida)] = self._destino.getvalue()
+            else:
+                # Cierra el compresor, que escribe el final del archivo comprimido
+                self._destino.close()
+                self._crudo.close()
+                if exc_type is None:
+                    os.replace(self._ruta_temporal, self.ruta_archivo_salida)
+        finally:
+            if self._crudo is not None:
+                self._crudo.close()
+            if self._ruta_temporal is not None and os.path.exists(self._ruta_temporal):
+                os.remove(self._ruta_temporal)
+        return False
+
+class ShardedScriptWriter:
+
+    def __init__(self, ruta_fragmento, max_file_bytes, cabecera, pie, output_sink="file", memoria=None):
+        """
+        Escritor de un script SQL partido en varios archivos de como mucho `max_file_bytes` bytes. Cada archivo es
+        un script completo, con su cabecera y su pie, y solo se parte entre lotes, así que se pueden ejecutar por
+        separado. Un lote que no cabe en ningún archivo va solo en el suyo.
+
+        Guarda en memoria el lote actual hasta que SQLBatcher avisa con `end_batch` de que ha terminado.
+
+        Args:
+        - ruta_fragmento (callable): Recibe el número del archivo (0, 1, ...) y devuelve su ruta.
+        - max_file_bytes (int): Tamaño máximo de cada archivo en bytes.
+        - cabecera (str): Texto del principio de cada archivo.
+        - pie (str): Texto del final de cada archivo.
+        - output_sink (str, opcional), memoria (dict, opcional): Destino de cada archivo (ver SQLScriptWriter). El
+          tamaño máximo es el del script sin comprimir.
+        """
+        self.ruta_fragmento = ruta_fragmento
+        self.output_sink = output_sink
+        self.memoria = memoria
+        self.max_file_bytes = max_file_bytes
+        self.cabecera = cabecera
+        self.pie = pie
+        self.rutas = []
+        self._actual = None
+        self._bytes_pie = len(pie.encode("utf-8"))
+        self._bytes_archivo = 0
+        self._bytes_anteriores = 0
+        self._lotes_archivo = 0
+        self._lote = []
+        self._bytes_lote = 0
+
+    def __enter__(self):
+        self._open_next()
+        return self
+
+    def _open_next(self):
+        if self._actual is not None:
+            self._actual.write(self.pie)
+            self._actual.__exit__(None, None, None)
+            self._bytes_anteriores += self._bytes_archivo + self._bytes_pie
+        ruta = self.ruta_fragmento(len(self.rutas))
+        self._actual = SQLScriptWriter(ruta, output_sink=self.output_sink, memoria=self.memoria).__enter__()
+        self.rutas.append(ruta)
+        self._actual.write(self.cabecera)
+        self._bytes_archivo = len(self.cabecera.encode("utf-8"))
+        self._lotes_archivo = 0
+
+    def write(self, texto):
+        self._lote.append(texto)
+        self._bytes_lote += len(texto.encode("utf-8"))
+
+    def writelines(self, lineas):
+        for linea in lineas:
+            self.write(linea)
+
+    def end_batch(self):
+        """
+        Escribe el lote actual en el archivo actual o, si ya no cabe, cierra el archivo y lo escribe en el siguiente.
+        """
+        if not self._lote:
+            return
+        if self._lotes_archivo and self._bytes_archivo + self._bytes_lote + self._bytes_pie > self.max_file_bytes:
+            self._open_next()
+        self._actual.writelines(self._lote)
+        self._bytes_archivo += self._bytes_lote
+        self._lotes_archivo += 1
+        self._lote = []
+        self._bytes_lote = 0
+
+    def bytes_written(self):
+        return self._bytes_anteriores + self._bytes_archivo + self._bytes_lote
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self.end_batch()
+                self._actual.write(self.pie)
+        except BaseException as e:
+            exc_type, exc_value, traceback = type(e), e, e.__traceback__
+            raise
+        finally:
+            self._actual.__exit__(exc_type, exc_value, traceback)
+            if exc_type is not None:
+                # Los archivos ya terminados no sirven sin el resto
+                for ruta in self.rutas[:-1]:
+                    if os.path.exists(ruta):
+                        os.remove(ruta)
+                    if self.memoria is not None:
+                        self.memoria.pop(os.path.basename(ruta), None)
+        return False
+
+PIE_SQL = "GO\nROLLBACK\n--COMMIT\n"
+
+# Límites de SQL Server para un INSERT de varias filas: filas por VALUES y parámetros por sentencia
+MAX_FILAS_VALUES = 1000
+MAX_PARAMETROS = 2100
+
+PATRON_INSERT_UNA_FILA = re.compile(
+    r"(insert\s+into\s+[^\s(]+\s*(?:\([^()']*\)\s*)?values\s*)(\(.*\))\s*(;?)\s*", re.IGNORECASE | re.DOTALL
+)
+PATRON_TOKENS_VALORES = re.compile(r"'[^']*(?:''[^']*)*'|[(),@']|[^'(),@]+")
+# Subconsultas y SCOPE_IDENTITY no se pueden repartir entre las filas de un mismo INSERT
+PATRON_VALOR_NO_AGRUPABLE = re.compile(r"select|identity|ident_current", re.IGNORECASE)
+PATRON_TEXTO_LITERAL = re.compile(r"N?'[^']*(?:''[^']*)*'", re.IGNORECASE)
+PATRON_NUMERO_LITERAL = re.compile(r"[-+]?(?:\d+\.?\d*|\.\d+)(?:e[-+]?\d+)?", re.IGNORECASE)
+
+def literal_kind(valor):
+    """
+    Tipo de un valor de un VALUES: 'texto', 'numero', 'otro' (expresiones como GETDATE()) o None para NULL, que vale
+    para cualquier columna. SQL Server da un solo tipo a cada columna de un VALUES de varias filas, así que un texto
+    y un número en la misma columna fallan al convertir el texto aunque cada INSERT por separado funcione.
+    """
+    valor = valor.strip()
+    if valor.upper() == "NULL":
+        return None
+    if PATRON_TEXTO_LITERAL.fullmatch(valor):
+        return "texto"
+    if PATRON_NUMERO_LITERAL.fullmatch(valor):
+        return "numero"
+    return "otro"
+
+def split_single_row_insert(sentencia):
+    """
+    Separa un `INSERT INTO tabla (columnas) VALUES (...)` de una sola fila en la parte hasta VALUES y la tupla de
+    valores, para agruparlo con los INSERTs siguientes a la misma tabla.
+
+    Returns:
+    - tuple o None: `(cabecera, tupla, tipos, punto_y_coma)`, con `tipos` el de cada valor (ver `literal_kind`), o
+      None si la sentencia no es un INSERT de una sola fila o si sus valores usan variables, subconsultas,
+      SCOPE_IDENTITY o comillas sin cerrar.
+    """
+    partes = PATRON_INSERT_UNA_FILA.fullmatch(sentencia)
+    if partes is None:
+        return None
+    cabecera, tupla, punto_y_coma = partes.groups()
+
+    profundidad = 0
+    tipos = []
+    inicio_valor = 1
+    for token in PATRON_TOKENS_VALORES.finditer(tupla):
+        texto = token.group()
+        if texto == "(":
+            profundidad += 1
+        elif texto == ")":
+            profundidad -= 1
+            # La tupla tiene que acabar justo al cerrar su paréntesis: `(1), (2)` ya tiene varias filas
+            if profundidad == 0:
+                if token.end() != len(tupla):
+                    return None
+                tipos.append(literal_kind(tupla[inicio_valor:token.start()]))
+        elif texto == ",":
+            if profundidad == 1:
+                tipos.append(literal_kind(tupla[inicio_valor:token.start()]))
+                inicio_valor = token.end()
+        elif texto in ("@", "'"):
+            return None
+        elif texto[0] != "'" and PATRON_VALOR_NO_AGRUPABLE.search(texto):
+            return None
+    return cabecera, tupla, tuple(tipos), punto_y_coma
+
+class BatchPolicy:
+
+    def __init__(self, max_statements=None, max_bytes=None, per_sheet=False):
+        """
+        Reparto configurable de las sentencias en lotes con 'GO', en lugar de la cadencia de siempre de SQLBatcher.
+        Un lote se cierra antes de la sentencia que supera cualquiera de los límites. Las filas sin sentencia no
+        cuentan, y tras cada 'GO' se vuelven a declarar todas las variables DECLARE de la hoja.
+
+        Args:
+        - max_statements (int, opcional): Sentencias como mucho por lote.
+        - max_bytes (int, opcional): Bytes como mucho por lote, contando las variables que se vuelven a declarar.
+          Una sentencia más grande que el límite va sola en su lote.
+        - per_sheet (bool, opcional): Cierra el lote al terminar cada hoja.
+        """
+        for nombre, valor in (("max_statements", max_statements), ("max_bytes", max_bytes)):
+            if valor is not None and valor < 1:
+                raise ValueError(f"{nombre} tiene que ser mayor que 0: {valor}")
+        self.max_statements = max_statements
+        self.max_bytes = max_bytes
+        self.per_sheet = per_sheet
+
+    def to_dict(self):
+        return {"max_statements": self.max_statements, "max_bytes": self.max_bytes, "per_sheet": self.per_sheet}
+
+class SQLBatcher:
+
+    def __init__(self, escritor, coalesce_inserts=False, policy=None):
+        """
+        Separa las sentencias de un script en lotes con 'GO' cada 45 sentencias y vuelve a declarar tras cada 'GO'
+        las variables DECLARE que han aparecido desde el anterior.
+
+        Args:
+        - escritor (SQLScriptWriter o ShardedScriptWriter): Destino de las líneas. Se le avisa con `end_batch` al
+          terminar cada lote.
+        - coalesce_inserts (bool, opcional): Agrupa los INSERTs seguidos a la misma tabla y columnas, y con el mismo
+          número de valores, en un solo INSERT de como mucho MAX_FILAS_VALUES filas y MAX_PARAMETROS valores. Los
+          que declaran una variable o no se pueden separar con `split_single_row_insert` se escriben solos. Cada
+          INSERT agrupado cuenta como una sentencia para los 'GO'.
+        - policy (BatchPolicy, opcional): Reparto en lotes. Sin ella, un 'GO' cada 45 sentencias como siempre.
+        """
+        self.escritor = escritor
+        self.contador_lineas_totales = 0
+        self.declares = []
+        self.coalesce_inserts = coalesce_inserts
+        self.policy = policy
+        self._grupo = None  # INSERT agrupado pendiente de escribir
+        # Estado del lote actual con `policy`
+        self._sentencias_lote = 0
+        self._bytes_lote = 0
+        self._variables_lote = set()
+
+    def start_sheet(self, sheet_name):
+        self.flush()
+        self.declares = []
+        lineas = []
+        if self.policy is not None and self.policy.per_sheet and self._sentencias_lote:
+            self._cut(lineas)
+        lineas.append(f"---Tabla: {sheet_name}\n")
+        self.escritor.writelines(lineas)
+
+    def write_rows(self, filas):
+        """
+        Escribe filas de la hoja actual.
+
+        Args:
+        - filas (list): Tuplas `(sentencia, variable_declare)` por cada fila con sentencia y enteros con el número
+          de filas seguidas sin sentencia.
+        """
+        lineas = []
+        for fila in filas:
+            if isinstance(fila, int):
+                if self.policy is not None:
+                    continue
+                # Un INSERT agrupado pendiente ya cuenta para el contador: si con él se llega a un múltiplo de 45, se
+                # escribe antes de los 'GO' de las filas vacías
+                if self._grupo is not None:
+                    if (self.contador_lineas_totales + 1) % 45 != 0:
+                        continue
+                    self._flush_group(lineas)
+                # Las filas sin sentencia no hacen avanzar el contador, pero si está en múltiplo de 45 cada una escribe un 'GO'
+                if self.contador_lineas_totales % 45 == 0:
+                    for _ in range(fila):
+                        self._write_go(lineas)
+                continue
+
+            sentencia, variable_declare = fila
+            if self.coalesce_inserts and not variable_declare:
+                partes = split_single_row_insert(sentencia)
+                if partes is not None:
+                    self._add_to_group(lineas, sentencia, *partes)
+                    continue
+            self._flush_group(lineas)
+            self._write_statement(lineas, sentencia, variable_declare)
+        self.escritor.writelines(lineas)
+
+    def flush(self):
+        """
+        Escribe el INSERT agrupado pendiente, si lo hay. Se llama al terminar cada hoja.
+        """
+        lineas = []
+        self._flush_group(lineas)
+        self.escritor.writelines(lineas)
+
+    def _write_statement(self, lineas, sentencia, variable_declare):
+        if self.policy is not None:
+            self._write_statement_policy(lineas, sentencia, variable_declare)
+            return
+
+        if variable_declare:
+            self.declares.append(variable_declare)
+        lineas.append(sentencia + "\n")
+        self.contador_lineas_totales += 1
+
+        # Control de declaración 'GO' cada 45 líneas
+        if self.contador_lineas_totales % 45 == 0:
+            self._write_go(lineas)
+
+    def _write_statement_policy(self, lineas, sentencia, variable_declare):
+        linea = sentencia + "\n"
+        tamano = len(linea.encode("utf-8")) if self.policy.max_bytes else 0
+        if self._sentencias_lote and (
+            (self.policy.max_statements and self._sentencias_lote >= self.policy.max_statements)
+            or (self.policy.max_bytes and self._bytes_lote + tamano > self.policy.max_bytes)
+            # Una variable no se puede declarar dos veces en el mismo lote
+            or (variable_declare and variable_declare in self._variables_lote)
+        ):
+            self._cut(lineas, sin_declarar=variable_declare)
+
+        if variable_declare:
+            if variable_declare not in self.declares:
+                self.declares.append(variable_declare)
+            self._variables_lote.add(variable_declare)
+        lineas.append(linea)
+        self._sentencias_lote += 1
+        self._bytes_lote += tamano
+        self.contador_lineas_totales += 1
+
+    def _cut(self, lineas, sin_declarar=None):
+        """
+        Cierra el lote actual con `policy` y empieza el siguiente volviendo a declarar las variables de la hoja,
+        salvo `sin_declarar`, que la declara la sentencia que abre el lote.
+        """
+        lineas.append("GO\n")
+        self._end_batch(lineas)
+        self._sentencias_lote = 0
+        self._bytes_lote = 0
+        self._variables_lote = set()
+        for variable in self.declares:
+            if variable != sin_declarar:
+                declaracion = f"DECLARE @{variable} AS INT\nSET @{variable} = 0\n"
+                lineas.append(declaracion)
+                self._variables_lote.add(variable)
+                if self.policy.max_bytes:
+                    self._bytes_lote += len(declaracion.encode("utf-8"))
+
+    def _end_batch(self, lineas):
+        # El escritor recibe el lote completo antes de decidir si lo escribe en el archivo actual o en el siguiente
+        self.escritor.writelines(lineas)
+        lineas.clear()
+        self.escritor.end_batch()
+
+    def _add_to_group(self, lineas, sentencia, cabecera, tupla, tipos, punto_y_coma):
+        # Todas las filas de un VALUES tienen que tener el mismo número de valores, y cada columna valores de un mismo
+        # tipo (los NULL valen para cualquiera)
+        clave = (" ".join(cabecera.lower().split()), len(tipos))
+        grupo = self._grupo
+        if grupo is not None and (
+            grupo["clave"] != clave
+            or len(grupo["tuplas"]) == MAX_FILAS_VALUES
+            or grupo["valores"] + len(tipos) > MAX_PARAMETROS
+            or any(tipo and tipo_grupo and tipo != tipo_grupo for tipo, tipo_grupo in zip(tipos, grupo["tipos"]))
+        ):
+            self._flush_group(lineas)
+            grupo = None
+        if grupo is None:
+            grupo = self._grupo = {
+                "clave": clave, "sentencia": sentencia, "cabecera": cabecera,
+                "punto_y_coma": punto_y_coma, "tuplas": [], "valores": 0, "tipos": tipos,
+            }
+        else:
+            grupo["tipos"] = tuple(tipo_grupo or tipo for tipo, tipo_grupo in zip(tipos, grupo["tipos"]))
+        grupo["tuplas"].append(tupla)
+        grupo["valores"] += len(tipos)
+
+    def _flush_group(self, lineas):
+        grupo = self._grupo
+        if grupo is None:
+            return
+        self._grupo = None
+        if len(grupo["tuplas"]) == 1:
+            # Un INSERT que no se ha agrupado con ningún otro se escribe tal cual
+            sentencia = grupo["sentencia"]
+        else:
+            sentencia = grupo["cabecera"] + ",\n".join(grupo["tuplas"]) + grupo["punto_y_coma"]
+        self._write_statement(lineas, sentencia, None)
+
+    def _write_go(self, lineas):
+        lineas.append("GO\n")
+        self._end_batch(lineas)
+        for variable in self.declares:
+            lineas.append(f"DECLARE @{variable} AS INT\nSET @{variable} = 0\n")
+        self.declares.clear()
+
+# Carga masiva: las filas de INSERT con valores literales van a archivos de datos en el formato de carácter de bcp, con
+# los separadores por defecto de BULK INSERT (tabulador entre campos y \r\n entre filas) y un campo vacío para NULL
+PATRON_CABECERA_INSERT = re.compile(r"insert\s+into\s+([^\s(]+)\s*(?:\(([^()']*)\)\s*)?values\s*", re.IGNORECASE)
+PATRON_VALOR_LITERAL = re.compile(
+    r"\s*(?:(NULL)|([-+]?(?:\d+\.?\d*|\.\d+)(?:e[-+]?\d+)?)|N?'((?:[^']|'')*)')\s*(?:,|\Z)", re.IGNORECASE
+)
+
+def split_literal_insert(sentencia):
+    """
+    Separa un INSERT de una sola fila con valores literales (números, textos y NULL) en tabla, columnas y valores,
+    para cargarlo desde un archivo de datos.
+
+    Returns:
+    - tuple o None: `(tabla, columnas, valores)`, con `columnas` None si el INSERT no las indica y None en los valores
+      NULL. None si la sentencia no se puede cargar así: variables, funciones, textos vacíos (que se cargarían como
+      NULL) o con tabuladores o saltos de línea, o un número de valores distinto del de columnas.
+    """
+    partes = split_single_row_insert(sentencia)
+    if partes is None:
+        return None
+    cabecera, tupla, tipos, _ = partes
+    tabla, columnas = PATRON_CABECERA_INSERT.fullmatch(cabecera).groups()
+
+    contenido = tupla[1:-1]
+    valores = []
+    posicion = 0
+    while posicion < len(contenido) or not valores:
+        valor = PATRON_VALOR_LITERAL.match(contenido, posicion)
+        if valor is None:
+            return None
+        nulo, numero, texto = valor.groups()
+        if texto is not None:
+            if not texto or "\t" in texto or "\r" in texto or "\n" in texto:
+                return None
+            texto = texto.replace("''", "'")
+        valores.append(None if nulo else numero if numero is not None else texto)
+        posicion = valor.end()
+
+    columnas = [columna.strip() for columna in columnas.split(",")] if columnas else None
+    if len(valores) != len(tipos) or (columnas is not None and len(columnas) != len(valores)):
+        return None
+    return tabla, columnas, valores
+
+def bcp_format_file(numero_campos):
+    """
+    Archivo de formato XML de bcp para un archivo de datos de `numero_campos` campos de texto. Con él,
+    OPENROWSET(BULK ...) devuelve los campos como columnas c1, c2... en el orden de las columnas del INSERT.
+    """
+    campos = []
+    columnas = []
+    for numero in range(1, numero_campos + 1):
+        separador = "\\r\\n" if numero == numero_campos else "\\t"
+        campos.append(f'  <FIELD ID="{numero}" xsi:type="CharTerm" TERMINATOR="{separador}"/>\n')
+        columnas.append(f'  <COLUMN SOURCE="{numero}" NAME="c{numero}" xsi:type="SQLNVARCHAR"/>\n')
+    return (
+        '<?xml version="1.0"?>\n'
+        '<BCPFORMAT xmlns="http://schemas.microsoft.com/sqlserver/2004/bulkload/format" '
+        'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">\n'
+        f' <RECORD>\n{"".join(campos)} </RECORD>\n'
+        f' <ROW>\n{"".join(columnas)} </ROW>\n'
+        '</BCPFORMAT>\n'
+    )
+
+def _sql_string(texto):
+    return "'" + texto.replace("'", "''") + "'"
+
+class BulkDataFiles:
+
+    def __init__(self, ruta_base, server_dir=None):
+        """
+        Archivos de datos de la carga masiva de un libro. Cada archivo se escribe con SQLScriptWriter, así que nunca
+        queda uno a medias; si la conversión falla, se borran también los ya terminados.
+
+        Args:
+        - ruta_base (callable): Recibe el número del archivo (0, 1, ...) y devuelve su ruta sin extensión.
+        - server_dir (str, opcional): Directorio de los archivos tal como lo ve el servidor de base de datos, para las
+          rutas de las sentencias de carga. Por defecto, la ruta absoluta local.
+        """
+        self.ruta_base = ruta_base
+        self.server_dir = server_dir
+        self.rutas = []
+        self._abiertos = []
+        self._siguiente = 0
+
+    def __enter__(self):
+        return self
+
+    def open(self, numero_campos, con_formato):
+        """
+        Abre el siguiente archivo de datos y, con `con_formato`, escribe también su archivo de formato.
+
+        Returns:
+        - dict: El escritor del archivo (`escritor`), su ruta (`ruta`), la del archivo de formato (`formato`, o None)
+          y las filas escritas (`filas`).
+        """
+        ruta_base = self.ruta_base(self._siguiente)
+        self._siguiente += 1
+        archivo = {"escritor": None, "ruta": ruta_base + ".dat", "formato": None, "filas": 0}
+        if con_formato:
+            archivo["formato"] = ruta_base + ".xml"
+            with SQLScriptWriter(archivo["formato"]) as escritor:
+                escritor.write(bcp_format_file(numero_campos))
+        # Sin traducir los saltos de línea, para que las filas acaben en \r\n en cualquier sistema
+        archivo["escritor"] = SQLScriptWriter(archivo["ruta"], newline="").__enter__()
+        self._abiertos.append(archivo)
+        return archivo
+
+    def close(self, archivo):
+        self._abiertos.remove(archivo)
+        archivo["escritor"].__exit__(None, None, None)
+        self.rutas.extend(ruta for ruta in (archivo["formato"], archivo["ruta"]) if ruta)
+
+    def server_path(self, ruta):
+        if self.server_dir is None:
+            return os.path.abspath(ruta)
+        separador = "\\" if "\\" in self.server_dir else "/"
+        return self.server_dir.rstrip("\\/") + separador + os.path.basename(ruta)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            for archivo in list(self._abiertos):
+                if exc_type is None:
+                    self.close(archivo)
+                else:
+                    self._abiertos.remove(archivo)
+                    self.rutas.extend(ruta for ruta in (archivo["formato"],) if ruta)
+                    archivo["escritor"].__exit__(exc_type, exc_value, traceback)
+        finally:
+            if exc_type is not None:
+                # Sin el script, los archivos de datos no sirven
+                for ruta in self.rutas:
+                    if os.path.exists(ruta):
+                        os.remove(ruta)
+        return False
+
+class BulkLoadBatcher:
+
+    def __init__(self, batcher, archivos_datos):
+        """
+        Carga masiva: escribe las filas de INSERT con valores literales (ver `split_literal_insert`) en archivos de
+        datos, uno por hoja, tabla y columnas, y en el script las sentencias que los cargan: BULK INSERT si el INSERT
+        no indica columnas y, si las indica, un INSERT ... SELECT de OPENROWSET(BULK ...) con un archivo de formato.
+        El resto de filas se escriben como siempre con `batcher`.
+
+        Cada tramo de filas seguidas a la misma tabla se carga con una sentencia con FIRSTROW y LASTROW en el sitio
+        de sus filas, así que el orden respecto a las demás sentencias no cambia.
+
+        Args:
+        - batcher (SQLBatcher): Escritor de las sentencias del script.
+        - archivos_datos (BulkDataFiles): Archivos de datos del libro.
+        """
+        self.batcher = batcher
+        self.archivos_datos = archivos_datos
+        self._archivos_hoja = {}
+        self._tramo = None  # [archivo, primera fila, última fila] pendiente de cargar
+
+    def start_sheet(self, sheet_name):
+        self.flush()
+        for archivo in self._archivos_hoja.values():
+            self.archivos_datos.close(archivo)
+        self._archivos_hoja = {}
+        self.batcher.start_sheet(sheet_name)
+
+    def write_rows(self, filas):
+        """
+        Escribe filas de la hoja actual, en el formato de `SQLBatcher.write_rows`.
+        """
+        salida = []
+        for fila in filas:
+            if not isinstance(fila, int):
+                sentencia, variable_declare = fila
+                partes = None if variable_declare else split_literal_insert(sentencia)
+                if partes is not None:
+                    self._add_row(salida, *partes)
+                    continue
+                self._close_range(salida)
+            salida.append(fila)
+        self.batcher.write_rows(salida)
+
+    def flush(self):
+        salida = []
+        self._close_range(salida)
+        self.batcher.write_rows(salida)
+        self.batcher.flush()
+
+    def _add_row(self, salida, tabla, columnas, valores):
+        clave = (tabla.lower(), tuple(columna.lower() for columna in columnas) if columnas else None, len(valores))
+        archivo = self._archivos_hoja.get(clave)
+        if archivo is None:
+            archivo = self._archivos_hoja[clave] = self.archivos_datos.open(len(valores), columnas is not None)
+            archivo.update(tabla=tabla, columnas=columnas)
+        if self._tramo is not None and self._tramo[0] is not archivo:
+            self._close_range(salida)
+
+        archivo["escritor"].write("\t".join("" if valor is None else valor for valor in valores) + "\r\n")
+        archivo["filas"] += 1
+        if self._tramo is None:
+            self._tramo = [archivo, archivo["filas"], archivo["filas"]]
+        else:
+            self._tramo[2] = archivo["filas"]
+
+    def _close_range(self, salida):
+        if self._tramo is None:
+            return
+        archivo, primera, ultima = self._tramo
+        self._tramo = None
+        ruta_datos = _sql_string(self.archivos_datos.server_path(archivo["ruta"]))
+        filas = f"FIRSTROW = {primera}, LASTROW = {ultima}"
+        if archivo["columnas"] is None:
+            # KEEPNULLS: los campos vacíos se cargan como NULL y no con el valor por defecto de la columna
+            sentencia = f"BULK INSERT {archivo['tabla']} FROM {ruta_datos} WITH (CODEPAGE = '65001', KEEPNULLS, {filas})"
+        else:
+            ruta_formato = _sql_string(self.archivos_datos.server_path(archivo["formato"]))
+            sentencia = (
+                f"INSERT INTO {archivo['tabla']} ({', '.join(archivo['columnas'])}) SELECT * FROM OPENROWSET(BULK {ruta_datos}, "
+                f"FORMATFILE = {ruta_formato}, CODEPAGE = '65001', {filas}) AS datos"
+            )
+        salida.append((sentencia, None))
+
+# %% [markdown]
+# ### Caché de conversiones
+# Esta sección define el manifiesto que guarda en el directorio de salida qué script se generó para cada excel, para no volver a convertir los que no han cambiado.
+
+# %%
+VERSION_REGLAS_LIMPIEZA = 2  # Subir al cambiar la limpieza o el formato del script para invalidar la caché
+NOMBRE_MANIFIESTO = ".excel2sql-manifest.json"
+
+def hash_file(ruta, chunk_size=1024 * 1024):
+    """
+    Devuelve el sha256 del contenido de un archivo, leído por trozos.
+    """
+    sha256 = hashlib.sha256()
+    with open(ruta, "rb") as archivo:
+        for trozo in iter(lambda: archivo.read(chunk_size), b""):
+            sha256.update(trozo)
+    return sha256.hexdigest()
+
+def output_file_entry(output_dir, nombre_archivo_salida):
+    """
+    Nombre, tamaño y fecha de modificación de un script del directorio de salida, como se guardan en el manifiesto.
+    """
+    estado = os.stat(os.path.join(output_dir, nombre_archivo_salida))
+    return {"nombre": nombre_archivo_salida, "tamano": estado.st_size, "mtime_ns": estado.st_mtime_ns}
+
+def refresh_header_date(ruta_origen, ruta_destino, hora_inicio):
+    """
+    Copia un script generado actualizando solo la fecha de creación de la cabecera.
+
+    Args:
+    - ruta_origen (str): Script generado en una ejecución anterior.
+    - ruta_destino (str): Ruta del script con la fecha nueva. Se comprime igual que el original, según su extensión.
+    - hora_inicio (datetime): Fecha de la ejecución actual.
+    """
+    fecha_actualizada = False
+    with open_script(ruta_origen) as origen, SQLScriptWriter(ruta_destino, output_sink=script_sink(ruta_destino)) as escritor:
+        for linea in origen:
+            if not fecha_actualizada and linea.startswith("* FECHA CREACIÓN:"):
+                linea = f"* FECHA CREACIÓN: {hora_inicio.strftime('%Y-%m-%d')}\n"
+                fecha_actualizada = True
+            escritor.write(linea)
+
+class BuildManifest:
+
+    def __init__(self, output_dir):
+        """
+        Manifiesto de la caché de conversiones de un directorio de salida. Guarda, por cada excel, el hash de su
+        contenido, los parámetros con los que se generó el script, los archivos del script generado (y los de datos de
+        la carga masiva) y los datos que
+        devolvió la conversión (logs, hojas no procesadas y datos de validación).
+
+        Args:
+        - output_dir (str): Directorio de salida de los scripts.
+        """
+        self.output_dir = output_dir
+        self.ruta = os.path.join(output_dir, NOMBRE_MANIFIESTO)
+        self.entradas = {}
+
+        try:
+            with open(self.ruta, encoding="utf-8") as archivo:
+                manifiesto = json.load(archivo)
+            if manifiesto.get("version") == VERSION_REGLAS_LIMPIEZA:
+                self.entradas = manifiesto["entradas"]
+        except (OSError, ValueError, KeyError):
+            # Sin manifiesto o ilegible: se empieza con la caché vacía
+            self.entradas = {}
+
+    def lookup(self, archivo_excel, hash_excel, parametros):
+        """
+        Devuelve la entrada del excel si su contenido y los parámetros no han cambiado y los archivos del script que
+        se generó siguen en el directorio de salida sin modificar. Si no, devuelve None.
+        """
+        entrada = self.entradas.get(os.path.abspath(archivo_excel))
+        if not entrada or entrada["hash"] != hash_excel or entrada["parametros"] != parametros:
+            return None
+
+        for archivo_salida in entrada["archivos_salida"] + entrada.get("archivos_datos", []):
+            try:
+                estado = os.stat(os.path.join(self.output_dir, archivo_salida["nombre"]))
+            except OSError:
+                return None
+            if estado.st_size != archivo_salida["tamano"] or estado.st_mtime_ns != archivo_salida["mtime_ns"]:
+                return None
+
+        return entrada
+
+    def store(self, archivo_excel, hash_excel, parametros, nombres_archivos_salida, log_messages, hojas_no_procesadas, validation_data,
+              nombres_archivos_datos=()):
+        self.entradas[os.path.abspath(archivo_excel)] = {
+            "hash": hash_excel,
+            "parametros": parametros,
+            "archivos_salida": [output_file_entry(self.output_dir, nombre) for nombre in nombres_archivos_salida],
+            "archivos_datos": [output_file_entry(self.output_dir, nombre) for nombre in nombres_archivos_datos],
+            "log_messages": log_messages,
+            "hojas_no_procesadas": hojas_no_procesadas,
+            "validation_data": validation_data,
+        }
+
+    def evict_missing(self):
+        """
+        Quita las entradas de los excels que ya no existen.
+        """
+        for archivo_excel in [archivo for archivo in self.entradas if not os.path.exists(archivo)]:
+            del self.entradas[archivo_excel]
+
+    def save(self):
+        with SQLScriptWriter(self.ruta) as escritor:
+            escritor.write(json.dumps({"version": VERSION_REGLAS_LIMPIEZA, "entradas": self.entradas}, ensure_ascii=False, indent=1))
+
+# %% [markdown]
+# ### Progreso y cancelación
+# Esta sección define los avisos de progreso que emite SQLFileProcessor durante la conversión y la excepción con la que se detiene al cancelarla.
+
+# %%
+class ConversionCancelled(Exception):
+    """
+    La conversión se ha cancelado. El script que se estaba escribiendo se descarta; los ya terminados se conservan.
+    """
+
+class ConversionProgress:
+
+    def __init__(self, callback, total_archivos):
+        """
+        Calcula y envía el progreso de una conversión.
+
+        Args:
+        - callback (callable): Recibe un diccionario por aviso con las claves 'archivo', 'hoja', 'archivos_completados',
+          'total_archivos', 'filas', 'filas_por_segundo', 'fraccion' (de 0 a 1) y 'eta_segundos' (None si aún no se sabe).
+        - total_archivos (int): Archivos de la conversión.
+        """
+        self.callback = callback
+        self.total_archivos = total_archivos
+        self.archivos_completados = 0
+        self.filas = 0
+        self.inicio = time.perf_counter()
+
+    def report(self, archivo, hoja=None, hojas_completadas=0, total_hojas=1, filas=0):
+        """
+        Suma las filas procesadas y envía un aviso. El avance se mide en archivos y, dentro del actual, en hojas.
+        """
+        self.filas += filas
+        transcurrido = time.perf_counter() - self.inicio
+        fraccion = (self.archivos_completados + hojas_completadas / max(total_hojas, 1)) / max(self.total_archivos, 1)
+        self.callback({
+            "archivo": os.path.basename(archivo),
+            "hoja": hoja,
+            "archivos_completados": self.archivos_completados,
+            "total_archivos": self.total_archivos,
+            "filas": self.filas,
+            "filas_por_segundo": self.filas / transcurrido if transcurrido > 0 else 0.0,
+            "fraccion": fraccion,
+            "eta_segundos": transcurrido * (1 - fraccion) / fraccion if fraccion > 0 else None,
+        })
+
+    def file_done(self, archivo, filas=0):
+        self.archivos_completados += 1
+        self.report(archivo, filas=filas, hojas_completadas=0)
+
+# %% [markdown]
+# ### Métricas
+# Esta sección define las métricas de rendimiento que SQLFileProcessor recoge por archivo y por hoja si se activan: segundos de cada fase, filas, sentencias, bytes escritos y pico de memoria.
+
+# %%
+FASES = ("lectura", "clasificacion", "limpieza", "escritura")
+COLUMNAS_METRICAS_HOJA = (
+    "archivo", "hoja", "filas", "sentencias", "inserts", "updates",
+    *(f"segundos_{fase}" for fase in FASES), "bytes", "rss_pico_mb",
+)
+
+def peak_rss_mb():
+    """
+    Pico de memoria residente del proceso en MB, o None si no se puede medir en este sistema.
+    """
+    try:
+        import resource
+    except ImportError:
+        # Windows: solo con psutil, que no es una dependencia del proyecto
+        try:
+            import psutil
+        except ImportError:
+            return None
+        return psutil.Process().memory_info().peak_wset / 1024 ** 2
+
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux lo devuelve en KB y macOS en bytes
+    return pico / 1024 ** 2 if sys.platform == "darwin" else pico / 1024
+
+class ConversionMetrics:
+
+    def __init__(self):
+        """
+        Métricas de una conversión. `archivos` tiene una entrada por excel, en el orden de los scripts, con sus
+        hojas procesadas en 'hojas'; los excels reutilizados de la caché no tienen hojas.
+
+        Cada hoja guarda las claves de `COLUMNAS_METRICAS_HOJA`. Las fases son la lectura de la hoja, la
+        clasificación de las filas como INSERT, UPDATE o sin sentencia, la limpieza de las sentencias y la escritura
+        del script (incluidos los 'GO'). El pico de memoria es el del proceso que ha convertido la hoja.
+        """
+        self.archivos = []
+
+    def add_workbook(self, metricas_libro):
+        self.archivos.append(metricas_libro)
+
+    def sheets(self):
+        return [hoja for archivo in self.archivos for hoja in archivo["hojas"]]
+
+    def totals(self):
+        """
+        Devuelve la suma de filas, sentencias, bytes y segundos de cada fase de todos los archivos, y el mayor pico de memoria.
+        """
+        hojas = self.sheets()
+        totales = {clave: sum(hoja[clave] for hoja in hojas) for clave in ("filas", "sentencias", "inserts", "updates")}
+        totales.update({f"segundos_{fase}": sum(hoja[f"segundos_{fase}"] for hoja in hojas) for fase in FASES})
+        totales["segundos"] = sum(archivo["segundos"] for archivo in self.archivos)
+        totales["bytes"] = sum(archivo["bytes"] for archivo in self.archivos)
+        picos = [archivo["rss_pico_mb"] for archivo in self.archivos if archivo["rss_pico_mb"] is not None]
+        totales["rss_pico_mb"] = max(picos) if picos else None
+        return totales
+
+    def to_dict(self):
+        return {"totales": self.totals(), "archivos": self.archivos}
+
+    def to_json(self, ruta):
+        with SQLScriptWriter(ruta) as escritor:
+            escritor.write(json.dumps(self.to_dict(), ensure_ascii=False, indent=1))
+
+    def to_csv(self, ruta):
+        """
+        Exporta una fila por hoja con las columnas de `COLUMNAS_METRICAS_HOJA`.
+        """
+        with SQLScriptWriter(ruta) as escritor:
+            csv_writer = csv.DictWriter(escritor, fieldnames=COLUMNAS_METRICAS_HOJA, lineterminator="\n")
+            csv_writer.writeheader()
+            csv_writer.writerows(self.sheets())
+
+    def export(self, ruta):
+        """
+        Exporta a CSV si la ruta termina en `.csv` y a JSON si no.
+        """
+        if ruta.lower().endswith(".csv"):
+            self.to_csv(ruta)
+        else:
+            self.to_json(ruta)
+
+def _sheet_timings():
+    return dict.fromkeys(FASES, 0.0)
+
+def format_sheet_metrics(metricas_hoja):
+    """
+    Resume en una línea las métricas de una hoja, para la ventana de validación.
+    """
+    fases = ", ".join(f"{fase} {metricas_hoja[f'segundos_{fase}']:.2f}s" for fase in FASES)
+    return f"{metricas_hoja['filas']} filas, {fases}, {metricas_hoja['bytes'] / 1024:.1f} KB"
+
+# %% [markdown]
+# ### Procesamiento de archivos
+# Esta sección define una clase para procesar archivos Excel y generar scripts SQL a partir de ellos.
+
+# %%
+class SQLFileProcessor:
+ 
+    def __init__(self, path, task_link, description, author, mode="folder", output_dir=None, reader="auto", workers=1, force=False,
+                 progress_callback=None, cancel_event=None, collect_metrics=False, cleaning="compat", coalesce_inserts=False,
+                 batch_policy=None, max_file_bytes=None, bulk_load=False, bulk_load_dir=None, output_sink="file"):
+        """
+        Inicializa el procesador con los parámetros necesarios.
+        Args:
+        - path (str): Ruta al archivo Excel o directorio.
+        - task_link (str): Enlace de la tarea.
+        - description (str): Descripción de la tarea.
+        - author (str): Nombre del autor.
+        - mode (str): Modo de procesamiento ('folder' para carpeta, 'file' para archivo único).
+        - output_dir (str, opcional): Directorio de salida para los archivos generados.
+        - reader (str, opcional): Lector de las hojas (ver READERS). 'pandas' carga la hoja entera; 'openpyxl',
+          'calamine' y 'csv' la recorren fila a fila. Con 'auto' se elige para cada archivo el más rápido de los
+          instalados (ver `select_reader`). Todos generan el mismo SQL.
+        - workers (int, opcional): Procesos para convertir en paralelo los archivos en modo carpeta, o las hojas si solo
+          hay un archivo (1 = sin paralelismo).
+        - force (bool, opcional): Convierte todos los archivos aunque no hayan cambiado desde la última ejecución.
+        - progress_callback (callable, opcional): Recibe los avisos de progreso (ver ConversionProgress). Se llama desde
+          el hilo que ejecuta `process_files`.
+        - cancel_event (threading.Event, opcional): Si se activa, la conversión se detiene entre hojas con
+          ConversionCancelled. Con varios archivos en paralelo, los que ya se están convirtiendo terminan.
+        - collect_metrics (bool, opcional): Mide los tiempos de cada fase por archivo y hoja. Tras `process_files`
+          quedan en `metrics` (ver ConversionMetrics); si no se activa, `metrics` es None.
+        - cleaning (str, opcional): Modo de limpieza de las sentencias. 'compat' genera lo mismo que siempre;
+          'corrected' respeta los literales entre comillas (ver CLEANING_MODES).
+        - coalesce_inserts (bool, opcional): Agrupa los INSERTs seguidos a la misma tabla en INSERTs de varias filas
+          (ver SQLBatcher). Los recuentos de validación siguen siendo de filas del excel.
+        - batch_policy (BatchPolicy, opcional): Reparto de las sentencias en lotes con 'GO'. Sin ella, un 'GO' cada
+          45 sentencias como siempre.
+        - max_file_bytes (int, opcional): Parte el script de cada excel en varios archivos de como mucho este tamaño,
+          numerados `-000-DAT-`, `-001-DAT-`... (ver ShardedScriptWriter).
+        - bulk_load (bool, opcional): Carga masiva. Los INSERTs con valores literales se escriben en archivos de datos
+          junto al script, que los carga con BULK INSERT (ver BulkLoadBatcher). El resto de filas, la cabecera y los
+          recuentos de validación no cambian.
+        - bulk_load_dir (str, opcional): Directorio de los archivos de datos tal como lo ve el servidor, si no es el
+          directorio de salida (por ejemplo, una carpeta compartida en red).
+        - output_sink (str, opcional): Destino de los scripts (ver SALIDAS). 'file' escribe el `.sql` en
+          `output_dir`; 'gzip' y 'zstd' lo comprimen mientras se genera (`.sql.gz`, `.sql.zst`, zstd con el paquete
+          zstandard); 'stdout' escribe los scripts seguidos en la salida estándar, para pasarlos a sqlcmd; y 'memory'
+          deja los bytes de cada script en `output_bytes`, con su nombre. Con 'stdout' y 'memory' los nombres de
+          `nombresSQL` son los mismos pero no se crea ningún `.sql`, no se usa la caché y los excels se convierten en
+          este proceso (con `workers`, sus hojas en paralelo).
+        """
+        if reader not in READERS:
+            raise ValueError(f"Lector desconocido: {reader}. Opciones: {', '.join(READERS)}")
+        if cleaning not in CLEANING_MODES:
+            raise ValueError(f"Modo de limpieza desconocido: {cleaning}. Opciones: {', '.join(CLEANING_MODES)}")
+        if max_file_bytes is not None and max_file_bytes < 1:
+            raise ValueError(f"max_file_bytes tiene que ser mayor que 0: {max_file_bytes}")
+        if output_sink not in SALIDAS:
+            raise ValueError(f"Salida desconocida: {output_sink}. Opciones: {', '.join(SALIDAS)}")
+        if output_sink == "zstd" and not _module_installed("zstandard"):
+            raise ValueError("La salida zstd necesita el paquete zstandard (pip install zstandard)")
+         
+        self.path = path
+        self.task_link = task_link
+        self.description = description
+        self.author = author
+        self.hora_inicio = datetime.datetime.now()
+        self.mode = mode
+        self.reader = reader
+        self.workers = max(1, int(workers))
+        self.force = force
+        self.cleaning = cleaning
+        self.coalesce_inserts = coalesce_inserts
+        self.batch_policy = batch_policy
+        self.max_file_bytes = max_file_bytes
+        self.bulk_load = bulk_load
+        self.bulk_load_dir = bulk_load_dir
+        self.output_sink = output_sink
+        self.output_bytes = {}
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event
+        self._progreso = None
+        self.collect_metrics = collect_metrics
+        self.metrics = None
+        self.log_messages = []
+        self.log_files = []
+        self.validation_data = {}
+        
+        # Ordenados para que el orden de los scripts no dependa del sistema de archivos
+        if mode == "folder":
+            self.archivos_excel = sorted(ruta for ruta in glob.glob(os.path.join(self.path, "*")) if ruta.lower().endswith(EXTENSIONES))
+        else:
+            self.archivos_excel = [self.path]
+        self.output_dir = output_dir if output_dir else os.path.join(os.path.expanduser("~"), "Downloads")
+
+    def __getstate__(self):
+        # Los procesos del modo paralelo no reciben el callback ni el evento, que no se pueden serializar
+        estado = self.__dict__.copy()
+        estado.update(progress_callback=None, cancel_event=None, _progreso=None, output_bytes={})
+        return estado
+
+    def _check_cancelled(self):
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise ConversionCancelled("Conversión cancelada")
+
+    def process_files(self):
+
+        """
+        Procesa los archivos Excel y genera los scripts SQL correspondientes.
+
+        Returns:
+        - nombresSQL (list): Lista de nombres de archivos SQL generados (varios por excel si se parten con
+          `max_file_bytes`).
+        - log_messages (list): Lista de mensajes de registro.
+        - hojas_no_procesadas (int): Número de hojas no procesadas.
+        - validation_data (dict): Datos de validación de queries generadas por hoja.
+
+        Con `collect_metrics`, las métricas de la conversión quedan además en `self.metrics`. El nombre del excel de
+        cada mensaje de `log_messages` queda en `self.log_files`, en el mismo orden.
+
+        Raises:
+        - ConversionCancelled: Si se activa `cancel_event`.
+        """
+
+        contador = 0
+        nombresSQL = []
+        hojas_no_procesadas = 0
+        if self.progress_callback is not None:
+            self._progreso = ConversionProgress(self.progress_callback, len(self.archivos_excel))
+
+        # Los excels que no han cambiado desde la última ejecución reutilizan su script y sus datos de validación. Solo
+        # si los scripts se guardan en archivos
+        usar_cache = self.output_sink in SALIDAS_ARCHIVO
+        manifiesto = BuildManifest(self.output_dir) if usar_cache else None
+        parametros = self._cache_parameters()
+        hashes = [hash_file(archivo_excel) if usar_cache else None for archivo_excel in self.archivos_excel]
+        resultados = [None] * len(self.archivos_excel)
+        pendientes = []
+        for i, archivo_excel in enumerate(self.archivos_excel):
+            entrada = None if self.force or not usar_cache else manifiesto.lookup(archivo_excel, hashes[i], parametros)
+            if entrada:
+                resultados[i] = (*self._reuse_cached(archivo_excel, contador, entrada), self._cached_metrics(archivo_excel, entrada))
+                if self._progreso:
+                    self._progreso.file_done(archivo_excel)
+            else:
+                pendientes.append(i)
+
+        # Cada libro genera su propio script, así que se pueden convertir en procesos distintos. Los resultados
+        # se recogen en el orden de los archivos para que la salida sea la misma que sin paralelismo.
+        archivos_pendientes = [self.archivos_excel[i] for i in pendientes]
+        contadores = [contador] * len(pendientes)
+        executor = None
+        # La salida estándar y la memoria son de este proceso: los libros se convierten aquí, uno detrás de otro
+        if self.workers > 1 and len(pendientes) > 1 and usar_cache:
+            executor = ProcessPoolExecutor(max_workers=min(self.workers, len(pendientes)), initializer=_init_worker)
+            convertidos = executor.map(self._process_workbook, archivos_pendientes, contadores)
+        else:
+            # Con un único libro pendiente, el paralelismo se aplica a sus hojas
+            convertidos = map(self._process_workbook, archivos_pendientes, contadores, repeat(self.workers > 1))
+
+        try:
+            for i, (nombres_archivos_salida, nombres_archivos_datos, log_messages, hojas_libro, validation_data, generado, filas_libro, metricas_libro) in zip(pendientes, convertidos):
+                resultados[i] = nombres_archivos_salida, log_messages, hojas_libro, validation_data, metricas_libro
+                if generado and usar_cache:
+                    self._remove_stale_outputs(manifiesto, self.archivos_excel[i], nombres_archivos_salida, nombres_archivos_datos)
+                    manifiesto.store(
+                        self.archivos_excel[i], hashes[i], parametros,
+                        nombres_archivos_salida, log_messages, hojas_libro, validation_data, nombres_archivos_datos
+                    )
+                if self._progreso:
+                    # Sin paralelismo de archivos las filas ya se han contado hoja a hoja
+                    self._progreso.file_done(self.archivos_excel[i], filas=filas_libro if executor is not None else 0)
+                if i != pendientes[-1]:
+                    self._check_cancelled()
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+            # También al cancelar, para no volver a convertir los archivos que ya se han terminado
+            if manifiesto is not None:
+                manifiesto.evict_missing()
+                try:
+                    manifiesto.save()
+                except OSError as e:
+                    print(f"Error al guardar el manifiesto de la caché: {e}", file=sys.stderr)
+
+        self.metrics = ConversionMetrics() if self.collect_metrics else None
+        for archivo_excel, (nombres_archivos_salida, log_messages, hojas_libro, validation_data, metricas_libro) in zip(self.archivos_excel, resultados):
+            nombresSQL.extend(nombres_archivos_salida)
+            self.log_messages.extend(log_messages)
+            self.log_files.extend([os.path.basename(archivo_excel)] * len(log_messages))
+            self.validation_data.update(validation_data)
+            hojas_no_procesadas += hojas_libro
+            if self.metrics is not None:
+                self.metrics.add_workbook(metricas_libro)
+
+        return nombresSQL, self.log_messages, hojas_no_procesadas, self.validation_data
+
+    def execute_scripts(self, executor, nombresSQL):
+        """
+        Ejecuta en la base de datos los scripts devueltos por `process_files` (también los reutilizados de la caché) y
+        añade a `log_messages` los tiempos por hoja y las sentencias fallidas.
+
+        Args:
+        - executor (SQLExecutor): Ejecutor con la conexión a la base de datos.
+        - nombresSQL (list): Nombres de los scripts, en `output_dir`.
+
+        Returns:
+        - list: Resultado de la ejecución de cada script (ver `SQLExecutor.execute_files`).
+        """
+        if self.output_sink not in SALIDAS_ARCHIVO:
+            raise ValueError(f"Solo se pueden ejecutar los scripts guardados en archivos, no con la salida {self.output_sink}")
+        rutas = [os.path.join(self.output_dir, nombre) for nombre in nombresSQL]
+        return executor.execute_files(rutas, self.log_messages)
+
+    def _cache_parameters(self):
+        """
+        Parámetros que cambian el contenido de los scripts. Si alguno cambia, la caché no se reutiliza.
+        """
+        return {
+            "task_link": self.task_link,
+            "description": self.description,
+            "author": self.author,
+            "version_reglas_limpieza": VERSION_REGLAS_LIMPIEZA,
+            "limpieza": self.cleaning,
+            "agrupar_inserts": self.coalesce_inserts,
+            "lotes": self.batch_policy.to_dict() if self.batch_policy is not None else None,
+            "max_bytes_archivo": self.max_file_bytes,
+            # El directorio del servidor solo cambia el script si la carga masiva está activada
+            "carga_masiva": self.bulk_load and (self.bulk_load_dir or True),
+            "salida": self.output_sink,
+        }
+
+    def _script_name(self, archivo_excel, contador):
+        # Nombre del script sin la extensión, que depende de la salida
+        codigo_tarea, _ = generate_sql_header(self.task_link, self.description, self.author, self.hora_inicio)
+        # Tres cifras, para que los nombres sigan en orden con diez o más archivos (-009-, -010-...)
+        return f"{self.hora_inicio.strftime('%Y%m%d')}-{codigo_tarea}-{contador:03d}-DAT-{os.path.basename(archivo_excel).split('.')[0]}"
+
+    def _output_file_name(self, archivo_excel, contador):
+        return self._script_name(archivo_excel, contador) + EXTENSIONES_SALIDA[self.output_sink]
+
+    def _reuse_cached(self, archivo_excel, contador, entrada):
+        """
+        Reutiliza el script de una ejecución anterior de un excel sin cambios. Si se generó otro día, cada archivo se
+        copia con el nombre y la fecha de la cabecera de hoy. El anterior no se toca, porque puede que ya se haya
+        entregado; el manifiesto pasa a apuntar a la copia.
+
+        Returns:
+        - La misma tupla que `_process_workbook` devolvió al generarlo, sin los archivos de datos, el indicador de generado ni las filas.
+        """
+        nombres_archivos_salida = []
+        for numero, archivo_salida in enumerate(entrada["archivos_salida"]):
+            nombre_archivo_salida = self._output_file_name(archivo_excel, contador + numero)
+            if nombre_archivo_salida != archivo_salida["nombre"]:
+                ruta_anterior = os.path.join(self.output_dir, archivo_salida["nombre"])
+                refresh_header_date(ruta_anterior, os.path.join(self.output_dir, nombre_archivo_salida), self.hora_inicio)
+                archivo_salida.update(output_file_entry(self.output_dir, nombre_archivo_salida))
+            nombres_archivos_salida.append(nombre_archivo_salida)
+
+        print(f"Archivo {os.path.basename(archivo_excel)} sin cambios: se reutiliza {', '.join(nombres_archivos_salida)}", file=sys.stderr)
+        return nombres_archivos_salida, entrada["log_messages"], entrada["hojas_no_procesadas"], entrada["validation_data"]
+
+    def _remove_stale_outputs(self, manifiesto, archivo_excel, nombres_archivos_salida, nombres_archivos_datos=()):
+        """
+        Borra los archivos de hoy de la ejecución anterior de un excel que ya no se han generado, por ejemplo porque
+        ahora el script se parte en menos archivos, para que no se confundan con los nuevos. Los archivos de datos de
+        la carga masiva no llevan fecha, así que se borran todos los que ya no se han generado.
+        """
+        entrada = manifiesto.entradas.get(os.path.abspath(archivo_excel))
+        if not entrada:
+            return
+        fecha = self.hora_inicio.strftime('%Y%m%d')
+        for archivo_salida in entrada["archivos_salida"]:
+            nombre = archivo_salida["nombre"]
+            ruta = os.path.join(self.output_dir, nombre)
+            if nombre not in nombres_archivos_salida and nombre.startswith(fecha) and os.path.exists(ruta):
+                os.remove(ruta)
+        for archivo_datos in entrada.get("archivos_datos", []):
+            ruta = os.path.join(self.output_dir, archivo_datos["nombre"])
+            if archivo_datos["nombre"] not in nombres_archivos_datos and os.path.exists(ruta):
+                os.remove(ruta)
+
+    def _cached_metrics(self, archivo_excel, entrada):
+        """
+        Métricas de un excel reutilizado de la caché: solo el script, sin hojas ni tiempos de conversión.
+        """
+        if not self.collect_metrics:
+            return None
+        return {
+            "archivo": os.path.basename(archivo_excel),
+            "script": ", ".join(archivo_salida["nombre"] for archivo_salida in entrada["archivos_salida"]),
+            "reutilizado": True,
+            "segundos": 0.0,
+            "segundos_apertura": 0.0,
+            "bytes": sum(archivo_salida["tamano"] for archivo_salida in entrada["archivos_salida"]),
+            "rss_pico_mb": None,
+            "hojas": [],
+        }
+
+    def _open_workbook(self, archivo_excel):
+        """
+        Abre el libro con el lector configurado.
+
+        Returns:
+        - workbook (SheetReader): Libro abierto.
+        - sheet_names (list): Hojas del libro, en orden.
+        """
+        workbook = open_sheet_reader(archivo_excel, self.reader)
+        return workbook, workbook.sheet_names
+
+    def _close_workbook(self, workbook):
+        workbook.close()
+
+    def _process_workbook(self, archivo_excel, contador, hojas_en_paralelo=False):
+        """
+        Convierte un libro en su script SQL. No modifica el estado del procesador para poder ejecutarse en otro proceso.
+
+        Con `hojas_en_paralelo`, las hojas se convierten en `workers` procesos distintos. Los procesos solo
+        leen y limpian las hojas; los fragmentos se unen aquí en el orden de `sheet_names` y es al unirlos cuando se
+        colocan los 'GO', con el mismo contador que sin paralelismo, así que el script es idéntico byte a byte.
+
+        Args:
+        - archivo_excel (str): Ruta al archivo Excel.
+        - contador (int): Número del script en el nombre del archivo de salida. Si el script se parte en varios
+          archivos, el de cada uno se cuenta a partir de este.
+        - hojas_en_paralelo (bool, opcional): Convertir las hojas en paralelo.
+
+        Returns:
+        - nombres_archivos_salida (list): Nombres de los archivos SQL generados.
+        - nombres_archivos_datos (list): Nombres de los archivos de datos y de formato de la carga masiva.
+        - log_messages (list): Mensajes de registro del libro.
+        - hojas_no_procesadas (int): Número de hojas no procesadas del libro.
+        - validation_data (dict): Datos de validación de queries generadas por hoja.
+        - generado (bool): Si el script se ha guardado correctamente.
+        - filas (int): Filas leídas de las hojas procesadas.
+        - metricas (dict): Métricas del libro para ConversionMetrics, o None si no se recogen.
+        """
+        log_messages = []
+        validation_data = {}
+        hojas_no_procesadas = 0
+
+        generado = False
+        filas = 0
+        metricas_hojas = [] if self.collect_metrics else None
+
+        inicio = time.perf_counter()
+        workbook, sheet_names = self._open_workbook(archivo_excel)
+        segundos_apertura = time.perf_counter() - inicio
+
+        _, cabecera_sql = generate_sql_header(
+            self.task_link, self.description, self.author, self.hora_inicio
+        )
+
+        def ruta_archivo(numero):
+            return os.path.normpath(os.path.join(self.output_dir, self._output_file_name(archivo_excel, contador + numero)))
+
+        def ruta_datos(numero):
+            # Sin la fecha, para que el script reutilizado otro día siga apuntando a sus archivos de datos
+            nombre = self._script_name(archivo_excel, contador).split("-", 1)[1]
+            return os.path.normpath(os.path.join(self.output_dir, f"{nombre}-{numero:03d}"))
+
+        ruta_archivo_salida = ruta_archivo(0)
+        print(f"Saving file to: {ruta_archivo_salida}", file=sys.stderr)
+        if self.max_file_bytes is not None:
+            escritor = ShardedScriptWriter(ruta_archivo, self.max_file_bytes, cabecera_sql, PIE_SQL, self.output_sink, self.output_bytes)
+        else:
+            escritor = SQLScriptWriter(ruta_archivo_salida, output_sink=self.output_sink, memoria=self.output_bytes)
+        rutas_archivos_salida = [ruta_archivo_salida]
+        archivos_datos = BulkDataFiles(ruta_datos, self.bulk_load_dir) if self.bulk_load else None
+
+        hojas_en_paralelo = hojas_en_paralelo and len(sheet_names) > 1
+        try:
+            with escritor, archivos_datos or contextlib.nullcontext():
+                if self.max_file_bytes is None:
+                    escritor.write(cabecera_sql)
+                if hojas_en_paralelo:
+                    executor = ProcessPoolExecutor(max_workers=min(self.workers, len(sheet_names)), initializer=_init_worker)
+                    try:
+                        hojas_convertidas = executor.map(self._convert_sheet, repeat(archivo_excel), sheet_names)
+                        hojas_no_procesadas, filas = self._write_sheets(
+                            archivo_excel, sheet_names, hojas_convertidas, escritor, log_messages, validation_data, metricas_hojas,
+                            archivos_datos
+                        )
+                    finally:
+                        # Al cancelar, no convertir las hojas que aún no han empezado
+                        executor.shutdown(wait=True, cancel_futures=True)
+                else:
+                    tiempos_hojas = [_sheet_timings() if self.collect_metrics else None for _ in sheet_names]
+                    hojas_convertidas = (
+                        (self._iter_converted_blocks(workbook, sheet_name, tiempos), tiempos)
+                        for sheet_name, tiempos in zip(sheet_names, tiempos_hojas)
+                    )
+                    hojas_no_procesadas, filas = self._write_sheets(
+                        archivo_excel, sheet_names, hojas_convertidas, escritor, log_messages, validation_data, metricas_hojas,
+                        archivos_datos
+                    )
+                if self.max_file_bytes is None:
+                    escritor.write(PIE_SQL)
+            generado = True
+            if self.max_file_bytes is not None:
+                rutas_archivos_salida = escritor.rutas
+            for ruta in rutas_archivos_salida:
+                if self.output_sink in SALIDAS_ARCHIVO:
+                    print(f"Archivo {os.path.basename(ruta)} generado con éxito en {ruta}", file=sys.stderr)
+                else:
+                    print(f"Script {os.path.basename(ruta)} generado con éxito ({self.output_sink})", file=sys.stderr)
+        except OSError as e:
+            print(f"Error al guardar el archivo: {e}", file=sys.stderr)
+        finally:
+            self._close_workbook(workbook)
+
+        metricas = None
+        if self.collect_metrics:
+            metricas = {
+                "archivo": os.path.basename(archivo_excel),
+                "script": ", ".join(os.path.basename(ruta) for ruta in rutas_archivos_salida),
+                "reutilizado": False,
+                "segundos": time.perf_counter() - inicio,
+                "segundos_apertura": segundos_apertura,
+                # Tamaño en disco (comprimido, si se comprime), o el del script si no se guarda en archivos
+                "bytes": (
+                    sum(os.path.getsize(ruta) for ruta in rutas_archivos_salida) if self.output_sink in SALIDAS_ARCHIVO
+                    else escritor.bytes_written()
+                ) if generado else 0,
+                "rss_pico_mb": max(
+                    (pico for pico in (peak_rss_mb(), *(hoja["rss_pico_mb"] for hoja in metricas_hojas)) if pico is not None),
+                    default=None
+                ),
+                "hojas": metricas_hojas,
+            }
+
+        nombres_archivos_salida = [os.path.basename(ruta) for ruta in rutas_archivos_salida]
+        nombres_archivos_datos = [os.path.basename(ruta) for ruta in archivos_datos.rutas] if archivos_datos is not None and generado else []
+        return nombres_archivos_salida, nombres_archivos_datos, log_messages, hojas_no_procesadas, validation_data, generado, filas, metricas
+
+    def _iter_converted_blocks(self, workbook, sheet_name, tiempos=None):
+        """
+        Lee y limpia una hoja bloque a bloque.
+
+        Args:
+        - workbook: Libro abierto con `_open_workbook`.
+        - sheet_name (str): Nombre de la hoja.
+        - tiempos (dict, opcional): Si se indica, suma en él los segundos de lectura, clasificación y limpieza.
+
+        Yields:
+        - filas (list): Filas del bloque en el formato de `SQLBatcher.write_rows`.
+        - insert_count (int), update_count (int): INSERTs y UPDATEs del bloque.
+        """
+        # Las hojas que según sus metadatos no tienen sentencias no se leen. Como las que no tienen columnas
+        # suficientes, no devuelven bloques y cuentan como no procesadas
+        if sheet_name in workbook.skippable_sheets():
+            return
+
+        if workbook.streaming:
+            filas = workbook.iter_rows(sheet_name)
+            bloques = iter(lambda: list(islice(filas, TAMANO_BLOQUE)), [])
+
+            def clasificar(bloque):
+                return classify_sql_rows(bloque, tiempos, self.cleaning)
+        else:
+            bloques = workbook.iter_blocks(sheet_name)
+
+            def clasificar(bloque):
+                clasificadas = classify_sql_block(bloque, tiempos, self.cleaning)
+                return zip(clasificadas["tipo"], clasificadas["sentencia"], clasificadas["declare"])
+
+        if tiempos is None:
+            for bloque in bloques:
+                yield to_batch_rows(clasificar(bloque))
+            return
+
+        # La lectura es lo que tarda el lector en dar el bloque; la clasificación, lo que tarda el resto de la
+        # conversión del bloque sin contar la limpieza, que se mide aparte
+        while True:
+            inicio = time.perf_counter()
+            bloque = next(bloques, None)
+            leido = time.perf_counter()
+            tiempos["lectura"] += leido - inicio
+            if bloque is None:
+                return
+
+            limpieza_anterior = tiempos["limpieza"]
+            convertido = to_batch_rows(clasificar(bloque))
+            tiempos["clasificacion"] += time.perf_counter() - leido - (tiempos["limpieza"] - limpieza_anterior)
+            yield convertido
+
+    def _convert_sheet(self, archivo_excel, sheet_name):
+        """
+        Tarea de los procesos del modo paralelo por hojas: convierte una hoja entera. Cada proceso abre el libro una
+        sola vez y lo reutiliza para el resto de hojas que le toquen.
+
+        Returns:
+        - list: Bloques de la hoja, como los de `_iter_converted_blocks`.
+        - tiempos (dict): Segundos de cada fase y pico de memoria del proceso, o None si no se recogen métricas.
+        """
+        clave = (archivo_excel, self.reader)
+        if clave not in _libros_del_proceso:
+            for workbook in _libros_del_proceso.values():
+                self._close_workbook(workbook)
+            _libros_del_proceso.clear()
+            _libros_del_proceso[clave] = self._open_workbook(archivo_excel)[0]
+
+        tiempos = _sheet_timings() if self.collect_metrics else None
+        bloques = list(self._iter_converted_blocks(_libros_del_proceso[clave], sheet_name, tiempos))
+        if tiempos is not None:
+            tiempos["rss_pico_mb"] = peak_rss_mb()
+        return bloques, tiempos
+
+    def _write_sheets(self, archivo_excel, sheet_names, hojas_convertidas, escritor, log_messages, validation_data, metricas_hojas=None,
+                      archivos_datos=None):
+        """
+        Escribe las hojas ya convertidas de un libro, en orden. La cadencia de los 'GO' se cuenta por libro, de modo
+        que cada script es independiente de los demás.
+
+        Antes de cada hoja comprueba si se ha cancelado la conversión, y tras cada bloque avisa del progreso.
 
-    # Reemplazar espacios vacíos entre comas con NULL
-    value = re.sub(r"(?<=\()\s*,|,\s*(?=\))|(?<=,)\s*(?=,)|(?<=,)\s*(?=$)", "NULL", value)
+        Args:
+        - archivo_excel (str): Ruta al archivo Excel, para los avisos de progreso.
+        - sheet_names (list): Hojas del libro, en orden.
+        - hojas_convertidas (iterator): Bloques convertidos de cada hoja, en el mismo orden que `sheet_names`, junto
+          con el diccionario donde se miden los tiempos de su conversión (o None si no se recogen métricas).
+        - escritor (SQLScriptWriter o ShardedScriptWriter): Destino de las sentencias.
+        - log_messages (list): Lista donde añadir los mensajes de registro.
+        - validation_data (dict): Diccionario donde añadir los datos de validación por hoja.
+        - metricas_hojas (list, opcional): Lista donde añadir las métricas de cada hoja.
+        - archivos_datos (BulkDataFiles, opcional): Con carga masiva, los archivos de datos del libro.
 
-    # Manejar casos de comillas internas
-    value = re.sub(r"(\w)'(\w)", r"\1''\2", value)
-    
-    return value
+        Returns:
+        - hojas_no_procesadas (int): Número de hojas no procesadas del libro.
+        - filas_procesadas (int): Filas leídas de las hojas procesadas.
+        """
+        batcher = SQLBatcher(escritor, self.coalesce_inserts, self.batch_policy)
+        if archivos_datos is not None:
+            batcher = BulkLoadBatcher(batcher, archivos_datos)
+        hojas_no_procesadas = 0
+        filas_procesadas = 0
+
+        for numero_hoja, sheet_name in enumerate(sheet_names):
+            self._check_cancelled()
+            if self._progreso:
+                self._progreso.report(archivo_excel, sheet_name, numero_hoja, len(sheet_names))
+
+            hoja_procesada = False
+            insert_count = 0
+            update_count = 0
+            filas_hoja = 0
+
+            bloques, tiempos = next(hojas_convertidas)
+            if tiempos is not None:
+                bytes_inicio = escritor.bytes_written()
+
+            for filas, inserts, updates in bloques:
+                inicio_escritura = time.perf_counter() if tiempos is not None else None
+                if not hoja_procesada:
+                    batcher.start_sheet(sheet_name)
+                    hoja_procesada = True
+                batcher.write_rows(filas)
+                if tiempos is not None:
+                    tiempos["escritura"] += time.perf_counter() - inicio_escritura
+                insert_count += inserts
+                update_count += updates
+
+                filas_bloque = sum(fila if isinstance(fila, int) else 1 for fila in filas)
+                filas_hoja += filas_bloque
+                if self._progreso:
+                    self._progreso.report(archivo_excel, sheet_name, numero_hoja, len(sheet_names), filas_bloque)
+            inicio_escritura = time.perf_counter() if tiempos is not None else None
+            batcher.flush()
+            if tiempos is not None:
+                tiempos["escritura"] += time.perf_counter() - inicio_escritura
+            filas_procesadas += filas_hoja
+
+            if metricas_hojas is not None:
+                metricas_hojas.append({
+                    "archivo": os.path.basename(archivo_excel),
+                    "hoja": sheet_name,
+                    "filas": filas_hoja,
+                    "sentencias": insert_count + update_count,
+                    "inserts": insert_count,
+                    "updates": update_count,
+                    **{f"segundos_{fase}": tiempos[fase] for fase in FASES},
+                    "bytes": escritor.bytes_written() - bytes_inicio,
+                    # En el modo paralelo por hojas, el del proceso que la ha convertido
+                    "rss_pico_mb": tiempos["rss_pico_mb"] if "rss_pico_mb" in tiempos else peak_rss_mb(),
+                })
+
+            # Los lectores no devuelven bloques si la hoja no tiene columnas suficientes
+            if not hoja_procesada:
+                log_messages.append(f"Hoja {sheet_name}: No hay columnas suficientes para procesar.")
+                hojas_no_procesadas += 1
+                continue
+
+            # Solo agregar datos de validación si hay consultas generadas
+            queries_count = insert_count + update_count
+            if queries_count > 0:
+                validation_data[sheet_name] = {
+                    "total_queries": queries_count,
+                    "inserts": insert_count,
+                    "updates": update_count
+                }
+
+        return hojas_no_procesadas, filas_procesadas
+
+# Libros abiertos por cada proceso del modo paralelo por hojas
+_libros_del_proceso = {}
+
+def _init_worker():
+    # Ctrl+C lo gestiona el proceso principal (cancelando entre hojas); los procesos del pool lo ignoran
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
 
 # %% [markdown]
-# ### Procesamiento de archivos
-# Esta sección define una clase para procesar archivos Excel y generar scripts SQL a partir de ellos.
+# ### Ejecución en base de datos
+# Esta sección ejecuta los scripts generados directamente contra una base de datos con un driver DB-API (pyodbc, pymssql, sqlite3...), en lugar de abrirlos y ejecutarlos a mano.
 
 # %%
-class SQLFileProcessor:
- 
-    def __init__(self, path, task_link, description, author, mode="folder", output_dir=None):
+# Las sentencias pueden ocupar varias líneas (INSERTs agrupados, textos con saltos de línea): una sentencia empieza en
+# cada línea que empieza por una de estas palabras fuera de un literal y el resto de líneas continúan la anterior. Un
+# literal puede tener saltos de línea (los `$$` de la limpieza), así que se sigue qué comillas quedan abiertas
+PATRON_INICIO_SENTENCIA = re.compile(r"(?:insert\s+into|update|bulk\s+insert|declare\s+@|set\s+@)", re.IGNORECASE)
+PATRON_SENTENCIA_DATOS = re.compile(r"(?:insert\s+into|update|bulk\s+insert)\b", re.IGNORECASE)
+LINEAS_TRANSACCION = ("ROLLBACK", "COMMIT", "--ROLLBACK", "--COMMIT")
+MARCA_HOJA = "---Tabla:"
+PATRON_COMILLA_O_COMENTARIO = re.compile(r"'|--")
+
+def _ends_inside_literal(linea, dentro=False):
+    """
+    Indica si al final de la línea sigue abierto un literal entre comillas, sabiendo si lo estaba al principio. Cada
+    comilla abre o cierra un literal (una comilla escapada `''` lo cierra y lo vuelve a abrir) y fuera de los
+    literales un `--` comenta el resto de la línea.
+    """
+    for marca in PATRON_COMILLA_O_COMENTARIO.finditer(linea):
+        if marca.group() == "'":
+            dentro = not dentro
+        elif not dentro:
+            break
+    return dentro
+
+def iter_sql_batches(ruta):
+    """
+    Lee un script generado línea a línea y devuelve sus lotes, separados por 'GO'. Se salta la cabecera hasta
+    'BEGIN TRAN' y las líneas de ROLLBACK/COMMIT del pie.
+
+    Args:
+    - ruta (str): Ruta del script.
+
+    Returns:
+    - generator: Por cada lote, una lista de tuplas `(hoja, sentencia)`.
+    """
+    with open_script(ruta, newline="") as archivo:
+        for linea in archivo:
+            if linea.strip() == "BEGIN TRAN":
+                break
+        # Las sentencias se guardan con sus saltos de línea tal cual, que pueden ser parte de un literal, y solo se
+        # quita el del final al devolverlas
+        lote = []
+        hoja = None
+        dentro = False  # La última sentencia tiene un literal abierto: la línea siguiente es parte de él
+        for linea in archivo:
+            contenido = linea.rstrip("\r\n")
+            texto = contenido.strip()
+            if texto == "GO":
+                # Como en sqlcmd, un 'GO' cierra el lote aunque haya un literal sin cerrar
+                if lote:
+                    yield _batch_statements(lote)
+                lote = []
+                dentro = False
+            elif dentro:
+                lote[-1][1] += linea
+                dentro = _ends_inside_literal(contenido, dentro)
+            elif texto.startswith(MARCA_HOJA):
+                hoja = texto[len(MARCA_HOJA):].strip()
+            elif texto in LINEAS_TRANSACCION:
+                continue
+            elif PATRON_INICIO_SENTENCIA.match(texto) or not lote:
+                if texto:
+                    lote.append([hoja, linea.lstrip()])
+                    dentro = _ends_inside_literal(contenido)
+            else:
+                lote[-1][1] += linea
+                dentro = _ends_inside_literal(contenido)
+        if lote:
+            yield _batch_statements(lote)
+
+def _batch_statements(lote):
+    return [(hoja, sentencia.rstrip("\r\n")) for hoja, sentencia in lote]
+
+def script_commits(ruta):
+    """
+    Indica si el pie del script confirma la transacción (COMMIT sin comentar) en lugar de deshacerla.
+    """
+    if script_sink(ruta) != "file":
+        # Un archivo comprimido no se puede leer desde el final
+        with open_script(ruta) as archivo:
+            cola = "".join(deque(archivo, maxlen=8))
+    else:
+        with open(ruta, "rb") as archivo:
+            archivo.seek(0, os.SEEK_END)
+            archivo.seek(max(0, archivo.tell() - 256))
+            cola = archivo.read().decode("utf-8", errors="ignore")
+    ordenes = [linea.strip() for linea in cola.split("\n") if linea.strip() in ("COMMIT", "ROLLBACK")]
+    return bool(ordenes) and ordenes[0] == "COMMIT"
+
+def dbapi_connect(destino):
+    """
+    Devuelve una función que abre conexiones a partir de 'modulo:cadena', con `modulo.connect(cadena)`. Ej.
+    'pyodbc:DRIVER={ODBC Driver 18 for SQL Server};SERVER=...' o 'sqlite3:/tmp/pruebas.db'.
+    """
+    nombre_modulo, separador, cadena = destino.partition(":")
+    if not separador or not nombre_modulo:
+        raise ValueError(f"Destino de ejecución no válido: {destino}. Formato: modulo:cadena_de_conexion")
+    driver = importlib.import_module(nombre_modulo)
+    # Las conexiones del pool pasan de un hilo a otro, y sqlite3 no lo permite por defecto
+    opciones = {"check_same_thread": False} if nombre_modulo == "sqlite3" else {}
+
+    def connect():
+        return driver.connect(cadena, **opciones)
+    return connect
+
+class ConnectionPool:
+    def __init__(self, connect, size):
         """
-        Inicializa el procesador con los parámetros necesarios.
-        Args:
-        - path (str): Ruta al archivo Excel o directorio.
-        - task_link (str): Enlace de la tarea.
-        - description (str): Descripción de la tarea.
-        - author (str): Nombre del autor.
-        - mode (str): Modo de procesamiento ('folder' para carpeta, 'file' para archivo único).
-        - output_dir (str, opcional): Directorio de salida para los archivos generados.
+        Pool de como mucho `size` conexiones, que se abren con `connect` a medida que hacen falta.
         """
-         
-        self.path = path
-        self.task_link = task_link
-        self.description = description
-        self.author = author
-        self.hora_inicio = datetime.datetime.now()
-        self.mode = mode
-        self.log_messages = []
-        self.validation_data = {}
-        
-        self.archivos_excel = glob.glob(os.path.join(self.path, "*.xlsx")) if mode == "folder" else [self.path]
-        self.output_dir = output_dir if output_dir else os.path.join(os.path.expanduser("~"), "Downloads")
+        self.connect = connect
+        self._libres = queue.LifoQueue()
+        self._huecos = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._abiertas = []
+
+    def acquire(self):
+        # Espera a que haya una conexión libre o hueco para abrir otra
+        self._huecos.acquire()
+        try:
+            return self._libres.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            conexion = self.connect()
+        except BaseException:
+            self._huecos.release()
+            raise
+        with self._lock:
+            self._abiertas.append(conexion)
+        return conexion
+
+    def release(self, conexion, valida=True):
+        # Una conexión que ha fallado a medias se cierra en lugar de volver al pool
+        if valida:
+            self._libres.put(conexion)
+        else:
+            self._close(conexion)
+        self._huecos.release()
 
-    def process_files(self):
+    def _close(self, conexion):
+        with self._lock:
+            if conexion in self._abiertas:
+                self._abiertas.remove(conexion)
+        try:
+            conexion.close()
+        except Exception:
+            pass
+
+    def close(self):
+        with self._lock:
+            abiertas = list(self._abiertas)
+        for conexion in abiertas:
+            self._close(conexion)
+
+class SQLExecutor:
+    def __init__(self, connect, pool_size=2, per_statement=False, commit=None, max_failed_statements=20):
+        """
+        Ejecuta scripts generados con un driver DB-API: un pool de conexiones, un lote por cada 'GO' y una
+        transacción por archivo.
 
+        Args:
+        - connect (callable): Función que abre una conexión DB-API (ver `dbapi_connect`).
+        - pool_size (int, opcional): Conexiones, y por tanto archivos ejecutados a la vez.
+        - per_statement (bool, opcional): Ejecuta las sentencias una a una en lugar de cada lote entero. Es más lento,
+        pero indica qué sentencia falla y sigue con las demás. Necesario con drivers que no aceptan varias
+        sentencias por `execute`, como sqlite3.
+        - commit (bool, opcional): Confirma (True) o deshace (False) cada archivo. Por defecto hace lo que diga el
+        pie del script (ROLLBACK salvo que se haya descomentado el COMMIT).
+        - max_failed_statements (int, opcional): Sentencias fallidas tras las que se deja de ejecutar un archivo.
         """
-        Procesa los archivos Excel y genera los scripts SQL correspondientes.
+        if pool_size < 1:
+            raise ValueError("El pool necesita al menos una conexión.")
+        self.connect = connect
+        self.pool_size = pool_size
+        self.per_statement = per_statement
+        self.commit = commit
+        self.max_failed_statements = max_failed_statements
+
+    def execute_files(self, rutas, log_messages=None):
+        """
+        Ejecuta los scripts, cada uno con una conexión del pool y en su propia transacción. Si falla alguna
+        sentencia, el archivo se deshace entero.
+
+        Args:
+        - rutas (list): Rutas de los scripts.
+        - log_messages (list, opcional): Lista a la que se añaden los tiempos por hoja y las sentencias fallidas.
 
         Returns:
-        - nombresSQL (list): Lista de nombres de archivos SQL generados.
-        - log_messages (list): Lista de mensajes de registro.
-        - hojas_no_procesadas (int): Número de hojas no procesadas.
-        - validation_data (dict): Datos de validación de queries generadas por hoja.
+        - list: Un diccionario por archivo con sus sentencias, lotes, tiempos por hoja, fallos y si se ha confirmado.
         """
+        pool = ConnectionPool(self.connect, self.pool_size)
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.pool_size, len(rutas)) or 1) as hilos:
+                resultados = list(hilos.map(lambda ruta: self._execute_file(pool, ruta), rutas))
+        finally:
+            pool.close()
+
+        if log_messages is not None:
+            for resultado in resultados:
+                log_messages.extend(self._log_lines(resultado))
+        return resultados
+
+    def _execute_file(self, pool, ruta):
+        resultado = {
+            "archivo": os.path.basename(ruta),
+            "sentencias": 0,
+            "lotes": 0,
+            "confirmado": False,
+            "segundos": 0.0,
+            "hojas": {},
+            "fallos": [],
+        }
+        inicio = time.perf_counter()
+        conexion = pool.acquire()
+        valida = False
+        try:
+            cursor = conexion.cursor()
+            for lote in iter_sql_batches(ruta):
+                resultado["lotes"] += 1
+                if self.per_statement:
+                    self._execute_statements(cursor, lote, resultado)
+                else:
+                    self._execute_batch(cursor, lote, resultado)
+                if resultado["fallos"] and (not self.per_statement or len(resultado["fallos"]) >= self.max_failed_statements):
+                    break
+
+            confirmar = script_commits(ruta) if self.commit is None else self.commit
+            if confirmar and not resultado["fallos"]:
+                conexion.commit()
+                resultado["confirmado"] = True
+            else:
+                conexion.rollback()
+            valida = True
+        except Exception as e:
+            # Errores de conexión o al confirmar: el archivo queda sin aplicar
+            resultado["fallos"].append({"hoja": None, "sentencia": None, "error": str(e), "texto": ""})
+        finally:
+            pool.release(conexion, valida)
+            resultado["segundos"] = time.perf_counter() - inicio
+        return resultado
+
+    def _sheet(self, resultado, hoja):
+        return resultado["hojas"].setdefault(hoja, {"sentencias": 0, "segundos": 0.0})
+
+    def _execute_statements(self, cursor, lote, resultado):
+        for hoja, sentencia in lote:
+            datos_hoja = self._sheet(resultado, hoja)
+            # Las redeclaraciones de variables tras un 'GO' no cuentan como sentencias de la hoja
+            es_datos = bool(PATRON_SENTENCIA_DATOS.match(sentencia))
+            if es_datos:
+                datos_hoja["sentencias"] += 1
+                resultado["sentencias"] += 1
+            inicio = time.perf_counter()
+            try:
+                cursor.execute(sentencia)
+            except Exception as e:
+                resultado["fallos"].append({
+                    "hoja": hoja,
+                    "sentencia": datos_hoja["sentencias"] if es_datos else None,
+                    "error": str(e),
+                    "texto": sentencia[:200],
+                })
+                if len(resultado["fallos"]) >= self.max_failed_statements:
+                    return
+            finally:
+                datos_hoja["segundos"] += time.perf_counter() - inicio
+
+    def _execute_batch(self, cursor, lote, resultado):
+        por_hoja = {}
+        for hoja, sentencia in lote:
+            if PATRON_SENTENCIA_DATOS.match(sentencia):
+                por_hoja[hoja] = por_hoja.get(hoja, 0) + 1
+        inicio = time.perf_counter()
+        try:
+            cursor.execute("\n".join(sentencia for _, sentencia in lote))
+        except Exception as e:
+            # El driver no dice qué sentencia del lote ha fallado: se indica el lote y su primera sentencia
+            resultado["fallos"].append({
+                "hoja": lote[0][0],
+                "sentencia": None,
+                "lote": resultado["lotes"],
+                "error": str(e),
+                "texto": lote[0][1][:200],
+            })
+        segundos = time.perf_counter() - inicio
+
+        # El tiempo del lote se reparte entre sus hojas según sus sentencias
+        total = sum(por_hoja.values()) or 1
+        for hoja, sentencias in por_hoja.items():
+            datos_hoja = self._sheet(resultado, hoja)
+            datos_hoja["sentencias"] += sentencias
+            datos_hoja["segundos"] += segundos * sentencias / total
+        resultado["sentencias"] += sum(por_hoja.values())
+
+    def _log_lines(self, resultado):
+        archivo = resultado["archivo"]
+        lineas = [
+            f"Ejecución {archivo}: {resultado['sentencias']} sentencias en {resultado['lotes']} lotes, "
+            f"{resultado['segundos']:.2f} s, {'COMMIT' if resultado['confirmado'] else 'ROLLBACK'}."
+        ]
+        for hoja, datos_hoja in resultado["hojas"].items():
+            if hoja is not None:
+                lineas.append(f"Ejecución {archivo} - Hoja {hoja}: {datos_hoja['sentencias']} sentencias en {datos_hoja['segundos']:.2f} s.")
+        for fallo in resultado["fallos"]:
+            if fallo["sentencia"] is not None:
+                posicion = f"Hoja {fallo['hoja']}, sentencia {fallo['sentencia']}"
+            elif fallo.get("lote"):
+                posicion = f"Hoja {fallo['hoja']}, lote {fallo['lote']}"
+            else:
+                posicion = "Error"
+            lineas.append(f"Ejecución {archivo} - {posicion}: {fallo['error']} | {fallo['texto']}")
+        return lineas
 
-        contador_lineas_totales = 0
-        contador = 0
-        nombresSQL = []
-        hojas_no_procesadas = 0
 
-        for archivo_excel in self.archivos_excel:
-            workbook = pd.ExcelFile(archivo_excel)
-            codigo_tarea, cabecera_sql = generate_sql_header(
-                self.task_link, self.description, self.author, self.hora_inicio
-            )
+# %% [markdown]
+# ### Modo vigilancia
+# Esta sección define el modo vigilancia (`python excel2sql.py watch carpeta/`): un proceso que se queda en marcha y convierte cada excel nuevo o modificado de una carpeta en cuanto se termina de guardar, sin tener que abrir la interfaz y pulsar "Generar SQLs".
+
+# %%
+# Eventos de inotify (ver `man inotify`) que indican que un archivo de la carpeta ha aparecido, cambiado o desaparecido
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+CABECERA_EVENTO_INOTIFY = struct.Struct("iIII")
+
+def is_watched_file(nombre):
+    """
+    Indica si un archivo de la carpeta vigilada se convierte: los excels y CSV de EXTENSIONES, sin los archivos de
+    bloqueo que deja Excel (`~$libro.xlsx`) o LibreOffice (`.~lock.libro.xlsx#`) mientras el libro está abierto.
+    """
+    return not nombre.startswith(("~$", ".")) and nombre.lower().endswith(EXTENSIONES)
 
-            contenido_columna = cabecera_sql
-            for sheet_name in workbook.sheet_names:
-                df = pd.read_excel(workbook, sheet_name=sheet_name)
+class PollingMonitor:
 
-                # Verificar que el DataFrame no esté vacío y tenga al menos las columnas necesarias (21 para 'INSERT', 23 para 'UPDATE')
-                if df.empty or (df.shape[1] < 21 and df.shape[1] < 23):
-                    self.log_messages.append(f"Hoja {sheet_name}: No hay columnas suficientes para procesar.")
-                    hojas_no_procesadas += 1
-                    continue
+    def __init__(self, directorio, interval=2.0):
+        """
+        Avisa de que hay que volver a mirar toda la carpeta cada `interval` segundos. Funciona en cualquier sistema y
+        en carpetas compartidas en red, donde los cambios hechos desde otros equipos no generan eventos.
+        """
+        self.directorio = directorio
+        self.interval = interval
+        self._siguiente = 0.0
 
-                declares = []
-                contenido_columna += f"---Tabla: {sheet_name}\n"
-                queries_count = 0
-                insert_count = 0
-                update_count = 0
+    def wait(self, timeout):
+        """
+        Espera como mucho `timeout` segundos.
 
-                # Procesar cada fila del DataFrame
-                for index, row in df.iterrows():
-                    try:
-                        # Verificar si la columna 'UPDATE' (índice 22) existe y tiene un valor no nulo
-                        update_value = row[22] if df.shape[1] > 22 else None
-                        insert_value = row[20] if df.shape[1] > 20 else None
-
-                        if pd.notna(update_value) and isinstance(update_value, str) and update_value.strip().lower().startswith("update"):
-                            update_value = clean_sql_value(update_value.strip(), declares)
-                            contenido_columna += update_value + "\n"
-                            queries_count += 1
-                            update_count += 1
-                            contador_lineas_totales += 1
-
-                        # Si no hay 'UPDATE', procesar 'INSERT'
-                        elif pd.notna(insert_value) and isinstance(insert_value, str) and insert_value.strip().lower().startswith("insert into"):
-                            insert_value = clean_sql_value(insert_value.strip(), declares)
-                            contenido_columna += insert_value + "\n"
-                            queries_count += 1
-                            insert_count += 1
-                            contador_lineas_totales += 1
-
-                        # Control de declaración 'GO' cada 45 líneas
-                        if contador_lineas_totales % 45 == 0:
-                            contenido_columna += "GO\n"
-                            for variable in declares:
-                                contenido_columna += f"DECLARE @{variable} AS INT\nSET @{variable} = 0\n"
-                            declares.clear()
-
-                    except Exception as e:
-                        self.log_messages.append(f"Error: al procesar la fila {index} en la hoja {sheet_name}: {e}")
-                        continue
+        Returns:
+        - set o None: Nombres de los archivos que han cambiado, o None si hay que volver a mirar toda la carpeta.
+        """
+        espera = self._siguiente - time.monotonic()
+        if espera > timeout:
+            time.sleep(timeout)
+            return set()
+        time.sleep(max(0.0, espera))
+        self._siguiente = time.monotonic() + self.interval
+        return None
+
+    def close(self):
+        pass
+
+class InotifyMonitor:
 
-                # Solo agregar datos de validación si hay consultas generadas
-                if queries_count > 0:
-                    self.validation_data[sheet_name] = {
-                        "total_queries": queries_count,
-                        "inserts": insert_count,
-                        "updates": update_count
-                    }
+    def __init__(self, directorio):
+        """
+        Recibe los cambios de la carpeta de inotify (Linux), sin recorrerla cada vez. Lanza OSError si el sistema no
+        tiene inotify.
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify solo está disponible en Linux")
+        import ctypes
+        import ctypes.util
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        eventos = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+        if self._libc.inotify_add_watch(self._fd, os.fsencode(directorio), eventos) < 0:
+            error = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(error, f"inotify_add_watch {directorio}")
+
+    def wait(self, timeout):
+        """
+        Espera como mucho `timeout` segundos a que cambie algún archivo (ver `PollingMonitor.wait`).
+        """
+        listos, _, _ = select.select([self._fd], [], [], timeout)
+        if not listos:
+            return set()
+        nombres = set()
+        while True:
+            try:
+                datos = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return nombres
+            posicion = 0
+            while posicion < len(datos):
+                _, mascara, _, longitud = CABECERA_EVENTO_INOTIFY.unpack_from(datos, posicion)
+                posicion += CABECERA_EVENTO_INOTIFY.size
+                if mascara & IN_Q_OVERFLOW:
+                    # Se han perdido eventos: hay que mirar toda la carpeta
+                    return None
+                nombres.add(os.fsdecode(datos[posicion:posicion + longitud].rstrip(b"\0")))
+                posicion += longitud
+
+    def close(self):
+        os.close(self._fd)
+
+def open_folder_monitor(directorio, poll_interval=2.0, use_inotify=True):
+    """
+    Abre el vigilante de una carpeta: inotify si está disponible y se permite, y si no, PollingMonitor.
+    """
+    if use_inotify:
+        try:
+            return InotifyMonitor(directorio)
+        except OSError:
+            pass
+    return PollingMonitor(directorio, poll_interval)
 
-            contenido_columna += "GO\nROLLBACK\n--COMMIT\n"
-            nombre_archivo_salida = f"{self.hora_inicio.strftime('%Y%m%d')}-{codigo_tarea}-00{contador}-DAT-{os.path.basename(archivo_excel).split('.')[0]}.sql"
-            nombresSQL.append(nombre_archivo_salida)
+class RollingLog:
 
-            ruta_archivo_salida = os.path.normpath(os.path.join(self.output_dir, nombre_archivo_salida))
-            print(f"Saving file to: {ruta_archivo_salida}")
+    def __init__(self, ruta, max_bytes=10 * 1024 * 1024, backups=3):
+        """
+        Archivo de registro JSON, una línea por entrada, que al pasar de `max_bytes` se renombra a `ruta.1` (y el
+        `.1` a `.2`...), guardando como mucho `backups` archivos anteriores.
+        """
+        self.ruta = ruta
+        self.max_bytes = max_bytes
+        self.backups = backups
+
+    def write(self, registro):
+        linea = json.dumps(registro, ensure_ascii=False) + "\n"
+        try:
+            tamano = os.path.getsize(self.ruta)
+        except OSError:
+            tamano = 0
+        if tamano and tamano + len(linea.encode("utf-8")) > self.max_bytes:
+            for numero in range(self.backups - 1, 0, -1):
+                if os.path.exists(f"{self.ruta}.{numero}"):
+                    os.replace(f"{self.ruta}.{numero}", f"{self.ruta}.{numero + 1}")
+            if self.backups > 0:
+                os.replace(self.ruta, f"{self.ruta}.1")
+            else:
+                os.remove(self.ruta)
+        with open(self.ruta, "a", encoding="utf-8") as archivo:
+            archivo.write(linea)
+
+def _warm_reader(nombre):
+    # Importa de verdad el módulo del lector, que `_lazy_import` deja pendiente hasta el primer uso
+    if nombre == "pandas":
+        pd.ExcelFile
+    elif nombre == "openpyxl":
+        openpyxl.load_workbook
+    elif nombre == "calamine":
+        importlib.import_module("python_calamine")
+
+def _init_watch_worker(lectores):
+    _init_worker()
+    for nombre in lectores:
+        _warm_reader(nombre)
+
+class FolderWatcher:
+
+    def __init__(self, processor, debounce=2.0, poll_interval=2.0, use_inotify=True, rescan_interval=60.0, log_path=None):
+        """
+        Modo vigilancia: convierte los excels nuevos o modificados de la carpeta de `processor` (en modo carpeta) con
+        sus mismos parámetros, salida y caché, hasta que se detenga.
+
+        Un archivo se convierte cuando lleva `debounce` segundos sin cambiar de tamaño ni de fecha, así que los
+        guardados seguidos se convierten una sola vez. Cada cambio se convierte exactamente una vez: si el archivo
+        vuelve a cambiar mientras se convierte, se convierte otra vez al terminar. Al arrancar se convierten los que
+        han cambiado desde la última ejecución, porque la caché reutiliza los demás.
 
+        Las conversiones van a un pool de `processor.workers` procesos que se arrancan al empezar, con los módulos
+        del lector ya importados, y se reutilizan para todos los archivos.
+
+        Args:
+        - processor (SQLFileProcessor): Procesador en modo carpeta con la carpeta a vigilar y los parámetros.
+        - debounce (float, opcional): Segundos que un archivo tiene que estar sin cambiar para convertirlo.
+        - poll_interval (float, opcional): Segundos entre dos recorridos de la carpeta sin inotify.
+        - use_inotify (bool, opcional): Usa inotify si está disponible. En carpetas compartidas en red hay que
+          desactivarlo, porque los cambios hechos desde otros equipos no generan eventos.
+        - rescan_interval (float, opcional): Con inotify, segundos entre dos recorridos completos de la carpeta, por si
+          se ha perdido algún evento.
+        - log_path (str, opcional): Registro con una línea JSON por conversión (ver RollingLog). Por defecto,
+          `excel2sql-watch.jsonl` en el directorio de salida.
+        """
+        if processor.mode != "folder":
+            raise ValueError("El modo vigilancia necesita un procesador en modo carpeta.")
+        if processor.output_sink not in SALIDAS_ARCHIVO:
+            raise ValueError("El modo vigilancia necesita guardar los scripts en archivos.")
+        self.processor = processor
+        self.directorio = processor.path
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.rescan_interval = rescan_interval
+        self.log = RollingLog(log_path or os.path.join(processor.output_dir, "excel2sql-watch.jsonl"))
+        self.totales = {"archivos": 0, "generados": 0, "reutilizados": 0, "errores": 0, "segundos": 0.0}
+        self._convertidos = {}  # ruta -> firma (tamaño, fecha) de la última versión convertida
+        self._candidatos = {}  # ruta -> [firma, momento en que se vio por primera vez]
+        self._en_curso = {}  # ruta -> (future, pool, trabajo, firma, hash, inicio)
+        self._manifiesto = None
+        self._pool = None
+
+    def run(self, stop_event=None):
+        """
+        Vigila la carpeta hasta que se active `stop_event`. Las conversiones en curso terminan antes de salir.
+        """
+        stop_event = stop_event or threading.Event()
+        os.makedirs(self.processor.output_dir, exist_ok=True)
+        self._manifiesto = BuildManifest(self.processor.output_dir)
+        self._start_pool()
+        monitor = open_folder_monitor(self.directorio, self.poll_interval, self.use_inotify)
+        print(f"Vigilando {self.directorio} con {type(monitor).__name__} y {self.processor.workers} procesos", file=sys.stderr)
+        siguiente_recorrido = 0.0
+        try:
+            while not stop_event.is_set():
+                cambios = monitor.wait(min(0.5, self.debounce))
+                if time.monotonic() >= siguiente_recorrido:
+                    cambios = None
+                if cambios is None:
+                    siguiente_recorrido = time.monotonic() + self.rescan_interval
+                    self._scan(None)
+                elif cambios:
+                    self._scan(cambios)
+                self._collect_finished()
+                self._submit_ready()
+        finally:
+            monitor.close()
+            pool, self._pool = self._pool, None
+            pool.shutdown(wait=True, cancel_futures=True)
+            self._collect_finished()
+
+    def _start_pool(self):
+        lectores = {self.processor.reader}
+        if self.processor.reader == "auto":
+            lectores = {select_reader("libro.xlsx")}
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.processor.workers, initializer=_init_watch_worker, initargs=(lectores,)
+        )
+        # Arranca ya todos los procesos, para que la primera conversión no espere a que se importen los módulos
+        for arrancado in [self._pool.submit(os.getpid) for _ in range(self.processor.workers)]:
+            arrancado.result()
+
+    def _scan(self, nombres):
+        """
+        Actualiza los candidatos con la firma de los archivos indicados, o de toda la carpeta si `nombres` es None.
+        """
+        if nombres is None:
+            try:
+                nombres = set(os.listdir(self.directorio))
+            except OSError as e:
+                print(f"No se puede leer la carpeta {self.directorio}: {e}", file=sys.stderr)
+                return
+            # Los que ya no están
+            nombres.update(os.path.basename(ruta) for ruta in (*self._convertidos, *self._candidatos))
+        ahora = time.monotonic()
+        for nombre in nombres:
+            if not is_watched_file(nombre):
+                continue
+            ruta = os.path.join(self.directorio, nombre)
             try:
-                os.makedirs(os.path.dirname(ruta_archivo_salida), exist_ok=True)
+                estado = os.stat(ruta)
+            except OSError:
+                # Borrado: si vuelve a aparecer, se convierte aunque tenga la misma firma
+                self._candidatos.pop(ruta, None)
+                self._convertidos.pop(ruta, None)
+                continue
+            firma = (estado.st_size, estado.st_mtime_ns)
+            candidato = self._candidatos.get(ruta)
+            if candidato is not None and candidato[0] == firma:
+                continue
+            if candidato is None and self._convertidos.get(ruta) == firma:
+                continue
+            self._candidatos[ruta] = [firma, ahora]
+
+    def _submit_ready(self):
+        ahora = time.monotonic()
+        for ruta, (firma, desde) in list(self._candidatos.items()):
+            if len(self._en_curso) >= self.processor.workers:
+                return
+            if ruta in self._en_curso or ahora - desde < self.debounce:
+                continue
+            del self._candidatos[ruta]
+            if self._convertidos.get(ruta) == firma:
+                continue
+            try:
+                estado = os.stat(ruta)
+                hash_excel = hash_file(ruta)
+            except OSError as e:
+                self._record(ruta, "error", firma, 0.0, error=str(e))
+                continue
+            if (estado.st_size, estado.st_mtime_ns) != firma:
+                # Ha cambiado justo ahora: se espera otra vez
+                self._candidatos[ruta] = [(estado.st_size, estado.st_mtime_ns), ahora]
+                continue
+            self._convert(ruta, firma, hash_excel)
+
+    def _convert(self, ruta, firma, hash_excel):
+        # Cada conversión usa una copia del procesador con la fecha de hoy, para que un vigilante que lleva días en
+        # marcha no ponga la fecha del arranque
+        trabajo = copy.copy(self.processor)
+        trabajo.hora_inicio = datetime.datetime.now()
+        trabajo.archivos_excel = [ruta]
+        trabajo.collect_metrics = True
+        trabajo.log_messages = []
+        trabajo.validation_data = {}
+        inicio = time.perf_counter()
+
+        entrada = None if trabajo.force else self._manifiesto.lookup(ruta, hash_excel, trabajo._cache_parameters())
+        if entrada:
+            try:
+                nombres_archivos_salida, log_messages, hojas_no_procesadas, _ = trabajo._reuse_cached(ruta, 0, entrada)
+                self._save_manifest()
+            except OSError as e:
+                self._record(ruta, "error", firma, time.perf_counter() - inicio, error=str(e))
+                return
+            self._record(
+                ruta, "reutilizado", firma, time.perf_counter() - inicio, nombresSQL=nombres_archivos_salida,
+                log_messages=log_messages, hojas_no_procesadas=hojas_no_procesadas
+            )
+            return
 
-                with open(ruta_archivo_salida, "w", encoding="utf-8") as archivo_salida:
-                    archivo_salida.write(contenido_columna)
-                    print(f"Archivo {nombre_archivo_salida} generado con éxito en {ruta_archivo_salida}")
+        try:
+            future = self._pool.submit(trabajo._process_workbook, ruta, 0)
+        except BrokenProcessPool:
+            self._restart_pool()
+            future = self._pool.submit(trabajo._process_workbook, ruta, 0)
+        self._en_curso[ruta] = (future, self._pool, trabajo, firma, hash_excel, inicio)
+
+    def _collect_finished(self):
+        for ruta, (future, pool, trabajo, firma, hash_excel, inicio) in list(self._en_curso.items()):
+            if not future.done():
+                continue
+            del self._en_curso[ruta]
+            try:
+                (nombres_archivos_salida, nombres_archivos_datos, log_messages, hojas_no_procesadas, validation_data,
+                 generado, _, metricas) = future.result()
+            except BrokenProcessPool as e:
+                # Un proceso del pool ha muerto (por ejemplo, sin memoria): se arranca otro pool, una sola vez aunque
+                # fallen todas las conversiones que estaban en el pool roto
+                self._record(ruta, "error", firma, time.perf_counter() - inicio, error=f"Proceso terminado: {e}")
+                if pool is self._pool:
+                    self._restart_pool()
+                continue
             except Exception as e:
-                print(f"Error al guardar el archivo: {e}")
+                self._record(ruta, "error", firma, time.perf_counter() - inicio, error=str(e))
+                continue
+
+            if generado:
+                try:
+                    trabajo._remove_stale_outputs(self._manifiesto, ruta, nombres_archivos_salida, nombres_archivos_datos)
+                    self._manifiesto.store(
+                        ruta, hash_excel, trabajo._cache_parameters(), nombres_archivos_salida, log_messages,
+                        hojas_no_procesadas, validation_data, nombres_archivos_datos
+                    )
+                    self._save_manifest()
+                except OSError as e:
+                    print(f"Error al guardar el manifiesto de la caché: {e}", file=sys.stderr)
+            # El tiempo de la conversión en el proceso, sin lo que tarda el bucle en ver que ha terminado
+            self._record(
+                ruta, "generado" if generado else "error", firma, metricas["segundos"],
+                nombresSQL=nombres_archivos_salida if generado else [], log_messages=log_messages,
+                hojas_no_procesadas=hojas_no_procesadas, metricas=metricas,
+                error=None if generado else "No se ha podido guardar el script"
+            )
 
-        return nombresSQL, self.log_messages, hojas_no_procesadas, self.validation_data
+    def _restart_pool(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._start_pool()
+
+    def _save_manifest(self):
+        self._manifiesto.evict_missing()
+        self._manifiesto.save()
 
+    def _record(self, ruta, estado, firma, segundos, nombresSQL=(), log_messages=(), hojas_no_procesadas=0, metricas=None,
+                error=None):
+        """
+        Da por convertida la versión `firma` del archivo y añade la conversión y los totales acumulados al registro.
+        """
+        self._convertidos[ruta] = firma
+        self.totales["archivos"] += 1
+        self.totales["segundos"] += segundos
+        if estado == "generado":
+            self.totales["generados"] += 1
+        elif estado == "reutilizado":
+            self.totales["reutilizados"] += 1
+        else:
+            self.totales["errores"] += 1
+
+        registro = {
+            "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+            "archivo": os.path.basename(ruta),
+            "estado": estado,
+            "segundos": round(segundos, 3),
+            "nombresSQL": list(nombresSQL),
+            "hojas_no_procesadas": hojas_no_procesadas,
+            "log_messages": list(log_messages),
+            "totales": dict(self.totales),
+        }
+        if error is not None:
+            registro["error"] = error
+        if metricas is not None:
+            registro["metricas"] = {clave: valor for clave, valor in metricas.items() if clave != "hojas"}
+        print(
+            f"{registro['fecha']} {registro['archivo']}: {estado} en {segundos:.2f} s"
+            + (f" ({error})" if error else f" -> {', '.join(nombresSQL)}"),
+            file=sys.stderr
+        )
+        try:
+            self.log.write(registro)
+        except OSError as e:
+            print(f"Error al escribir el registro del modo vigilancia: {e}", file=sys.stderr)
 
 # %% [markdown]
 # ### GUI
 # Esta sección define una clase para la interfaz gráfica de usuario (GUI) que permite seleccionar archivos y carpetas, configurar opciones, y generar los scripts SQL mediante interacción con la aplicación
 
 # %%
+# Un mensaje de una hoja empieza por 'Hoja <nombre>:' (o ', sentencia N:' / ', lote N:' en los fallos de ejecución).
+# Excel no permite ':' en los nombres de hoja, así que el nombre acaba en los primeros dos puntos
+PATRON_MENSAJE_HOJA = re.compile(r"(?:Ejecución .+? - )?Hoja (?P<hoja>[^:]*?)(?P<fallo>, (?:sentencia|lote) \d+)?: (?P<resto>.*)", re.DOTALL)
+SEVERIDADES = ("error", "aviso", "info")
+TODAS = "(todas)"
+ESPERA_FILTRO_MS = 250  # Pausa al escribir en el filtro antes de aplicarlo
+
+def describe_log_message(mensaje):
+    """
+    Hoja y gravedad de un mensaje de registro: 'error' para los fallos, 'aviso' para las hojas que no se han
+    procesado e 'info' para el resto.
+
+    Returns:
+    - tuple: `(hoja, gravedad)`, con `hoja` None si el mensaje no es de una hoja.
+    """
+    partes = PATRON_MENSAJE_HOJA.match(mensaje)
+    if partes is None:
+        return None, "error" if "error" in mensaje.lower() else "info"
+    resto = partes.group("resto")
+    if partes.group("fallo") or "error" in resto.lower():
+        return partes.group("hoja"), "error"
+    if resto.startswith("No hay columnas suficientes"):
+        return partes.group("hoja"), "aviso"
+    return partes.group("hoja"), "info"
+
+class LogIndex:
+
+    def __init__(self, mensajes, archivos=None, hojas=None):
+        """
+        Índice de búsqueda de los mensajes de una conversión. Se construye una vez por conversión, con el texto en
+        minúsculas, la hoja, el archivo y la gravedad de cada mensaje, para no recalcularlos en cada filtrado.
+
+        Args:
+        - mensajes (list): Líneas a indexar.
+        - archivos (list, opcional): Archivo de cada línea (ver `SQLFileProcessor.log_files`).
+        - hojas (list, opcional): Hoja de cada línea. Si no se indica, se saca del mensaje con `describe_log_message`,
+          que también da su gravedad.
+        """
+        self.textos = list(mensajes)
+        self.minusculas = [texto.lower() for texto in self.textos]
+        self.archivos = list(archivos) if archivos is not None else [None] * len(self.textos)
+        if hojas is None:
+            descripciones = [describe_log_message(texto) for texto in self.textos]
+            self.hojas = [hoja for hoja, _ in descripciones]
+            self.severidades = [gravedad for _, gravedad in descripciones]
+        else:
+            self.hojas = list(hojas)
+            self.severidades = [None] * len(self.textos)
+        self._ultimo = None  # Último filtrado, para refinarlo mientras se sigue escribiendo
+
+    def values(self, campo):
+        """
+        Valores distintos de 'hojas', 'archivos' o 'severidades', para los desplegables de los filtros.
+        """
+        return sorted({valor for valor in getattr(self, campo) if valor is not None})
+
+    def filter(self, texto="", hoja=None, archivo=None, severidad=None):
+        """
+        Posiciones de las líneas que contienen `texto` (sin distinguir mayúsculas) y son de la hoja, el archivo y la
+        gravedad indicados (None = cualquiera). Si solo se ha añadido texto a la búsqueda anterior, se busca solo
+        entre sus resultados.
+        """
+        texto = texto.lower()
+        candidatos = range(len(self.textos))
+        if self._ultimo is not None and self._ultimo[1:4] == (hoja, archivo, severidad) and texto.startswith(self._ultimo[0]):
+            candidatos = self._ultimo[4]
+        indices = [
+            i for i in candidatos
+            if texto in self.minusculas[i]
+            and (hoja is None or self.hojas[i] == hoja)
+            and (archivo is None or self.archivos[i] == archivo)
+            and (severidad is None or self.severidades[i] == severidad)
+        ]
+        self._ultimo = (texto, hoja, archivo, severidad, indices)
+        return indices
+
+class VirtualTextView:
+
+    def __init__(self, parent, width=100, height=30):
+        """
+        Texto de solo lectura para listas de líneas muy largas: solo tiene las líneas que caben en la ventana y al
+        desplazarse las sustituye por las siguientes, así que pintarlo no depende del número de líneas.
+        """
+        self.frame = tk.Frame(parent)
+        self.text = tk.Text(self.frame, width=width, height=height, wrap=tk.NONE)
+        self.scrollbar = tk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.scroll)
+        barra_horizontal = tk.Scrollbar(self.frame, orient=tk.HORIZONTAL, command=self.text.xview)
+        self.text.config(xscrollcommand=barra_horizontal.set, state=tk.DISABLED)
+        self.text.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        barra_horizontal.grid(row=1, column=0, sticky="ew")
+        self.frame.grid_rowconfigure(0, weight=1)
+        self.frame.grid_columnconfigure(0, weight=1)
+
+        self.lineas = []
+        self.primera = 0
+        self.text.bind("<Configure>", lambda event: self.render())
+        self.text.bind("<MouseWheel>", lambda event: self.scroll("scroll", -3 if event.delta > 0 else 3, "units"))
+        # En Linux la rueda del ratón llega como los botones 4 y 5
+        self.text.bind("<Button-4>", lambda event: self.scroll("scroll", -3, "units"))
+        self.text.bind("<Button-5>", lambda event: self.scroll("scroll", 3, "units"))
+        self.text.bind("<Prior>", lambda event: self.scroll("scroll", -1, "pages"))
+        self.text.bind("<Next>", lambda event: self.scroll("scroll", 1, "pages"))
+
+    def set_lines(self, lineas):
+        self.lineas = lineas
+        self.primera = 0
+        self.render()
+
+    def visible_lines(self):
+        alto_linea = int(self.text.tk.call("font", "metrics", self.text.cget("font"), "-linespace"))
+        alto = self.text.winfo_height()
+        # Antes de mostrarse la ventana no tiene tamaño: se usa el alto configurado
+        return max(1, alto // alto_linea) if alto > 1 else int(self.text.cget("height"))
+
+    def render(self):
+        visibles = self.visible_lines()
+        total = len(self.lineas)
+        self.primera = max(0, min(self.primera, total - visibles))
+        # Un mensaje es una línea aunque tenga saltos de línea (sentencias de varias líneas)
+        texto = "\n".join(linea.replace("\n", " ") for linea in self.lineas[self.primera:self.primera + visibles])
+        self.text.config(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        self.text.insert("1.0", texto)
+        self.text.config(state=tk.DISABLED)
+        if total > visibles:
+            self.scrollbar.set(self.primera / total, (self.primera + visibles) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll(self, accion, cantidad, unidad=None):
+        """
+        Recibe los desplazamientos de la barra ('moveto', fracción) o ('scroll', número, 'units'/'pages').
+        """
+        if accion == "moveto":
+            self.primera = int(float(cantidad) * len(self.lineas))
+        else:
+            self.primera += int(cantidad) * (self.visible_lines() if unidad == "pages" else 1)
+        self.render()
+        return "break"
+
 class SQLGeneratorApp:
     def __init__(self):
 
@@ -210,7 +3269,8 @@ class SQLGeneratorApp:
         Inicializa la aplicación y configura los elementos de la interfaz gráfica.
         """
 
-        self.root = Tk()
+        _import_gui()
+        self.root = tk.Tk()
         self.root.title("Excel 2 SQL v3.5")
         
         #icon_path = os.path.join(os.getcwd(), 'assets', 'icon.ico')
@@ -224,9 +3284,20 @@ class SQLGeneratorApp:
         self.description = tk.StringVar()
         self.author = tk.StringVar()
         self.mode = tk.StringVar(value="file")
+        self.workers = tk.IntVar(value=1)
+        self.force = tk.BooleanVar(value=False)
+        self.corrected_cleaning = tk.BooleanVar(value=False)  # Limpieza 'corrected' en lugar de 'compat'
+        self.coalesce_inserts = tk.BooleanVar(value=False)
         
+        self.progress_queue = queue.Queue()  # Avisos del hilo de conversión, leídos con root.after
+        self.cancel_event = threading.Event()
+
         self.log_messages = []  # Lista para capturar mensajes de depuración
+        self.log_files = []  # Archivo de cada mensaje
         self.validation_data = {}
+        self.metrics = None  # Métricas de la última conversión (ConversionMetrics)
+        self._log_index = None  # Índices de búsqueda de la última conversión (LogIndex)
+        self._validation_index = None
 
         # Configuración de columnas para centrado
         self.root.grid_columnconfigure(0, weight=1)
@@ -271,16 +3342,34 @@ class SQLGeneratorApp:
         
         tk.Label(self.root, text="Descripción:").grid(row=4, column=0, padx=10, pady=10)
         tk.Entry(self.root, textvariable=self.description, width=50).grid(row=4, column=1, padx=10, pady=10)
+        tk.Checkbutton(self.root, text="Agrupar INSERTs en varias filas", variable=self.coalesce_inserts).grid(row=4, column=2, padx=10, pady=10)
         
         tk.Label(self.root, text="Autor:").grid(row=5, column=0, padx=10, pady=10)
         tk.Entry(self.root, textvariable=self.author, width=50).grid(row=5, column=1, padx=10, pady=10)
+        tk.Checkbutton(self.root, text="Respetar literales entre comillas", variable=self.corrected_cleaning).grid(row=5, column=2, padx=10, pady=10)
+
+        # En modo carpeta se reparten los archivos; con un único archivo, sus hojas
+        tk.Label(self.root, text="Procesos en paralelo:").grid(row=6, column=0, padx=10, pady=10)
+        tk.Spinbox(self.root, from_=1, to=os.cpu_count() or 1, textvariable=self.workers, width=5).grid(row=6, column=1, padx=10, pady=10, sticky="w")
+        tk.Checkbutton(self.root, text="Regenerar aunque no haya cambios", variable=self.force).grid(row=6, column=2, padx=10, pady=10)
         
        
-        tk.Button(self.root, text="Generar SQLs", command=self.generate_sql_files).grid(row=6, column=0, columnspan=3, padx=10, pady=20)
+        action_frame = tk.Frame(self.root)
+        action_frame.grid(row=7, column=0, columnspan=3, padx=10, pady=20)
+        self.generate_button = tk.Button(action_frame, text="Generar SQLs", command=self.generate_sql_files)
+        self.generate_button.pack(side=tk.LEFT, padx=5)
+        self.cancel_button = tk.Button(action_frame, text="Cancelar", command=self.cancel_conversion)
+
+        # Progreso de la conversión, visible solo mientras se ejecuta
+        self.progress_frame = tk.Frame(self.root)
+        self.progress_bar = ttk.Progressbar(self.progress_frame, length=400, maximum=100)
+        self.progress_bar.pack(padx=10, pady=5)
+        self.progress_label = tk.Label(self.progress_frame, text="")
+        self.progress_label.pack(padx=10)
 
         # Crear un frame para contener los dos botones
         button_frame = tk.Frame(self.root)
-        button_frame.grid(row=7, column=0, columnspan=3, pady=10)
+        button_frame.grid(row=8, column=0, columnspan=3, pady=10)
 
         self.show_log_button = tk.Button(button_frame, text="Mostrar Logs", command=self.show_log)
         self.show_log_button.pack(side=tk.LEFT, padx=5)
@@ -330,7 +3419,7 @@ class SQLGeneratorApp:
         """
         Muestra un cuadro de diálogo para seleccionar un archivo Excel y guarda la selección.
         """
-        file_path = filedialog.askopenfilename(filetypes=[("Excel files", "*.xlsx")])
+        file_path = filedialog.askopenfilename(filetypes=[("Excel files", " ".join(f"*{extension}" for extension in EXTENSIONES))])
         if file_path:
             self.filepath.set(file_path)
 
@@ -345,115 +3434,299 @@ class SQLGeneratorApp:
     def generate_sql_files(self):
 
         """
-        Genera los archivos SQL llamando a SQLFileProcessor y maneja el resultado mostrando mensajes en la GUI.
+        Lanza la generación de los archivos SQL con SQLFileProcessor en un hilo aparte; el resultado se muestra en `finish_conversion`.
         """
 
         task_link = self.task_link.get()
         description = self.description.get()
         author = self.author.get()
+
+        try:
+            workers = self.workers.get()
+        except tk.TclError:
+            messagebox.showwarning("Input Error", "El número de procesos debe ser un entero")
+            return
         
         if self.mode.get() == "folder":
             path = self.directory.get()
             if not path: #or not task_link or not description or not author:
                 messagebox.showwarning("Input Error", "Selecciona un directorio")
                 return
-            
-            processor = SQLFileProcessor(path, task_link, description, author, mode="folder")
+
+            mode = "folder"
         else:
             path = self.filepath.get()
             if not path: # or not task_link or not description or not author:
                 messagebox.showwarning("Input Error", "Selecciona un archivo excel")
                 return
-            
-            processor = SQLFileProcessor(path, task_link, description, author, mode="file")
-        
-        try:
-            generated_files, self.log_messages, hojas_no_procesadas, self.validation_data = processor.process_files()
 
-            if self.log_messages:
-                self.show_log_button.pack(side=tk.LEFT, padx=5)  # Mostrar el botón si hay logs
-            
-            if hojas_no_procesadas > 0:
-                tk.Label(self.root, text=f"Total hojas no procesadas: {hojas_no_procesadas}").grid(row=8, column=0, columnspan=3, padx=10, pady=10)
-                if self.validation_data:
-                    self.show_validation_button.pack(side=tk.LEFT, padx=5) 
-                messagebox.showinfo("Success", f"Generado {len(generated_files)} archivos SQL correctamente")
-            
+            mode = "file"
+
+        self.cancel_event = threading.Event()
+        processor = SQLFileProcessor(
+            path, task_link, description, author, mode=mode, workers=workers, force=self.force.get(),
+            progress_callback=lambda evento: self.progress_queue.put(("progreso", evento)),
+            cancel_event=self.cancel_event, collect_metrics=True,
+            cleaning="corrected" if self.corrected_cleaning.get() else "compat",
+            coalesce_inserts=self.coalesce_inserts.get()
+        )
 
+        # La conversión va en otro hilo para que la ventana siga respondiendo
+        self.generate_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+        self.progress_bar["value"] = 0
+        self.progress_label.config(text="Iniciando...")
+        self.progress_frame.grid(row=9, column=0, columnspan=3, pady=5)
+
+        threading.Thread(target=self.run_conversion, args=(processor,), daemon=True).start()
+        self.root.after(100, self.poll_progress)
+
+    def run_conversion(self, processor):
+
+        """
+        Ejecuta la conversión en el hilo de trabajo. No toca la interfaz: deja el resultado en la cola de progreso.
+        """
+
+        try:
+            self.progress_queue.put(("fin", (*processor.process_files(), processor.metrics, processor.log_files)))
+        except ConversionCancelled:
+            self.progress_queue.put(("cancelado", None))
         except Exception as e:
-            messagebox.showerror("Error", str(e))
+            self.progress_queue.put(("error", str(e)))
+
+    def poll_progress(self):
 
-    def filter_logs(self, filter_text, log_text_widget):
+        """
+        Lee los avisos pendientes del hilo de conversión y actualiza la interfaz. Se vuelve a programar hasta que la conversión termina.
+        """
+
+        ultimo_progreso = None
+        try:
+            while True:
+                tipo, datos = self.progress_queue.get_nowait()
+                if tipo == "progreso":
+                    ultimo_progreso = datos
+                else:
+                    self.finish_conversion(tipo, datos)
+                    return
+        except queue.Empty:
+            pass
+
+        if ultimo_progreso:
+            self.show_progress(ultimo_progreso)
+        self.root.after(100, self.poll_progress)
+
+    def show_progress(self, evento):
+
+        """
+        Muestra un aviso de progreso: archivo y hoja actuales, filas por segundo y tiempo restante estimado.
+        """
+
+        self.progress_bar["value"] = evento["fraccion"] * 100
+        texto = f"Archivo {evento['archivos_completados'] + 1}/{evento['total_archivos']}: {evento['archivo']}"
+        if evento["hoja"]:
+            texto += f" - Hoja {evento['hoja']}"
+        texto += f"\n{evento['filas']} filas ({evento['filas_por_segundo']:.0f} filas/s)"
+        if evento["eta_segundos"] is not None:
+            texto += f" - Tiempo restante: {datetime.timedelta(seconds=round(evento['eta_segundos']))}"
+        if not self.cancel_event.is_set():
+            self.progress_label.config(text=texto)
+
+    def cancel_conversion(self):
+
+        """
+        Pide al hilo de conversión que se detenga al terminar la hoja actual.
+        """
+
+        self.cancel_event.set()
+        self.cancel_button.config(state=tk.DISABLED)
+        self.progress_label.config(text="Cancelando al terminar la hoja actual...")
+
+    def finish_conversion(self, tipo, datos):
 
         """
-        Filtra los logs según el texto de búsqueda introducido.
+        Restaura la interfaz al terminar la conversión y muestra el resultado.
 
         Args:
-        - filter_text (str): Texto por el cual filtrar los logs.
-        - log_text_widget (tk.Text): Widget de texto donde se muestran los logs.
+        - tipo (str): 'fin', 'cancelado' o 'error'.
+        - datos: Resultado de `process_files` seguido de las métricas y del archivo de cada log si ha terminado, o el
+          mensaje de error.
         """
 
-        log_text_widget.config(state=tk.NORMAL)
-        log_text_widget.delete(1.0, tk.END)
-        for message in self.log_messages:
-            if filter_text.lower() in message.lower():
-                log_text_widget.insert(tk.END, message + "\n")
-        log_text_widget.config(state=tk.DISABLED)
+        self.generate_button.config(state=tk.NORMAL)
+        self.cancel_button.pack_forget()
+        self.progress_frame.grid_remove()
 
-    def show_log(self):
+        if tipo == "cancelado":
+            messagebox.showinfo("Cancelado", "Conversión cancelada. Los scripts ya terminados se conservan.")
+            return
+        if tipo == "error":
+            messagebox.showerror("Error", datos)
+            return
+
+        generated_files, self.log_messages, hojas_no_procesadas, self.validation_data, self.metrics, self.log_files = datos
+        self._log_index = None
+        self._validation_index = None
+
+        if self.log_messages:
+            self.show_log_button.pack(side=tk.LEFT, padx=5)  # Mostrar el botón si hay logs
+        
+        if hojas_no_procesadas > 0:
+            tk.Label(self.root, text=f"Total hojas no procesadas: {hojas_no_procesadas}").grid(row=10, column=0, columnspan=3, padx=10, pady=10)
+            if self.validation_data:
+                self.show_validation_button.pack(side=tk.LEFT, padx=5) 
+            messagebox.showinfo("Success", f"Generado {len(generated_files)} archivos SQL correctamente")
+
+    def log_index(self):
 
         """
-        Muestra una nueva ventana con los logs de depuración. De cara a las hojas que se procesan o no, al igual que los errores
+        Índice de búsqueda de los logs de la última conversión. Se construye la primera vez que se pide.
+        """
+
+        if self._log_index is None:
+            self._log_index = LogIndex(self.log_messages, self.log_files or None)
+        return self._log_index
+
+    def validation_index(self):
+
+        """
+        Índice de búsqueda de las líneas de validación de la última conversión, una por hoja.
+        """
+
+        if self._validation_index is None:
+            metricas_por_hoja = self.sheet_metrics()
+            lineas = []
+            archivos = []
+            for sheet_name, data in self.validation_data.items():
+                total = data["total_queries"]
+                # Siempre muestra el total de queries generadas y solo los INSERTs y UPDATEs si son mayores que 0
+                line = f"Hoja {sheet_name}: {total} queries generadas."
+                details = []
+                if data["inserts"] > 0:
+                    details.append(f"INSERTs: {data['inserts']}")
+                if data["updates"] > 0:
+                    details.append(f"UPDATEs: {data['updates']}")
+                if total > 0 and details:
+                    line += f" ({', '.join(details)})"
+                metricas_hoja = metricas_por_hoja.get(sheet_name)
+                if metricas_hoja is not None:
+                    line += f" [{format_sheet_metrics(metricas_hoja)}]"
+                lineas.append(line)
+                archivos.append(metricas_hoja["archivo"] if metricas_hoja is not None else None)
+            self._validation_index = LogIndex(lineas, archivos, list(self.validation_data))
+        return self._validation_index
+
+    def create_filters(self, window, indice, severidad=False):
+
+        """
+        Crea los filtros de una ventana de resultados: texto, hoja, archivo y, con `severidad`, gravedad.
+
+        Returns:
+        - dict: Widgets y variables de los filtros, para `filter_values` y `bind_filters`.
         """
-        log_window = tk.Toplevel(self.root)
-        log_window.title("Log de depuración")
 
-        # Entry para buscar en los logs
-        search_frame = tk.Frame(log_window)
+        search_frame = tk.Frame(window)
         search_frame.pack(padx=10, pady=10)
         tk.Label(search_frame, text="Filtrar por:").pack(side=tk.LEFT)
-        search_entry = tk.Entry(search_frame)
-        search_entry.pack(side=tk.LEFT, padx=5)
-        search_entry.bind("<KeyRelease>", lambda event: self.filter_logs(search_entry.get(), log_text))
+        filtros = {"texto": tk.Entry(search_frame)}
+        filtros["texto"].pack(side=tk.LEFT, padx=5)
+
+        desplegables = [("hoja", "Hoja:", "hojas"), ("archivo", "Archivo:", "archivos")]
+        if severidad:
+            desplegables.append(("severidad", "Gravedad:", "severidades"))
+        for clave, etiqueta, campo in desplegables:
+            valores = indice.values(campo)
+            if not valores:
+                continue
+            tk.Label(search_frame, text=etiqueta).pack(side=tk.LEFT)
+            filtros[clave] = tk.StringVar(value=TODAS)
+            ttk.Combobox(
+                search_frame, textvariable=filtros[clave], values=[TODAS, *valores], state="readonly", width=20
+            ).pack(side=tk.LEFT, padx=5)
+
+        filtros["contador"] = tk.Label(search_frame, text="")
+        filtros["contador"].pack(side=tk.LEFT, padx=5)
+        filtros["frame"] = search_frame
+        return filtros
+
+    def filter_values(self, filtros):
 
-        log_text = scrolledtext.ScrolledText(log_window, width=100, height=30)
-        log_text.pack(padx=10, pady=10)
-        
-        # log messages
-        for message in self.log_messages:
-            log_text.insert(tk.END, message + "\n")
-        
-        log_text.config(state=tk.DISABLED)  # solo lectura
+        """
+        Valores de los filtros para `LogIndex.filter`, con None en los desplegables sin filtrar.
+        """
+
+        valores = {"texto": filtros["texto"].get()}
+        for clave in ("hoja", "archivo", "severidad"):
+            valor = filtros[clave].get() if clave in filtros else TODAS
+            valores[clave] = None if valor == TODAS else valor
+        return valores
+
+    def bind_filters(self, filtros, aplicar):
+
+        """
+        Aplica el filtro al cambiar un desplegable y, al escribir, cuando se deja de teclear un momento.
+        """
+
+        def aplicar_con_espera(event=None):
+            if filtros.get("pendiente") is not None:
+                self.root.after_cancel(filtros["pendiente"])
+            filtros["pendiente"] = self.root.after(ESPERA_FILTRO_MS, aplicar_ya)
+
+        def aplicar_ya():
+            filtros["pendiente"] = None
+            aplicar()
+
+        filtros["texto"].bind("<KeyRelease>", aplicar_con_espera)
+        for clave in ("hoja", "archivo", "severidad"):
+            if clave in filtros:
+                filtros[clave].trace_add("write", lambda *args: aplicar())
+
+    def filter_logs(self, filtros, log_view):
+
+        """
+        Filtra los logs según los filtros de la ventana (texto, hoja, archivo y gravedad).
 
+        Args:
+        - filtros (dict): Filtros de la ventana (ver `create_filters`).
+        - log_view (VirtualTextView): Vista donde se muestran los logs.
+        """
+
+        indice = self.log_index()
+        indices = indice.filter(**self.filter_values(filtros))
+        log_view.set_lines([indice.textos[i] for i in indices])
+        filtros["contador"].config(text=f"{len(indices)} de {len(indice.textos)}")
+
+    def show_log(self):
+
+        """
+        Muestra una nueva ventana con los logs de depuración. De cara a las hojas que se procesan o no, al igual que los errores.
+        Solo se pintan las líneas visibles, así que la ventana responde igual con cientos de miles de mensajes.
+        """
+        log_window = tk.Toplevel(self.root)
+        log_window.title("Log de depuración")
+
+        filtros = self.create_filters(log_window, self.log_index(), severidad=True)
+        log_view = VirtualTextView(log_window, width=100, height=30)
+        log_view.frame.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
+
+        self.bind_filters(filtros, lambda: self.filter_logs(filtros, log_view))
+        self.filter_logs(filtros, log_view)
 
-    def filter_validation(self, filter_text, validation_text_widget):
+    def filter_validation(self, filtros, validation_view):
 
         """
-        Filtra los resultados de validación según el texto de búsqueda introducido.
+        Filtra los resultados de validación según los filtros de la ventana (texto, hoja y archivo).
 
         Args:
-        - filter_text (str): Texto por el cual filtrar la validación.
-        - validation_text_widget (tk.Text): Widget de texto donde se muestran los resultados de validación.
-        """
-
-        validation_text_widget.config(state=tk.NORMAL)
-        validation_text_widget.delete(1.0, tk.END)
-        for sheet_name, data in self.validation_data.items():
-            total = data["total_queries"]
-            inserts = data["inserts"]
-            updates = data["updates"]
-            line = f"Hoja {sheet_name}: {total} queries generadas."
-            if total > 0:
-                if inserts > 0:
-                    line += f" INSERTs: {inserts}"
-                if updates > 0:
-                    line += f" UPDATEs: {updates}"
-                line += "\n"
-                
-                # Verificar si la línea coincide con el filtro
-                if filter_text.lower() in line.lower():
-                    validation_text_widget.insert(tk.END, line)
-        validation_text_widget.config(state=tk.DISABLED)
+        - filtros (dict): Filtros de la ventana (ver `create_filters`).
+        - validation_view (VirtualTextView): Vista donde se muestran los resultados de validación.
+        """
+
+        indice = self.validation_index()
+        indices = indice.filter(**self.filter_values(filtros))
+        validation_view.set_lines([indice.textos[i] for i in indices])
+        filtros["contador"].config(text=f"{len(indices)} de {len(indice.textos)}")
 
     def show_validation(self):
 
@@ -461,42 +3734,220 @@ class SQLGeneratorApp:
         Muestra una nueva ventana con los resultados de validación de las queries generadas.
         """
 
-        validation_window = Toplevel(self.root)
+        validation_window = tk.Toplevel(self.root)
         validation_window.title("Validación de queries generadas")
 
-        # Entry para buscar en la validación
-        search_frame = tk.Frame(validation_window)
-        search_frame.pack(padx=10, pady=10)
-        tk.Label(search_frame, text="Filtrar por:").pack(side=tk.LEFT)
-        search_entry = tk.Entry(search_frame)
-        search_entry.pack(side=tk.LEFT, padx=5)
-        search_entry.bind("<KeyRelease>", lambda event: self.filter_validation(search_entry.get(), validation_text))
+        filtros = self.create_filters(validation_window, self.validation_index())
+        if self.metrics is not None:
+            tk.Button(filtros["frame"], text="Exportar métricas", command=self.export_metrics).pack(side=tk.LEFT, padx=5)
 
-        validation_text = scrolledtext.ScrolledText(validation_window, width=100, height=30)
-        validation_text.pack(padx=10, pady=10)
-        
-        for sheet_name, data in self.validation_data.items():
-            total = data["total_queries"]
-            inserts = data["inserts"]
-            updates = data["updates"]
-             # Siempre muestra el total de queries generadas
-            validation_text.insert(tk.END, f"Hoja {sheet_name}: {total} queries generadas.")
-            # Solo muestra INSERTs y UPDATEs si son mayores que 0
-            if total > 0:
-                details = []
-                if inserts > 0:
-                    details.append(f"INSERTs: {inserts}")
-                if updates > 0:
-                    details.append(f"UPDATEs: {updates}")
-                if details:
-                    validation_text.insert(tk.END, f" ({', '.join(details)})")
-            validation_text.insert(tk.END, "\n")    
-        
-        validation_text.config(state=tk.DISABLED)
+            # Resumen de tiempos de la conversión
+            totales = self.metrics.totals()
+            fases = ", ".join(f"{fase} {totales[f'segundos_{fase}']:.2f}s" for fase in FASES)
+            resumen = f"Total: {totales['filas']} filas en {totales['segundos']:.2f}s ({fases}), {totales['bytes'] / 1024:.1f} KB"
+            if totales["rss_pico_mb"] is not None:
+                resumen += f", pico de memoria {totales['rss_pico_mb']:.0f} MB"
+            tk.Label(validation_window, text=resumen, anchor="w").pack(padx=10, fill=tk.X)
+
+        validation_view = VirtualTextView(validation_window, width=100, height=30)
+        validation_view.frame.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
+
+        self.bind_filters(filtros, lambda: self.filter_validation(filtros, validation_view))
+        self.filter_validation(filtros, validation_view)
+
+    def sheet_metrics(self):
+
+        """
+        Devuelve las métricas de la última conversión por nombre de hoja, como `validation_data`.
+        """
+
+        if self.metrics is None:
+            return {}
+        return {metricas_hoja["hoja"]: metricas_hoja for metricas_hoja in self.metrics.sheets()}
+
+    def export_metrics(self):
+
+        """
+        Guarda las métricas de la última conversión en un archivo JSON o CSV.
+        """
+
+        ruta = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON", "*.json"), ("CSV", "*.csv")],
+            initialfile="metricas-excel2sql.json"
+        )
+        if not ruta:
+            return
+        try:
+            self.metrics.export(ruta)
+        except OSError as e:
+            messagebox.showerror("Error", f"No se han podido guardar las métricas: {e}")
+
+# %% [markdown]
+# ### Línea de comandos
+# Esta sección define la entrada por línea de comandos (`python -m excel2sql`), que permite convertir sin interfaz gráfica desde tareas programadas.
 
 # %%
-# Esta celda se utiliza para iniciar la aplicación desde el notebook
-app = SQLGeneratorApp()
+def _conversion_processor(args, mode, **opciones):
+    """
+    SQLFileProcessor con las opciones de conversión de la línea de comandos, comunes a `convert` y `watch`.
+    """
+    batch_policy = None
+    if args.batch_statements or args.batch_bytes or args.batch_per_sheet:
+        batch_policy = BatchPolicy(args.batch_statements, args.batch_bytes, args.batch_per_sheet)
+    return SQLFileProcessor(
+        args.path, args.task_link, args.description, args.author,
+        mode=mode, output_dir=args.output_dir, reader=args.reader, workers=args.workers, force=args.force,
+        cleaning=args.cleaning, coalesce_inserts=args.coalesce_inserts, batch_policy=batch_policy,
+        max_file_bytes=args.max_file_bytes, bulk_load=args.bulk_load or bool(args.bulk_load_dir),
+        bulk_load_dir=args.bulk_load_dir, output_sink=args.output, **opciones
+    )
+
+def main(argv=None):
+    """
+    Punto de entrada por línea de comandos. Sin subcomando abre la interfaz gráfica; `convert` usa
+    SQLFileProcessor directamente e imprime un resumen JSON por la salida estándar, y `watch` vigila una carpeta
+    (ver FolderWatcher).
 
+    Args:
+    - argv (list, opcional): Argumentos; por defecto los de `sys.argv`.
+
+    Returns:
+    - int: Código de salida.
+    """
+    parser = argparse.ArgumentParser(prog="excel2sql", description="Convierte excels en scripts SQL.")
+    subparsers = parser.add_subparsers(dest="comando")
+    subparsers.add_parser("gui", help="Abre la interfaz gráfica (por defecto).")
+
+    # Opciones de la conversión, comunes a `convert` y `watch`
+    conversion_parser = argparse.ArgumentParser(add_help=False)
+    conversion_parser.add_argument("--task-link", default="", help="Identificador de la tarea. Ej. PROCLI-7777")
+    conversion_parser.add_argument("--description", default="", help="Descripción de la tarea.")
+    conversion_parser.add_argument("--author", default="", help="Nombre del autor.")
+    conversion_parser.add_argument("--output-dir", help="Directorio de salida. Por defecto ~/Downloads.")
+    conversion_parser.add_argument("--reader", choices=READERS, default="auto", help="Lector de las hojas. Por defecto 'auto': calamine si está instalado, si no openpyxl (que no necesita importar pandas), y 'csv' para .csv/.tsv.")
+    conversion_parser.add_argument("--workers", type=int, default=1, help="Procesos en paralelo (archivos en modo carpeta, hojas con un único archivo).")
+    conversion_parser.add_argument("--cleaning", choices=CLEANING_MODES, default="compat", help="Modo de limpieza: 'compat' (por defecto) genera lo mismo que siempre y 'corrected' respeta los literales entre comillas ('it''s' no pasa a 'itNULLs').")
+    conversion_parser.add_argument("--coalesce-inserts", action="store_true", help="Agrupa los INSERTs seguidos a la misma tabla en INSERTs de varias filas (hasta 1000 filas por VALUES).")
+    conversion_parser.add_argument("--batch-statements", type=int, metavar="N", help="Cierra cada lote con 'GO' tras N sentencias, sin contar las filas vacías, en lugar de la cadencia de siempre.")
+    conversion_parser.add_argument("--batch-bytes", type=int, metavar="N", help="Cierra el lote antes de la sentencia con la que superaría N bytes.")
+    conversion_parser.add_argument("--batch-per-sheet", action="store_true", help="Cierra el lote al terminar cada hoja.")
+    conversion_parser.add_argument("--max-file-bytes", type=int, metavar="N", help="Parte el script de cada excel en archivos -000-DAT-, -001-DAT-... de como mucho N bytes, cortando solo entre lotes.")
+    conversion_parser.add_argument("--bulk-load", action="store_true", help="Escribe los INSERTs con valores literales en archivos de datos junto al script, que los carga con BULK INSERT.")
+    conversion_parser.add_argument("--bulk-load-dir", metavar="DIR", help="Con --bulk-load, directorio de los archivos de datos tal como lo ve el servidor. Por defecto el de salida.")
+    conversion_parser.add_argument("--output", choices=[salida for salida in SALIDAS if salida != "memory"], default="file", help="Destino de los scripts: 'file' (por defecto), 'gzip' o 'zstd' (comprimidos mientras se generan, .sql.gz/.sql.zst) o 'stdout' (seguidos en la salida estándar, para pasarlos a sqlcmd; el resumen JSON va entonces a la salida de errores).")
+    conversion_parser.add_argument("--force", action="store_true", help="Convierte también los excels que no han cambiado desde la última ejecución.")
+
+    convert_parser = subparsers.add_parser("convert", parents=[conversion_parser], help="Convierte sin interfaz gráfica e imprime un resumen JSON.")
+    convert_parser.add_argument("path", help="Archivo Excel o directorio con excels.")
+    convert_parser.add_argument("--mode", choices=["file", "folder"], help="Por defecto 'folder' si la ruta es un directorio y 'file' si no.")
+    convert_parser.add_argument("--execute", metavar="MODULO:CONEXION", help="Ejecuta los scripts generados en la base de datos con el driver DB-API indicado. Ej. 'pyodbc:DSN=pruebas' o 'sqlite3:/tmp/pruebas.db'.")
+    convert_parser.add_argument("--pool-size", type=int, default=2, help="Conexiones (y archivos ejecutados a la vez) con --execute. Por defecto 2.")
+    convert_parser.add_argument("--per-statement", action="store_true", help="Con --execute, ejecuta las sentencias una a una e informa de cada una que falle (necesario con sqlite3).")
+    convert_parser.add_argument("--commit", action="store_true", help="Con --execute, confirma cada archivo aunque su pie tenga el COMMIT comentado.")
+    convert_parser.add_argument("--progress", action="store_true", help="Muestra el progreso por la salida de errores.")
+    convert_parser.add_argument("--metrics", metavar="RUTA", help="Guarda los tiempos de cada fase por archivo y hoja en RUTA (CSV si termina en .csv, JSON si no) y los añade al resumen.")
+
+    watch_parser = subparsers.add_parser("watch", parents=[conversion_parser], help="Vigila una carpeta y convierte cada excel nuevo o modificado.")
+    watch_parser.add_argument("path", help="Carpeta a vigilar.")
+    watch_parser.add_argument("--debounce", type=float, default=2.0, help="Segundos que un archivo tiene que estar sin cambiar para convertirlo. Por defecto 2.")
+    watch_parser.add_argument("--poll", action="store_true", help="Recorre la carpeta cada --poll-interval segundos en lugar de usar inotify. Necesario en carpetas compartidas en red.")
+    watch_parser.add_argument("--poll-interval", type=float, default=2.0, help="Segundos entre dos recorridos de la carpeta sin inotify. Por defecto 2.")
+    watch_parser.add_argument("--log-file", metavar="RUTA", help="Registro con una línea JSON por conversión. Por defecto excel2sql-watch.jsonl en el directorio de salida.")
+
+    args = parser.parse_args(argv)
+
+    if args.comando not in ("convert", "watch"):
+        SQLGeneratorApp()
+        return 0
+
+    if not os.path.exists(args.path):
+        print(f"No existe la ruta: {args.path}", file=sys.stderr)
+        return 1
+    if args.comando == "watch" and not os.path.isdir(args.path):
+        print(f"No es una carpeta: {args.path}", file=sys.stderr)
+        return 1
+
+    # El primer Ctrl+C cancela al terminar la hoja actual, sin dejar scripts a medias; el segundo sale ya
+    cancel_event = threading.Event()
+    def cancelar(signum, frame):
+        if cancel_event.is_set():
+            raise KeyboardInterrupt
+        if args.comando == "watch":
+            print("Deteniendo al terminar las conversiones en curso... (Ctrl+C otra vez para salir ya)", file=sys.stderr)
+        else:
+            print("Cancelando al terminar la hoja actual... (Ctrl+C otra vez para salir ya)", file=sys.stderr)
+        cancel_event.set()
+    signal.signal(signal.SIGINT, cancelar)
 
+    if args.comando == "watch":
+        try:
+            watcher = FolderWatcher(
+                _conversion_processor(args, "folder"), debounce=args.debounce, poll_interval=args.poll_interval,
+                use_inotify=not args.poll, log_path=args.log_file
+            )
+            watcher.run(cancel_event)
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        print(json.dumps(watcher.totales, ensure_ascii=False, indent=2))
+        return 0
+
+    def mostrar_progreso(evento):
+        eta = "?" if evento["eta_segundos"] is None else f"{evento['eta_segundos']:.0f}s"
+        print(
+            f"[{evento['fraccion']:.0%}] {evento['archivo']} {evento['hoja'] or ''} - "
+            f"{evento['filas']} filas, {evento['filas_por_segundo']:.0f} filas/s, ETA {eta}",
+            file=sys.stderr
+        )
+
+    mode = args.mode or ("folder" if os.path.isdir(args.path) else "file")
+    try:
+        processor = _conversion_processor(
+            args, mode, progress_callback=mostrar_progreso if args.progress else None, cancel_event=cancel_event,
+            collect_metrics=bool(args.metrics)
+        )
+        nombresSQL, log_messages, hojas_no_procesadas, validation_data = processor.process_files()
+        ejecucion = None
+        if args.execute:
+            executor = SQLExecutor(
+                dbapi_connect(args.execute), pool_size=args.pool_size, per_statement=args.per_statement,
+                commit=True if args.commit else None
+            )
+            ejecucion = processor.execute_scripts(executor, nombresSQL)
+    except ConversionCancelled:
+        print("Conversión cancelada", file=sys.stderr)
+        return 130
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    resumen = {
+        "output_dir": processor.output_dir,
+        "nombresSQL": nombresSQL,
+        "hojas_no_procesadas": hojas_no_procesadas,
+        "validation_data": validation_data,
+        "log_messages": log_messages,
+    }
+    if ejecucion is not None:
+        resumen["ejecucion"] = ejecucion
+    if processor.metrics is not None:
+        resumen["metricas"] = processor.metrics.totals()
+        try:
+            processor.metrics.export(args.metrics)
+        except OSError as e:
+            print(f"Error al guardar las métricas: {e}", file=sys.stderr)
+    # Con --output stdout, la salida estándar es de los scripts
+    print(json.dumps(resumen, ensure_ascii=False, indent=2), file=sys.stderr if args.output == "stdout" else sys.stdout)
+    if ejecucion is not None and any(resultado["fallos"] for resultado in ejecucion):
+        return 1
+    return 0
 
+# %%
+# Esta celda se utiliza para iniciar la aplicación desde el notebook
+# Protegida con __main__ para que importar el script (procesos del modo paralelo, tareas programadas) no abra la ventana
+if __name__ == "__main__":
+    if "ipykernel" in sys.modules:
+        app = SQLGeneratorApp()
+    else:
+        sys.exit(main())
@@ -0,0 +1,29 @@
+import os
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+COLUMNAS = "ABCDEFGHIJKLMNOPQRSTUVW"
+
+@pytest.fixture
+def write_workbook(tmp_path):
+    """
+    Devuelve una función que guarda un .xlsx con la cabecera de A a W y una fila por cada `(insert, update)` en las
+    columnas U y W, y devuelve su ruta.
+    """
+    import openpyxl
+
+    def write(filas, nombre="libro.xlsx", hoja="Hoja1"):
+        workbook = openpyxl.Workbook()
+        worksheet = workbook.active
+        worksheet.title = hoja
+        worksheet.append(list(COLUMNAS))
+        for insert_value, update_value in filas:
+            worksheet.append([None] * 20 + [insert_value, None, update_value])
+        ruta = tmp_path / nombre
+        workbook.save(ruta)
+        return str(ruta)
+    return write
@@ -0,0 +1,47 @@
+import io
+
+import excel2sql
+
+class MemoryWriter(io.StringIO):
+    # Escritor mínimo para SQLBatcher: guarda el script en memoria
+
+    def end_batch(self):
+        pass
+
+def batch(sentencias, **opciones):
+    escritor = MemoryWriter()
+    batcher = excel2sql.SQLBatcher(escritor, **opciones)
+    batcher.start_sheet("Hoja1")
+    batcher.write_rows([(sentencia, None) for sentencia in sentencias])
+    batcher.flush()
+    return escritor.getvalue()
+
+def test_coalesce_groups_rows_with_the_same_literal_kinds():
+    script = batch([
+        "INSERT INTO t (a, b) VALUES (1, 'x')",
+        "INSERT INTO t (a, b) VALUES (2.5, NULL)",
+        "INSERT INTO t (a, b) VALUES (NULL, N'y')",
+    ], coalesce_inserts=True)
+    assert script == "---Tabla: Hoja1\nINSERT INTO t (a, b) VALUES (1, 'x'),\n(2.5, NULL),\n(NULL, N'y')\n"
+
+def test_coalesce_cuts_group_when_literal_kinds_differ():
+    # SQL Server convertiría 'A1' al tipo numérico de la columna y fallaría el INSERT agrupado
+    script = batch([
+        "INSERT INTO t (a) VALUES ('A1')",
+        "INSERT INTO t (a) VALUES (5)",
+        "INSERT INTO t (a) VALUES (NULL)",
+        "INSERT INTO t (a) VALUES ('B2')",
+        "INSERT INTO t (a) VALUES (GETDATE())",
+    ], coalesce_inserts=True)
+    assert script == (
+        "---Tabla: Hoja1\n"
+        "INSERT INTO t (a) VALUES ('A1')\n"
+        "INSERT INTO t (a) VALUES (5),\n(NULL)\n"
+        "INSERT INTO t (a) VALUES ('B2')\n"
+        "INSERT INTO t (a) VALUES (GETDATE())\n"
+    )
+
+def test_literal_kind():
+    assert [excel2sql.literal_kind(valor) for valor in ("NULL", " 'a''b' ", "N'x'", "-1.5e3", "GETDATE()", "1 + 1")] == [
+        None, "texto", "texto", "numero", "otro", "otro"
+    ]
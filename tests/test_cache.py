@@ -0,0 +1,38 @@
+import datetime
+
+import excel2sql
+
+def convert(ruta_excel, directorio_salida, hora_inicio=None, **opciones):
+    procesador = excel2sql.SQLFileProcessor(
+        ruta_excel, "PROCLI-7777", "Pruebas", "Tests", mode="file", output_dir=str(directorio_salida), **opciones
+    )
+    if hora_inicio is not None:
+        procesador.hora_inicio = hora_inicio
+    return procesador.process_files()[0]
+
+def test_reuse_on_later_day_keeps_previous_script(tmp_path, write_workbook):
+    ruta_excel = write_workbook([("INSERT INTO t VALUES (1)", None)])
+    ayer = datetime.datetime.now() - datetime.timedelta(days=1)
+    [anterior] = convert(ruta_excel, tmp_path / "salida", hora_inicio=ayer)
+    contenido_anterior = (tmp_path / "salida" / anterior).read_text(encoding="utf-8")
+
+    [nuevo] = convert(ruta_excel, tmp_path / "salida")
+
+    assert nuevo != anterior
+    # El script entregado ayer sigue ahí sin cambios; el de hoy es una copia con la fecha nueva
+    assert (tmp_path / "salida" / anterior).read_text(encoding="utf-8") == contenido_anterior
+    contenido_nuevo = (tmp_path / "salida" / nuevo).read_text(encoding="utf-8")
+    assert f"* FECHA CREACIÓN: {datetime.date.today():%Y-%m-%d}" in contenido_nuevo
+    assert contenido_nuevo.replace(f"{datetime.date.today():%Y-%m-%d}", "") == contenido_anterior.replace(f"{ayer:%Y-%m-%d}", "")
+
+    # La siguiente ejecución reutiliza la copia de hoy
+    assert convert(ruta_excel, tmp_path / "salida") == [nuevo]
+
+def test_bulk_load_dir_without_bulk_load_keeps_cache(tmp_path, write_workbook, capsys):
+    ruta_excel = write_workbook([("INSERT INTO t VALUES (1)", None)])
+    generados = convert(ruta_excel, tmp_path / "salida")
+    capsys.readouterr()
+
+    # Sin carga masiva, el directorio del servidor no cambia el script: se reutiliza el de antes
+    assert convert(ruta_excel, tmp_path / "salida", bulk_load_dir="/srv/datos") == generados
+    assert "sin cambios" in capsys.readouterr().err
@@ -0,0 +1,33 @@
+import time
+
+import pytest
+
+import excel2sql
+
+# Sentencias que hacían retroceder la expresión de la limpieza corregida: `DECLARE @` sin nombre de variable detrás
+# de texto corriente y celdas del tamaño máximo de Excel llenas de comillas sin cierre
+ADVERSARIAS = [
+    *("INSERT INTO t VALUES (1, 'a', " + "x " * n + fin for n in (30, 1000) for fin in ("DECLARE @ x", "DECLARE @,", "DECLARE @'", "DECLARE @")),
+    "NULLDECLARE @," * 2000,
+    "a'" * 16000,
+    "'a" * 16000,
+    "x'" + "a'a " * 8000,
+    "(," * 16000,
+    "'a$$b', " * 4000,
+]
+
+@pytest.mark.parametrize("cleaning", excel2sql.CLEANING_MODES)
+@pytest.mark.parametrize("sentencia", ADVERSARIAS, ids=lambda sentencia: f"{sentencia[:20]!r}...{len(sentencia)}")
+def test_cleaning_time_is_bounded(cleaning, sentencia):
+    inicio = time.perf_counter()
+    excel2sql.scan_sql_value(sentencia, cleaning)
+    assert time.perf_counter() - inicio < 0.5
+
+@pytest.mark.parametrize("sentencia, esperado", [
+    ("INSERT INTO t VALUES ('it''s', 'O'Brien', '', 'NULL')", ("INSERT INTO t VALUES ('it''s', 'O''Brien', NULL, NULL)", None)),
+    ("INSERT INTO t VALUES (,1,)", ("INSERT INTO t VALUES (NULL,1,NULL)", None)),
+    ("DECLARE @id INT; INSERT INTO t VALUES ('DECLARE @otra', %%)", ("DECLARE @id INT; INSERT INTO t VALUES ('DECLARE @otra', '')", "id")),
+    ("INSERT INTO t VALUES ('a$$b', 'sin cierre, $$, %%", ("INSERT INTO t VALUES ('a\nb', 'sin cierre, \n, %%", None)),
+])
+def test_corrected_cleaning(sentencia, esperado):
+    assert excel2sql.scan_sql_value(sentencia, "corrected") == esperado
@@ -0,0 +1,143 @@
+import sqlite3
+import threading
+
+import pytest
+
+import excel2sql
+
+def convert(ruta_excel, directorio_salida, **opciones):
+    procesador = excel2sql.SQLFileProcessor(
+        ruta_excel, "PROCLI-7777", "Pruebas", "Tests", mode="file", output_dir=str(directorio_salida), force=True,
+        **opciones
+    )
+    return [directorio_salida / nombre for nombre in procesador.process_files()[0]]
+
+@pytest.fixture
+def database(tmp_path):
+    ruta = tmp_path / "pruebas.db"
+    with sqlite3.connect(ruta) as conexion:
+        conexion.execute("CREATE TABLE t (v)")
+    return ruta
+
+def execute(database, rutas, **opciones):
+    opciones.setdefault("per_statement", True)
+    executor = excel2sql.SQLExecutor(excel2sql.dbapi_connect(f"sqlite3:{database}"), **opciones)
+    log_messages = []
+    return executor.execute_files([str(ruta) for ruta in rutas], log_messages), log_messages
+
+def stored_values(database):
+    with sqlite3.connect(database) as conexion:
+        return [valor for (valor,) in conexion.execute("SELECT v FROM t ORDER BY rowid")]
+
+def test_multiline_literals_are_executed_as_written(tmp_path, write_workbook, database):
+    # Los `$$` pasan a saltos de línea dentro del literal, con o sin espacios delante
+    filas = [
+        ("INSERT INTO t VALUES ('it''s; a $$x, y')", None),
+        ("INSERT INTO t VALUES ('a$$update later')", None),
+        ("INSERT INTO t VALUES ('tabla --$$INSERT INTO t VALUES (1)')", None),
+        ("INSERT INTO t VALUES ('fin ')", None),
+    ]
+    ruta_excel = write_workbook(filas)
+    esperados = ["it's; a \nx, y", "a\nupdate later", "tabla --\nINSERT INTO t VALUES (1)", "fin "]
+
+    for coalesce_inserts in (False, True):
+        rutas = convert(ruta_excel, tmp_path / f"salida-{coalesce_inserts}", cleaning="corrected", coalesce_inserts=coalesce_inserts)
+        [resultado], _ = execute(database, rutas, commit=True)
+        assert resultado["fallos"] == []
+    assert stored_values(database) == esperados * 2
+
+def test_iter_sql_batches_keeps_literal_whitespace(tmp_path):
+    ruta = tmp_path / "script.sql"
+    ruta.write_bytes(
+        b"BEGIN TRAN\r\n---Tabla: Hoja1\r\n  INSERT INTO t VALUES ('a \r\nUPDATE b ')  \r\nUPDATE t SET v = 1\r\nGO\r\nROLLBACK\r\n--COMMIT\r\n"
+    )
+    assert list(excel2sql.iter_sql_batches(str(ruta))) == [
+        [("Hoja1", "INSERT INTO t VALUES ('a \r\nUPDATE b ')  "), ("Hoja1", "UPDATE t SET v = 1")]
+    ]
+
+@pytest.mark.parametrize("per_statement", [True, False])
+def test_script_footer_decides_commit(tmp_path, write_workbook, database, per_statement):
+    [ruta] = convert(write_workbook([("INSERT INTO t VALUES (1)", None)]), tmp_path / "salida")
+    if not per_statement:
+        # sqlite3 no ejecuta varias sentencias por `execute`: un lote de una sola sentencia sí
+        assert len(next(excel2sql.iter_sql_batches(str(ruta)))) == 1
+
+    # Por defecto el pie deshace la transacción
+    assert not excel2sql.script_commits(str(ruta))
+    [resultado], log_messages = execute(database, [ruta], per_statement=per_statement)
+    assert (resultado["sentencias"], resultado["confirmado"]) == (1, False)
+    assert stored_values(database) == []
+    assert "ROLLBACK" in log_messages[0]
+
+    # Con el COMMIT descomentado se confirma
+    ruta.write_text(ruta.read_text(encoding="utf-8").replace("ROLLBACK\n--COMMIT", "--ROLLBACK\nCOMMIT"), encoding="utf-8")
+    assert excel2sql.script_commits(str(ruta))
+    [resultado], log_messages = execute(database, [ruta], per_statement=per_statement)
+    assert resultado["confirmado"]
+    assert stored_values(database) == [1]
+    assert "COMMIT" in log_messages[0]
+
+def test_failed_statements_are_reported_and_rolled_back(tmp_path, write_workbook, database):
+    ruta_excel = write_workbook([
+        ("INSERT INTO t VALUES (1)", None),
+        ("INSERT INTO otra VALUES (2)", None),
+        ("INSERT INTO t VALUES (3)", None),
+        ("INSERT INTO t VALUES (4, 5)", None),
+    ])
+    rutas = convert(ruta_excel, tmp_path / "salida")
+    [resultado], log_messages = execute(database, rutas, commit=True)
+
+    assert [(fallo["hoja"], fallo["sentencia"]) for fallo in resultado["fallos"]] == [("Hoja1", 2), ("Hoja1", 4)]
+    assert resultado["sentencias"] == 4
+    # Con algún fallo el archivo se deshace entero aunque se pida COMMIT
+    assert not resultado["confirmado"]
+    assert stored_values(database) == []
+    fallos = [mensaje for mensaje in log_messages if ", sentencia " in mensaje]
+    assert len(fallos) == 2
+    assert fallos[0].startswith(f"Ejecución {rutas[0].name} - Hoja Hoja1, sentencia 2: no such table: otra")
+
+def test_failed_statements_limit(tmp_path, write_workbook, database):
+    rutas = convert(write_workbook([("INSERT INTO otra VALUES (1)", None)] * 5), tmp_path / "salida")
+    [resultado], _ = execute(database, rutas, max_failed_statements=2)
+    assert len(resultado["fallos"]) == 2
+
+class FakeConnection:
+    def __init__(self):
+        self.cerrada = False
+
+    def close(self):
+        self.cerrada = True
+
+def test_connection_pool_reuses_and_limits_connections():
+    abiertas = []
+
+    def connect():
+        abiertas.append(FakeConnection())
+        return abiertas[-1]
+
+    pool = excel2sql.ConnectionPool(connect, 2)
+    primera = pool.acquire()
+    segunda = pool.acquire()
+    assert primera is not segunda
+
+    # Sin hueco, la tercera espera a que se devuelva una conexión, y reutiliza esa
+    obtenida = []
+    hilo = threading.Thread(target=lambda: obtenida.append(pool.acquire()))
+    hilo.start()
+    hilo.join(0.2)
+    assert hilo.is_alive()
+    pool.release(primera)
+    hilo.join(5)
+    assert obtenida == [primera]
+    assert len(abiertas) == 2
+
+    # Una conexión que ha fallado se cierra y la siguiente se abre de nuevo
+    pool.release(segunda, valida=False)
+    assert segunda.cerrada
+    tercera = pool.acquire()
+    assert tercera is not segunda and len(abiertas) == 3
+
+    pool.release(tercera)
+    pool.release(primera)
+    pool.close()
+    assert all(conexion.cerrada for conexion in abiertas)
@@ -0,0 +1,56 @@
+import subprocess
+import sys
+import textwrap
+
+from conftest import RAIZ
+
+# Simula un equipo sin pandas: cualquier import de pandas falla como si no estuviera instalado
+SIN_PANDAS = textwrap.dedent("""
+    import sys
+    import importlib.abc
+
+    class SinPandas(importlib.abc.MetaPathFinder):
+        def find_spec(self, nombre, ruta=None, objetivo=None):
+            if nombre == "pandas" or nombre.startswith("pandas."):
+                raise ModuleNotFoundError(f"No module named '{nombre}'", name=nombre)
+            return None
+
+    sys.meta_path.insert(0, SinPandas())
+""")
+
+def run_python(codigo, *args):
+    return subprocess.run(
+        [sys.executable, "-c", codigo, *args], cwd=RAIZ, capture_output=True, text=True, timeout=120
+    )
+
+def test_convert_without_pandas(tmp_path, write_workbook):
+    ruta_excel = write_workbook([("INSERT INTO t VALUES (1)", None)])
+    ruta_csv = tmp_path / "datos.csv"
+    ruta_csv.write_text(";" * 20 + "U\n" + ";" * 20 + "INSERT INTO t VALUES (2)\n", encoding="utf-8")
+    codigo = SIN_PANDAS + textwrap.dedent("""
+        import excel2sql
+        for ruta, reader in ((sys.argv[1], "openpyxl"), (sys.argv[2], "csv")):
+            codigo = excel2sql.main(["convert", ruta, "--reader", reader, "--output-dir", sys.argv[3], "--force"])
+            assert codigo == 0, (reader, codigo)
+        try:
+            excel2sql.pd.DataFrame
+        except ModuleNotFoundError as e:
+            print(e)
+    """)
+    resultado = run_python(codigo, ruta_excel, str(ruta_csv), str(tmp_path / "salida"))
+    assert resultado.returncode == 0, resultado.stderr
+    assert "necesita pandas" in resultado.stdout
+    assert len(list((tmp_path / "salida").glob("*.sql"))) == 2
+
+def test_auto_convert_does_not_import_pandas(tmp_path, write_workbook):
+    ruta_excel = write_workbook([("INSERT INTO t VALUES (1)", None)])
+    codigo = textwrap.dedent("""
+        import sys
+        import excel2sql
+        codigo = excel2sql.main(["convert", sys.argv[1], "--reader", "auto", "--output-dir", sys.argv[2], "--force"])
+        assert codigo == 0, codigo
+        print("pandas.core.frame" in sys.modules)
+    """)
+    resultado = run_python(codigo, ruta_excel, str(tmp_path / "salida"))
+    assert resultado.returncode == 0, resultado.stderr
+    assert resultado.stdout.strip().splitlines()[-1] == "False"
@@ -0,0 +1,65 @@
+import re
+import zipfile
+
+import openpyxl
+import pytest
+
+import excel2sql
+from conftest import COLUMNAS
+
+def test_readers_must_implement_their_iterator(tmp_path):
+    class SinFilas(excel2sql.RowReader):
+        pass
+
+    class SinBloques(excel2sql.BlockReader):
+        pass
+
+    for clase in (SinFilas, SinBloques):
+        with pytest.raises(TypeError):
+            clase(str(tmp_path / "libro.xlsx"))
+
+def test_reader_kinds():
+    assert issubclass(excel2sql.PandasReader, excel2sql.BlockReader)
+    for nombre in ("openpyxl", "calamine", "csv"):
+        lector = excel2sql.READER_CLASSES[nombre]
+        assert issubclass(lector, excel2sql.RowReader) and lector.streaming
+
+def rewrite_dimension(ruta, referencia):
+    # Reescribe la dimensión guardada de la primera hoja, como hacen algunos programas que no la actualizan
+    with zipfile.ZipFile(ruta) as origen:
+        contenidos = {nombre: origen.read(nombre) for nombre in origen.namelist()}
+    hoja = "xl/worksheets/sheet1.xml"
+    contenidos[hoja] = re.sub(rb'<dimension ref="[^"]*"', b'<dimension ref="%s"' % referencia.encode(), contenidos[hoja])
+    with zipfile.ZipFile(ruta, "w") as destino:
+        for nombre, contenido in contenidos.items():
+            destino.writestr(nombre, contenido)
+
+def test_stale_dimension_does_not_skip_sheet(tmp_path):
+    workbook = openpyxl.Workbook()
+    worksheet = workbook.active
+    worksheet.title = "Hoja1"
+    worksheet.append(["A", "B", "C"])
+    worksheet["U2"] = "INSERT INTO t VALUES (1)"
+    ruta = str(tmp_path / "libro.xlsx")
+    workbook.save(ruta)
+    rewrite_dimension(ruta, "A1:C1")
+
+    assert excel2sql.find_skippable_sheets(ruta) == set()
+    procesador = excel2sql.SQLFileProcessor(
+        ruta, "PROCLI-7777", "Pruebas", "Tests", mode="file", output_dir=str(tmp_path / "salida")
+    )
+    [script] = procesador.process_files()[0]
+    assert "INSERT INTO t VALUES (1)" in (tmp_path / "salida" / script).read_text(encoding="utf-8")
+
+def test_narrow_and_header_only_sheets_are_skipped(tmp_path):
+    workbook = openpyxl.Workbook()
+    estrecha = workbook.active
+    estrecha.title = "Estrecha"
+    estrecha.append(["A", "B", "C"])
+    estrecha.append([1, 2, 3])
+    cabecera = workbook.create_sheet("Cabecera")
+    cabecera.append(list(COLUMNAS))
+    ruta = str(tmp_path / "libro.xlsx")
+    workbook.save(ruta)
+
+    assert excel2sql.find_skippable_sheets(ruta) == {"Estrecha", "Cabecera"}